@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.value_objects.common import ClientId, Money, ProductId
+from maspatas.infrastructure.analytics.columnar import sales_table
+from maspatas.infrastructure.analytics.vectorized import abc_classification, basket_size_distribution, hourly_heatmap, top_sellers
+from maspatas.infrastructure.reports.memory_reports import aggregate_sales
+
+
+def build_sales(count: int, products: int = 500, seed: int = 7) -> list[SaleAggregate]:
+    rng = random.Random(seed)
+    prices = [Money(Decimal(rng.randint(500, 50000)) / 100) for _ in range(products)]
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    sales = []
+    for index in range(count):
+        chosen = rng.sample(range(products), rng.randint(1, 5))
+        sales.append(
+            SaleAggregate(
+                sale_id=f"S-{index:07d}",
+                client_id=ClientId(f"C-{rng.randrange(1000):04d}"),
+                lines=tuple(
+                    SaleLine(product_id=ProductId(f"P-{product:04d}"), quantity=rng.randint(1, 4), unit_price=prices[product])
+                    for product in chosen
+                ),
+                created_at=start + timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+            )
+        )
+    return sales
+
+
+def python_top_sellers(sales: list[SaleAggregate], limit: int) -> list[str]:
+    rows = aggregate_sales(sales, "product")
+    return [row.key for row in sorted(rows, key=lambda row: (-row.revenue, row.key))[:limit]]
+
+
+def python_abc(sales: list[SaleAggregate]) -> dict[str, str]:
+    rows = sorted(aggregate_sales(sales, "product"), key=lambda row: (-row.revenue, row.key))
+    grand_total = sum(row.revenue for row in rows)
+    classes = {}
+    running = Decimal("0")
+    for row in rows:
+        share = running / grand_total
+        classes[row.key] = "A" if share < Decimal("0.8") else "B" if share < Decimal("0.95") else "C"
+        running += row.revenue
+    return classes
+
+
+def python_baskets(sales: list[SaleAggregate]) -> dict[int, int]:
+    return dict(Counter(sum(line.quantity for line in sale.lines) for sale in sales))
+
+
+def python_heatmap(sales: list[SaleAggregate]) -> np.ndarray:
+    cells = [[0.0] * 24 for _ in range(7)]
+    for sale in sales:
+        created_at = sale.created_at.astimezone(timezone.utc)
+        for line in sale.lines:
+            cells[created_at.weekday()][created_at.hour] += float(line.subtotal.amount)
+    return np.array(cells)
+
+
+def best_milliseconds(run: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Analítica por documento en Python contra Arrow/NumPy")
+    parser.add_argument("--sales", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sales = build_sales(args.sales)
+    started = time.perf_counter()
+    table = sales_table(sales)
+    print(f"{table.num_rows} líneas convertidas a Arrow en {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    assert python_top_sellers(sales, 20) == [row.key for row in top_sellers(table, limit=20)]
+    assert python_abc(sales) == abc_classification(table)
+    assert python_baskets(sales) == basket_size_distribution(table)
+    assert np.allclose(python_heatmap(sales), hourly_heatmap(table))
+
+    cases = [
+        ("top_sellers", lambda: python_top_sellers(sales, 20), lambda: top_sellers(table, limit=20)),
+        ("abc", lambda: python_abc(sales), lambda: abc_classification(table)),
+        ("canasta", lambda: python_baskets(sales), lambda: basket_size_distribution(table)),
+        ("heatmap", lambda: python_heatmap(sales), lambda: hourly_heatmap(table)),
+    ]
+    print(f"{'métrica':<12} {'python ms':>10} {'arrow ms':>10} {'mejora':>8}")
+    for name, slow, fast in cases:
+        before = best_milliseconds(slow, args.repeat)
+        after = best_milliseconds(fast, args.repeat)
+        print(f"{name:<12} {before:>10.1f} {after:>10.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
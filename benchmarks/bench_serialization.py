@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from maspatas.domain.entities.product import Product
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.value_objects.common import ClientId, Money, ProductId
+from maspatas.interfaces.api.schemas import ProductResponse, SaleLineResponse, SaleResponse
+from maspatas.interfaces.api.serialization import product_row, sale_row
+
+
+def build_products(count: int) -> list[Product]:
+    return [
+        Product(id=ProductId(f"P-{index:06d}"), name=f"Producto {index}", price=Money(Decimal("19.90")), sku=f"SKU-{index:06d}")
+        for index in range(count)
+    ]
+
+
+def build_sales(count: int, lines_per_sale: int = 3) -> list[SaleAggregate]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        SaleAggregate(
+            sale_id=f"S-{index:06d}",
+            client_id=ClientId(f"C-{index % 100:03d}"),
+            lines=tuple(
+                SaleLine(product_id=ProductId(f"P-{line:03d}"), quantity=line + 1, unit_price=Money(Decimal("19.90")))
+                for line in range(lines_per_sale)
+            ),
+            created_at=start + timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+def pydantic_products(products: list[Product]) -> bytes:
+    models = [
+        ProductResponse(
+            id=product.id.value,
+            name=product.name,
+            sku=product.sku,
+            price_amount=str(product.price.amount),
+            currency=product.price.currency,
+        )
+        for product in products
+    ]
+    validated = TypeAdapter(list[ProductResponse]).validate_python(models)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def pydantic_sales(sales: list[SaleAggregate]) -> bytes:
+    models = [
+        SaleResponse(
+            sale_id=sale.sale_id,
+            client_id=sale.client_id.value,
+            created_at=sale.created_at.isoformat(),
+            total_amount=str(sale.total.amount),
+            currency=sale.total.currency,
+            lines=[
+                SaleLineResponse(
+                    product_id=line.product_id.value,
+                    quantity=line.quantity,
+                    unit_price=str(line.unit_price.amount),
+                    subtotal=str(line.subtotal.amount),
+                )
+                for line in sale.lines
+            ],
+        )
+        for sale in sales
+    ]
+    validated = TypeAdapter(list[SaleResponse]).validate_python(models)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_products(products: list[Product]) -> bytes:
+    return orjson.dumps([product_row(product) for product in products])
+
+
+def fast_sales(sales: list[SaleAggregate]) -> bytes:
+    return orjson.dumps([sale_row(sale) for sale in sales])
+
+
+def per_row_microseconds(render: Callable[[list], bytes], rows: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(rows)
+        best = min(best, time.perf_counter() - started)
+    return best / len(rows) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Costo por fila de serializar listados")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("productos", build_products(args.rows), pydantic_products, fast_products),
+        ("ventas", build_sales(args.rows), pydantic_sales, fast_sales),
+    ]
+    print(f"{'listado':<10} {'pydantic µs/fila':>18} {'orjson µs/fila':>16} {'mejora':>8}")
+    for name, rows, slow, fast in cases:
+        assert json.loads(slow(rows)) == json.loads(fast(rows))
+        before = per_row_microseconds(slow, rows, args.repeat)
+        after = per_row_microseconds(fast, rows, args.repeat)
+        print(f"{name:<10} {before:>18.2f} {after:>16.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
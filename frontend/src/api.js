@@ -4,7 +4,9 @@ const jsonHeaders = {
   'Content-Type': 'application/json',
 };
 
-async function request(path, options = {}) {
+const PAGE_SIZE = 500;
+
+async function send(path, options = {}) {
   const response = await fetch(`${API_URL}${path}`, options);
   const contentType = response.headers.get('content-type') ?? '';
   const payload = contentType.includes('application/json') ? await response.json() : null;
@@ -14,9 +16,30 @@ async function request(path, options = {}) {
     throw new Error(Array.isArray(detail) ? detail.join(', ') : detail);
   }
 
+  return { payload, response };
+}
+
+async function request(path, options = {}) {
+  const { payload } = await send(path, options);
   return payload;
 }
 
+async function requestAll(path) {
+  const rows = [];
+  let cursor = null;
+  do {
+    const query = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (cursor) {
+      query.set('after', cursor);
+    }
+    const { payload, response } = await send(`${path}?${query}`);
+    rows.push(...payload);
+    cursor = response.headers.get('X-Next-Cursor');
+  } while (cursor);
+
+  return rows;
+}
+
 export const api = {
   getToken: (credentials) =>
     request('/auth/token', {
@@ -25,10 +48,10 @@ export const api = {
       body: JSON.stringify(credentials),
     }),
 
-  getProducts: () => request('/products'),
-  getClients: () => request('/clients'),
+  getProducts: () => requestAll('/products'),
+  getClients: () => requestAll('/clients'),
   getInventory: () => request('/inventory'),
-  getSales: () => request('/sales'),
+  getSales: () => requestAll('/sales'),
 
   createProduct: (token, data) =>
     request('/products', {
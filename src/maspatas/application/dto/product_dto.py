@@ -21,3 +21,24 @@ class RegisterProductOutputDTO:
     price_amount: str
     currency: str
     initial_stock: int
+
+
+@dataclass(frozen=True)
+class CatalogRowDTO:
+    line: int
+    product: RegisterProductInputDTO | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class CatalogRowErrorDTO:
+    line: int
+    product_id: str | None
+    error: str
+
+
+@dataclass(frozen=True)
+class CatalogImportChunkDTO:
+    processed: int
+    imported: int
+    errors: tuple[CatalogRowErrorDTO, ...]
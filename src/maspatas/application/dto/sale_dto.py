@@ -21,3 +21,10 @@ class RegisterSaleOutputDTO:
     sale_id: str
     total_amount: str
     currency: str
+
+
+@dataclass(frozen=True)
+class SaleBatchResultDTO:
+    sale_id: str
+    sale: RegisterSaleOutputDTO | None = None
+    error: str | None = None
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Literal, TypeVar
+
+import orjson
+
+from maspatas.application.dto.product_dto import CatalogRowDTO, RegisterProductInputDTO
+
+T = TypeVar("T")
+
+CatalogFormat = Literal["csv", "ndjson"]
+REQUIRED_FIELDS = ("product_id", "name", "sku", "price_amount")
+
+
+def _initial_stock(value: object) -> int:
+    if value in (None, ""):
+        return 0
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(value)
+    return int(value)
+
+
+def catalog_row(line: int, raw: Mapping[str, object]) -> CatalogRowDTO:
+    missing = [field for field in REQUIRED_FIELDS if raw.get(field) in (None, "")]
+    if missing:
+        return CatalogRowDTO(line=line, error=f"Faltan campos obligatorios: {', '.join(missing)}")
+    try:
+        initial_stock = _initial_stock(raw.get("initial_stock"))
+    except (TypeError, ValueError):
+        return CatalogRowDTO(line=line, error=f"initial_stock debe ser entero: {raw.get('initial_stock')}")
+    return CatalogRowDTO(
+        line=line,
+        product=RegisterProductInputDTO(
+            product_id=str(raw["product_id"]).strip(),
+            name=str(raw["name"]).strip(),
+            sku=str(raw["sku"]).strip(),
+            price_amount=str(raw["price_amount"]).strip(),
+            currency=str(raw.get("currency") or "MXN").strip(),
+            initial_stock=initial_stock,
+        ),
+    )
+
+
+def csv_catalog_rows(lines: Iterable[str]) -> Iterator[CatalogRowDTO]:
+    reader = csv.DictReader(lines)
+    for raw in reader:
+        yield catalog_row(reader.line_num, raw)
+
+
+def ndjson_catalog_rows(lines: Iterable[str]) -> Iterator[CatalogRowDTO]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            raw = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield CatalogRowDTO(line=line_number, error="JSON inválido")
+            continue
+        if not isinstance(raw, dict):
+            yield CatalogRowDTO(line=line_number, error="Cada línea debe ser un objeto JSON")
+            continue
+        yield catalog_row(line_number, raw)
+
+
+CATALOG_PARSERS: dict[str, Callable[[Iterable[str]], Iterator[CatalogRowDTO]]] = {
+    "csv": csv_catalog_rows,
+    "ndjson": ndjson_catalog_rows,
+}
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    if size <= 0:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+    pending: list[T] = []
+    for item in items:
+        pending.append(item)
+        if len(pending) >= size:
+            yield pending
+            pending = []
+    if pending:
+        yield pending
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from collections.abc import Awaitable, Callable, Mapping
+
+from maspatas.domain.exceptions.domain_exceptions import IdempotencyConflictError
+from maspatas.domain.ports.idempotency import IdempotencyStorePort
+
+
+def request_fingerprint(payload: Mapping[str, object]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IdempotencyService:
+    def __init__(self, store: IdempotencyStorePort) -> None:
+        self._store = store
+
+    async def run(self, key: str, fingerprint: str, operation: Callable[[], Awaitable[dict]]) -> dict:
+        owner = uuid.uuid4().hex
+        record = await self._store.begin(key, fingerprint, owner)
+        if record is not None:
+            if record.fingerprint != fingerprint:
+                raise IdempotencyConflictError(f"La llave de idempotencia {key} ya se usó con otra solicitud")
+            if record.in_flight:
+                raise IdempotencyConflictError(f"La solicitud {key} se está procesando")
+            return record.result
+
+        try:
+            result = await operation()
+        except BaseException:
+            await self._store.release(key, owner)
+            raise
+        await self._store.complete(key, fingerprint, result, owner)
+        return result
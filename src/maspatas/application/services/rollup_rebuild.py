@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+
+from maspatas.domain.ports.repositories import SaleRepositoryPort
+from maspatas.domain.ports.rollups import SalesRollup, SalesRollupPort
+from maspatas.domain.services.rollups import merge_rollups, sale_rollups
+
+
+def rollup_windows(start: datetime, end: datetime, chunk: timedelta) -> list[tuple[datetime, datetime]]:
+    if chunk <= timedelta(0):
+        raise ValueError("El tamaño de bloque debe ser positivo")
+    windows = []
+    while start < end:
+        windows.append((start, min(start + chunk, end)))
+        start += chunk
+    return windows
+
+
+class RollupRebuilder:
+    def __init__(
+        self,
+        sale_repo: SaleRepositoryPort,
+        target: SalesRollupPort,
+        chunk: timedelta = timedelta(days=7),
+        workers: int = 4,
+        batch_size: int = 500,
+    ) -> None:
+        self._sale_repo = sale_repo
+        self._target = target
+        self._chunk = chunk
+        self._workers = workers
+        self._batch_size = batch_size
+
+    def rebuild(self, start: datetime, end: datetime) -> int:
+        return self._rebuild(start, end, self._target)
+
+    def rebuild_and_swap(self, start: datetime, high_water: datetime, swap: Callable[[], SalesRollupPort]) -> int:
+        # Las ventas desde high_water guardadas antes del swap sumaron sus rollups en la colección que swap
+        # reemplaza; se aplican otra vez sobre la nueva. Las guardadas después ya escriben en la nueva.
+        sales = self._rebuild(start, high_water, self._target)
+        increments: list[SalesRollup] = []
+        late = 0
+        for sale in self._sale_repo.iter_sales(high_water, None, batch_size=self._batch_size):
+            increments.extend(sale_rollups(sale))
+            late += 1
+            if late % self._batch_size == 0:
+                increments = merge_rollups(increments)
+        live = swap()
+        live.apply(merge_rollups(increments))
+        return sales + late
+
+    def _rebuild(self, start: datetime, end: datetime, target: SalesRollupPort) -> int:
+        windows = rollup_windows(start, end, self._chunk)
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="rollup-rebuild") as pool:
+            return sum(pool.map(partial(self._rebuild_window, target), windows))
+
+    def _rebuild_window(self, target: SalesRollupPort, window: tuple[datetime, datetime]) -> int:
+        increments: list[SalesRollup] = []
+        sales = 0
+        for sale in self._sale_repo.iter_sales(window[0], window[1], batch_size=self._batch_size):
+            increments.extend(sale_rollups(sale))
+            sales += 1
+            if sales % self._batch_size == 0:
+                target.apply(merge_rollups(increments))
+                increments = []
+        target.apply(merge_rollups(increments))
+        return sales
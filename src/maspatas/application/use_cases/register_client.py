@@ -4,40 +4,86 @@ from maspatas.application.dto.client_dto import RegisterClientInputDTO, Register
 from maspatas.application.services.authorization import AuthorizationService, Role
 from maspatas.domain.entities.client import Client
 from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation
-from maspatas.domain.ports.concurrency import ConcurrencyControlPort
+from maspatas.domain.ports.async_repositories import AsyncClientRepositoryPort
+from maspatas.domain.ports.concurrency import AsyncConcurrencyControlPort, ConcurrencyControlPort
+from maspatas.domain.ports.existence_filter import ExistenceFilterPort, might_exist, remember
 from maspatas.domain.ports.repositories import ClientRepositoryPort
 from maspatas.domain.value_objects.common import ClientId
 
 
+def _duplicated_client(client_id: str) -> BusinessRuleViolation:
+    return BusinessRuleViolation(f"Ya existe un cliente con id {client_id}")
+
+
+def _build_client(dto: RegisterClientInputDTO) -> Client:
+    return Client(
+        id=ClientId(dto.client_id),
+        full_name=dto.full_name,
+        email=dto.email,
+    )
+
+
+def _to_output(client: Client) -> RegisterClientOutputDTO:
+    return RegisterClientOutputDTO(
+        client_id=client.id.value,
+        full_name=client.full_name,
+        email=client.email,
+    )
+
+
 class RegisterClientUseCase:
     def __init__(
         self,
         client_repo: ClientRepositoryPort,
         concurrency: ConcurrencyControlPort,
         authz: AuthorizationService,
+        known_ids: ExistenceFilterPort | None = None,
     ) -> None:
         self._client_repo = client_repo
         self._concurrency = concurrency
         self._authz = authz
+        self._known_ids = known_ids
 
     def execute(self, dto: RegisterClientInputDTO, role: Role) -> RegisterClientOutputDTO:
         self._authz.ensure_permission(role, "register_client")
 
         client_id = ClientId(dto.client_id)
-        if self._client_repo.get_by_id(client_id) is not None:
-            raise BusinessRuleViolation(f"Ya existe un cliente con id {dto.client_id}")
+        if might_exist(self._known_ids, dto.client_id) and self._client_repo.get_by_id(client_id) is not None:
+            raise _duplicated_client(dto.client_id)
 
         lock_key = f"client:{dto.client_id}"
         with self._concurrency.lock(lock_key):
-            client = Client(
-                id=client_id,
-                full_name=dto.full_name,
-                email=dto.email,
-            )
+            client = _build_client(dto)
             self._client_repo.save_client(client)
+            remember(self._known_ids, dto.client_id)
+
+            return _to_output(client)
+
+
+class AsyncRegisterClientUseCase:
+    def __init__(
+        self,
+        client_repo: AsyncClientRepositoryPort,
+        concurrency: AsyncConcurrencyControlPort,
+        authz: AuthorizationService,
+        known_ids: ExistenceFilterPort | None = None,
+    ) -> None:
+        self._client_repo = client_repo
+        self._concurrency = concurrency
+        self._authz = authz
+        self._known_ids = known_ids
+
+    async def execute(self, dto: RegisterClientInputDTO, role: Role) -> RegisterClientOutputDTO:
+        self._authz.ensure_permission(role, "register_client")
+
+        client_id = ClientId(dto.client_id)
+        if might_exist(self._known_ids, dto.client_id) and await self._client_repo.get_by_id(client_id) is not None:
+            raise _duplicated_client(dto.client_id)
+
+        lock_key = f"client:{dto.client_id}"
+        async with self._concurrency.lock(lock_key):
+            client = _build_client(dto)
+            await self._client_repo.save_client(client)
+            remember(self._known_ids, dto.client_id)
 
-            return RegisterClientOutputDTO(
-                client_id=client.id.value,
-                full_name=client.full_name,
-                email=client.email,
-            )
+            return _to_output(client)
@@ -1,17 +1,116 @@
 from __future__ import annotations
 
-from decimal import Decimal
+from collections.abc import Mapping, Sequence
+from decimal import Decimal, InvalidOperation
 
-from maspatas.application.dto.product_dto import RegisterProductInputDTO, RegisterProductOutputDTO
+from maspatas.application.dto.product_dto import (
+    CatalogImportChunkDTO,
+    CatalogRowDTO,
+    CatalogRowErrorDTO,
+    RegisterProductInputDTO,
+    RegisterProductOutputDTO,
+)
 from maspatas.application.services.authorization import AuthorizationService, Role
-from maspatas.domain.entities.inventory import InventoryMovementType
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryMovementType
 from maspatas.domain.entities.product import Product
 from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation
-from maspatas.domain.ports.concurrency import ConcurrencyControlPort
+from maspatas.domain.ports.async_repositories import AsyncInventoryRepositoryPort, AsyncProductRepositoryPort
+from maspatas.domain.ports.concurrency import AsyncConcurrencyControlPort, ConcurrencyControlPort
+from maspatas.domain.ports.existence_filter import ExistenceFilterPort, might_exist, remember
 from maspatas.domain.ports.repositories import InventoryRepositoryPort, ProductRepositoryPort
+from maspatas.domain.services.deadline import check_deadline
 from maspatas.domain.value_objects.common import Money, ProductId
 
 
+def _validate_initial_stock(dto: RegisterProductInputDTO) -> None:
+    if dto.initial_stock < 0:
+        raise BusinessRuleViolation("No se permite stock inicial negativo")
+
+
+def _duplicated_product(product_id: str) -> BusinessRuleViolation:
+    return BusinessRuleViolation(f"Ya existe un producto con id {product_id}")
+
+
+def _build_product(dto: RegisterProductInputDTO) -> Product:
+    return Product(
+        id=ProductId(dto.product_id),
+        name=dto.name,
+        sku=dto.sku,
+        price=Money(amount=Decimal(dto.price_amount), currency=dto.currency),
+    )
+
+
+def _with_initial_stock(inventory: InventoryAggregate, product: Product, quantity: int) -> InventoryAggregate:
+    return inventory.apply_movement(
+        product_id=product.id,
+        movement_type=InventoryMovementType.ENTRADA,
+        quantity=quantity,
+    )
+
+
+def _to_output(product: Product, initial_stock: int) -> RegisterProductOutputDTO:
+    return RegisterProductOutputDTO(
+        product_id=product.id.value,
+        name=product.name,
+        sku=product.sku,
+        price_amount=str(product.price.amount),
+        currency=product.price.currency,
+        initial_stock=initial_stock,
+    )
+
+
+def _plan_catalog(rows: Sequence[CatalogRowDTO]) -> tuple[list[tuple[int, int, Product]], list[CatalogRowErrorDTO]]:
+    planned: list[tuple[int, int, Product]] = []
+    errors: list[CatalogRowErrorDTO] = []
+    seen_ids: set[str] = set()
+    seen_skus: set[str] = set()
+    for row in rows:
+        dto = row.product
+        if dto is None:
+            errors.append(CatalogRowErrorDTO(line=row.line, product_id=None, error=row.error or "Fila inválida"))
+            continue
+        try:
+            _validate_initial_stock(dto)
+            product = _build_product(dto)
+            if dto.product_id in seen_ids:
+                raise BusinessRuleViolation(f"El producto {dto.product_id} está repetido en el archivo")
+            if product.sku in seen_skus:
+                raise BusinessRuleViolation(f"El SKU {product.sku} está repetido en el archivo")
+        except BusinessRuleViolation as exc:
+            errors.append(CatalogRowErrorDTO(line=row.line, product_id=dto.product_id, error=str(exc)))
+            continue
+        except InvalidOperation:
+            errors.append(CatalogRowErrorDTO(line=row.line, product_id=dto.product_id, error=f"Precio inválido: {dto.price_amount}"))
+            continue
+        seen_ids.add(dto.product_id)
+        seen_skus.add(product.sku)
+        planned.append((row.line, dto.initial_stock, product))
+    return planned, errors
+
+
+def _catalog_result(
+    rows: Sequence[CatalogRowDTO],
+    planned: list[tuple[int, int, Product]],
+    rejected: Mapping[str, str],
+    errors: list[CatalogRowErrorDTO],
+    known_ids: ExistenceFilterPort | None,
+) -> tuple[CatalogImportChunkDTO, dict[ProductId, int]]:
+    stock: dict[ProductId, int] = {}
+    for line, initial_stock, product in planned:
+        if product.id.value in rejected:
+            errors.append(CatalogRowErrorDTO(line=line, product_id=product.id.value, error=rejected[product.id.value]))
+            continue
+        remember(known_ids, product.id.value)
+        if initial_stock > 0:
+            stock[product.id] = initial_stock
+    result = CatalogImportChunkDTO(
+        processed=len(rows),
+        imported=len(planned) - len(rejected),
+        errors=tuple(sorted(errors, key=lambda error: error.line)),
+    )
+    return result, stock
+
+
 class RegisterProductUseCase:
     def __init__(
         self,
@@ -19,46 +118,116 @@ class RegisterProductUseCase:
         inventory_repo: InventoryRepositoryPort,
         concurrency: ConcurrencyControlPort,
         authz: AuthorizationService,
+        known_ids: ExistenceFilterPort | None = None,
     ) -> None:
         self._product_repo = product_repo
         self._inventory_repo = inventory_repo
         self._concurrency = concurrency
         self._authz = authz
+        self._known_ids = known_ids
 
     def execute(self, dto: RegisterProductInputDTO, role: Role) -> RegisterProductOutputDTO:
         self._authz.ensure_permission(role, "manage_inventory")
-
-        if dto.initial_stock < 0:
-            raise BusinessRuleViolation("No se permite stock inicial negativo")
+        _validate_initial_stock(dto)
 
         product_id = ProductId(dto.product_id)
-        if self._product_repo.get_by_id(product_id) is not None:
-            raise BusinessRuleViolation(f"Ya existe un producto con id {dto.product_id}")
+        if might_exist(self._known_ids, dto.product_id) and self._product_repo.get_by_id(product_id) is not None:
+            raise _duplicated_product(dto.product_id)
 
         lock_key = f"product:{dto.product_id}"
         with self._concurrency.lock(lock_key):
-            product = Product(
-                id=product_id,
-                name=dto.name,
-                sku=dto.sku,
-                price=Money(amount=Decimal(dto.price_amount), currency=dto.currency),
-            )
+            product = _build_product(dto)
             self._product_repo.save_product(product)
+            remember(self._known_ids, dto.product_id)
 
             if dto.initial_stock > 0:
-                inventory = self._inventory_repo.get_inventory()
-                inventory = inventory.apply_movement(
-                    product_id=product.id,
-                    movement_type=InventoryMovementType.ENTRADA,
-                    quantity=dto.initial_stock,
-                )
-                self._inventory_repo.save_inventory(inventory)
-
-            return RegisterProductOutputDTO(
-                product_id=product.id.value,
-                name=product.name,
-                sku=product.sku,
-                price_amount=str(product.price.amount),
-                currency=product.price.currency,
-                initial_stock=dto.initial_stock,
-            )
+                inventory = self._inventory_repo.get_items([product.id])
+                self._inventory_repo.save_inventory(_with_initial_stock(inventory, product, dto.initial_stock))
+
+            return _to_output(product, dto.initial_stock)
+
+
+class AsyncRegisterProductUseCase:
+    def __init__(
+        self,
+        product_repo: AsyncProductRepositoryPort,
+        inventory_repo: AsyncInventoryRepositoryPort,
+        concurrency: AsyncConcurrencyControlPort,
+        authz: AuthorizationService,
+        known_ids: ExistenceFilterPort | None = None,
+    ) -> None:
+        self._product_repo = product_repo
+        self._inventory_repo = inventory_repo
+        self._concurrency = concurrency
+        self._authz = authz
+        self._known_ids = known_ids
+
+    async def execute(self, dto: RegisterProductInputDTO, role: Role) -> RegisterProductOutputDTO:
+        self._authz.ensure_permission(role, "manage_inventory")
+        _validate_initial_stock(dto)
+
+        product_id = ProductId(dto.product_id)
+        if might_exist(self._known_ids, dto.product_id) and await self._product_repo.get_by_id(product_id) is not None:
+            raise _duplicated_product(dto.product_id)
+
+        lock_key = f"product:{dto.product_id}"
+        async with self._concurrency.lock(lock_key):
+            product = _build_product(dto)
+            await self._product_repo.save_product(product)
+            remember(self._known_ids, dto.product_id)
+
+            if dto.initial_stock > 0:
+                inventory = await self._inventory_repo.get_items([product.id])
+                await self._inventory_repo.save_inventory(_with_initial_stock(inventory, product, dto.initial_stock))
+
+            return _to_output(product, dto.initial_stock)
+
+
+class ImportCatalogUseCase:
+    def __init__(
+        self,
+        product_repo: ProductRepositoryPort,
+        inventory_repo: InventoryRepositoryPort,
+        authz: AuthorizationService,
+        known_ids: ExistenceFilterPort | None = None,
+    ) -> None:
+        self._product_repo = product_repo
+        self._inventory_repo = inventory_repo
+        self._authz = authz
+        self._known_ids = known_ids
+
+    def execute(self, rows: Sequence[CatalogRowDTO], role: Role) -> CatalogImportChunkDTO:
+        self._authz.ensure_permission(role, "manage_inventory")
+
+        planned, errors = _plan_catalog(rows)
+        check_deadline()
+        rejected = self._product_repo.save_products([product for _, _, product in planned])
+        result, stock = _catalog_result(rows, planned, rejected, errors, self._known_ids)
+        if stock:
+            self._inventory_repo.increase_stock(stock)
+        return result
+
+
+class AsyncImportCatalogUseCase:
+    def __init__(
+        self,
+        product_repo: AsyncProductRepositoryPort,
+        inventory_repo: AsyncInventoryRepositoryPort,
+        authz: AuthorizationService,
+        known_ids: ExistenceFilterPort | None = None,
+    ) -> None:
+        self._product_repo = product_repo
+        self._inventory_repo = inventory_repo
+        self._authz = authz
+        self._known_ids = known_ids
+
+    async def execute(self, rows: Sequence[CatalogRowDTO], role: Role) -> CatalogImportChunkDTO:
+        self._authz.ensure_permission(role, "manage_inventory")
+
+        planned, errors = _plan_catalog(rows)
+        check_deadline()
+        rejected = await self._product_repo.save_products([product for _, _, product in planned])
+        result, stock = _catalog_result(rows, planned, rejected, errors, self._known_ids)
+        if stock:
+            await self._inventory_repo.increase_stock(stock)
+        return result
@@ -1,20 +1,152 @@
 from __future__ import annotations
 
-from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, RegisterSaleOutputDTO
+from collections.abc import Iterable, Mapping, Sequence
+
+from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, RegisterSaleOutputDTO, SaleBatchResultDTO
 from maspatas.application.services.authorization import AuthorizationService, Role
-from maspatas.domain.entities.inventory import InventoryMovementType
+from maspatas.domain.entities.client import Client
+from maspatas.domain.entities.product import Product
 from maspatas.domain.entities.sale import SaleAggregate, SaleLine
-from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation
-from maspatas.domain.ports.concurrency import ConcurrencyControlPort
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation, InsufficientStockError, PartialBatchWriteError
+from maspatas.domain.ports.async_repositories import (
+    AsyncClientRepositoryPort,
+    AsyncInventoryRepositoryPort,
+    AsyncProductRepositoryPort,
+    AsyncSaleRepositoryPort,
+)
+from maspatas.domain.ports.concurrency import AsyncConcurrencyControlPort, ConcurrencyControlPort
 from maspatas.domain.ports.repositories import (
     ClientRepositoryPort,
     InventoryRepositoryPort,
     ProductRepositoryPort,
     SaleRepositoryPort,
 )
+from maspatas.domain.ports.rollups import AsyncSalesRollupPort, SalesRollup, SalesRollupPort
+from maspatas.domain.services.deadline import check_deadline, deadline_suspended
+from maspatas.domain.services.rollups import merge_rollups, sale_rollups
 from maspatas.domain.value_objects.common import ClientId, ProductId
 
 
+def _ensure_client(client: Client | None) -> Client:
+    if client is None:
+        raise BusinessRuleViolation("Cliente no encontrado")
+    return client
+
+
+def _build_line(product_id: ProductId, product: Product | None, quantity: int) -> SaleLine:
+    if product is None:
+        raise BusinessRuleViolation(f"Producto no encontrado: {product_id.value}")
+    return SaleLine(product_id=product_id, quantity=quantity, unit_price=product.price)
+
+
+def _product_ids(dto: RegisterSaleInputDTO) -> tuple[ProductId, ...]:
+    return tuple(ProductId(line.product_id) for line in dto.lines)
+
+
+def _build_lines(
+    dto: RegisterSaleInputDTO,
+    product_ids: tuple[ProductId, ...],
+    products: Mapping[ProductId, Product],
+) -> tuple[SaleLine, ...]:
+    check_deadline()
+    return tuple(
+        _build_line(product_id, products.get(product_id), line.quantity)
+        for product_id, line in zip(product_ids, dto.lines)
+    )
+
+
+def _quantities(lines: tuple[SaleLine, ...]) -> dict[ProductId, int]:
+    quantities: dict[ProductId, int] = {}
+    for line in lines:
+        quantities[line.product_id] = quantities.get(line.product_id, 0) + line.quantity
+    return quantities
+
+
+def _reverted(increments: list[SalesRollup]) -> list[SalesRollup]:
+    return [increment.negated() for increment in increments]
+
+
+def _to_output(sale: SaleAggregate) -> RegisterSaleOutputDTO:
+    return RegisterSaleOutputDTO(
+        sale_id=sale.sale_id,
+        total_amount=str(sale.total.amount),
+        currency=sale.total.currency,
+    )
+
+
+def _batch_ids(dtos: Sequence[RegisterSaleInputDTO]) -> tuple[set[ClientId], set[ProductId]]:
+    client_ids = {ClientId(dto.client_id) for dto in dtos if dto.client_id.strip()}
+    product_ids = {ProductId(line.product_id) for dto in dtos for line in dto.lines if line.product_id.strip()}
+    return client_ids, product_ids
+
+
+def _plan_batch(
+    dtos: Sequence[RegisterSaleInputDTO],
+    clients: Mapping[ClientId, Client],
+    products: Mapping[ProductId, Product],
+    inventory: InventoryAggregate,
+) -> tuple[dict[int, SaleAggregate], dict[int, str]]:
+    accepted: dict[int, SaleAggregate] = {}
+    rejected: dict[int, str] = {}
+    seen: set[str] = set()
+    stock: dict[ProductId, InventoryItem] = dict(inventory.items)
+    for index, dto in enumerate(dtos):
+        try:
+            if dto.sale_id in seen:
+                raise BusinessRuleViolation(f"La venta {dto.sale_id} está repetida en el lote")
+            seen.add(dto.sale_id)
+            client = _ensure_client(clients.get(ClientId(dto.client_id)))
+            sale = SaleAggregate(sale_id=dto.sale_id, client_id=client.id, lines=_build_lines(dto, _product_ids(dto), products))
+            remaining = [
+                stock.get(product_id, InventoryItem(product_id=product_id)).decrease(quantity)
+                for product_id, quantity in _quantities(sale.lines).items()
+            ]
+        except BusinessRuleViolation as exc:
+            rejected[index] = str(exc)
+            continue
+        stock.update((item.product_id, item) for item in remaining)
+        accepted[index] = sale
+    return accepted, rejected
+
+
+def _batch_quantities(sales: Iterable[SaleAggregate]) -> dict[ProductId, int]:
+    return _quantities(tuple(line for sale in sales for line in sale.lines))
+
+
+def _batch_rollups(sales: Iterable[SaleAggregate]) -> list[SalesRollup]:
+    return merge_rollups(increment for sale in sales for increment in sale_rollups(sale))
+
+
+def _unsaved(sales: Iterable[SaleAggregate], exc: Exception) -> list[SaleAggregate]:
+    written = exc.written if isinstance(exc, PartialBatchWriteError) else frozenset()
+    return [sale for sale in sales if sale.sale_id not in written]
+
+
+def _split_duplicates(
+    accepted: dict[int, SaleAggregate],
+    rejected: dict[int, str],
+    duplicated: set[str],
+) -> list[SaleAggregate]:
+    stale = [index for index, sale in accepted.items() if sale.sale_id in duplicated]
+    for index in stale:
+        rejected[index] = f"Ya existe una venta con id {accepted[index].sale_id}"
+    return [accepted.pop(index) for index in stale]
+
+
+def _batch_results(
+    dtos: Sequence[RegisterSaleInputDTO],
+    accepted: Mapping[int, SaleAggregate],
+    rejected: Mapping[int, str],
+) -> list[SaleBatchResultDTO]:
+    return [
+        SaleBatchResultDTO(sale_id=dto.sale_id, sale=_to_output(accepted[index]))
+        if index in accepted
+        else SaleBatchResultDTO(sale_id=dto.sale_id, error=rejected[index])
+        for index, dto in enumerate(dtos)
+    ]
+
+
 class RegisterSaleUseCase:
     def __init__(
         self,
@@ -24,6 +156,7 @@ class RegisterSaleUseCase:
         sale_repo: SaleRepositoryPort,
         concurrency: ConcurrencyControlPort,
         authz: AuthorizationService,
+        rollups: SalesRollupPort | None = None,
     ) -> None:
         self._product_repo = product_repo
         self._client_repo = client_repo
@@ -31,44 +164,246 @@ class RegisterSaleUseCase:
         self._sale_repo = sale_repo
         self._concurrency = concurrency
         self._authz = authz
+        self._rollups = rollups
 
     def execute(self, dto: RegisterSaleInputDTO, role: Role) -> RegisterSaleOutputDTO:
         self._authz.ensure_permission(role, "register_sale")
 
-        client = self._client_repo.get_by_id(ClientId(dto.client_id))
-        if client is None:
-            raise BusinessRuleViolation("Cliente no encontrado")
+        client = _ensure_client(self._client_repo.get_by_id(ClientId(dto.client_id)))
 
         lock_key = f"sale:{dto.sale_id}"
         with self._concurrency.lock(lock_key):
-            inventory = self._inventory_repo.get_inventory()
-            sale_lines: list[SaleLine] = []
+            product_ids = _product_ids(dto)
+            products = self._product_repo.get_many(product_ids)
+            sale = SaleAggregate(
+                sale_id=dto.sale_id,
+                client_id=client.id,
+                lines=_build_lines(dto, product_ids, products),
+            )
+            quantities = _quantities(sale.lines)
+            check_deadline()
+            self._inventory_repo.decrease_stock(quantities)
+            rollups = self._rollups
+            applied: list[SalesRollup] = []
+            try:
+                if rollups is not None:
+                    increments = sale_rollups(sale)
+                    rollups.apply(increments)
+                    applied = increments
+                self._sale_repo.save_sale(sale)
+            except Exception:
+                with deadline_suspended():
+                    if rollups is not None and applied:
+                        rollups.apply(_reverted(applied))
+                    self._inventory_repo.increase_stock(quantities)
+                raise
 
-            for line in dto.lines:
-                product_id = ProductId(line.product_id)
-                product = self._product_repo.get_by_id(product_id)
-                if product is None:
-                    raise BusinessRuleViolation(f"Producto no encontrado: {line.product_id}")
+            return _to_output(sale)
 
-                current_item = inventory.get_item(product_id)
-                if current_item.stock < line.quantity:
-                    raise BusinessRuleViolation(
-                        f"Stock insuficiente para {line.product_id}. Disponible={current_item.stock}, solicitado={line.quantity}"
-                    )
 
-                inventory = inventory.apply_movement(product_id, movement_type=InventoryMovementType.SALIDA, quantity=line.quantity)
-                sale_lines.append(SaleLine(product_id=product_id, quantity=line.quantity, unit_price=product.price))
+class AsyncRegisterSaleUseCase:
+    def __init__(
+        self,
+        product_repo: AsyncProductRepositoryPort,
+        client_repo: AsyncClientRepositoryPort,
+        inventory_repo: AsyncInventoryRepositoryPort,
+        sale_repo: AsyncSaleRepositoryPort,
+        concurrency: AsyncConcurrencyControlPort,
+        authz: AuthorizationService,
+        rollups: AsyncSalesRollupPort | None = None,
+    ) -> None:
+        self._product_repo = product_repo
+        self._client_repo = client_repo
+        self._inventory_repo = inventory_repo
+        self._sale_repo = sale_repo
+        self._concurrency = concurrency
+        self._authz = authz
+        self._rollups = rollups
+
+    async def execute(self, dto: RegisterSaleInputDTO, role: Role) -> RegisterSaleOutputDTO:
+        self._authz.ensure_permission(role, "register_sale")
 
+        client = _ensure_client(await self._client_repo.get_by_id(ClientId(dto.client_id)))
+
+        lock_key = f"sale:{dto.sale_id}"
+        async with self._concurrency.lock(lock_key):
+            product_ids = _product_ids(dto)
+            products = await self._product_repo.get_many(product_ids)
             sale = SaleAggregate(
                 sale_id=dto.sale_id,
                 client_id=client.id,
-                lines=tuple(sale_lines),
+                lines=_build_lines(dto, product_ids, products),
             )
-            self._sale_repo.save_sale(sale)
-            self._inventory_repo.save_inventory(inventory)
+            quantities = _quantities(sale.lines)
+            check_deadline()
+            await self._inventory_repo.decrease_stock(quantities)
+            rollups = self._rollups
+            applied: list[SalesRollup] = []
+            try:
+                if rollups is not None:
+                    increments = sale_rollups(sale)
+                    await rollups.apply(increments)
+                    applied = increments
+                await self._sale_repo.save_sale(sale)
+            except Exception:
+                with deadline_suspended():
+                    if rollups is not None and applied:
+                        await rollups.apply(_reverted(applied))
+                    await self._inventory_repo.increase_stock(quantities)
+                raise
 
-            return RegisterSaleOutputDTO(
-                sale_id=sale.sale_id,
-                total_amount=str(sale.total.amount),
-                currency=sale.total.currency,
-            )
+            return _to_output(sale)
+
+
+class RegisterSalesBatchUseCase:
+    def __init__(
+        self,
+        product_repo: ProductRepositoryPort,
+        client_repo: ClientRepositoryPort,
+        inventory_repo: InventoryRepositoryPort,
+        sale_repo: SaleRepositoryPort,
+        authz: AuthorizationService,
+        rollups: SalesRollupPort | None = None,
+    ) -> None:
+        self._product_repo = product_repo
+        self._client_repo = client_repo
+        self._inventory_repo = inventory_repo
+        self._sale_repo = sale_repo
+        self._authz = authz
+        self._rollups = rollups
+
+    def execute(self, dtos: Sequence[RegisterSaleInputDTO], role: Role) -> list[SaleBatchResultDTO]:
+        self._authz.ensure_permission(role, "register_sale")
+
+        client_ids, product_ids = _batch_ids(dtos)
+        clients = self._client_repo.get_many(client_ids)
+        products = self._product_repo.get_many(product_ids)
+        inventory = self._inventory_repo.get_items(product_ids)
+        accepted, rejected = _plan_batch(dtos, clients, products, inventory)
+        check_deadline()
+        accepted = self._decrease_stock(accepted, rejected)
+        rollups = self._rollups
+        applied: list[SalesRollup] = []
+        try:
+            if rollups is not None and accepted:
+                increments = _batch_rollups(accepted.values())
+                rollups.apply(increments)
+                applied = increments
+            duplicated = self._sale_repo.save_sales(list(accepted.values()))
+        except Exception as exc:
+            unsaved = _unsaved(accepted.values(), exc)
+            with deadline_suspended():
+                if rollups is not None and applied and unsaved:
+                    rollups.apply(_reverted(_batch_rollups(unsaved)))
+                if unsaved:
+                    self._inventory_repo.increase_stock(_batch_quantities(unsaved))
+            raise
+
+        stale = _split_duplicates(accepted, rejected, duplicated)
+        if stale:
+            with deadline_suspended():
+                if rollups is not None and applied:
+                    rollups.apply(_reverted(_batch_rollups(stale)))
+                self._inventory_repo.increase_stock(_batch_quantities(stale))
+        return _batch_results(dtos, accepted, rejected)
+
+    def _decrease_stock(self, accepted: dict[int, SaleAggregate], rejected: dict[int, str]) -> dict[int, SaleAggregate]:
+        if not accepted:
+            return accepted
+        try:
+            self._inventory_repo.decrease_stock(_batch_quantities(accepted.values()))
+            return accepted
+        except InsufficientStockError:
+            pass
+        # Otra petición consumió stock después de la lectura: se descuenta venta por venta.
+        kept: dict[int, SaleAggregate] = {}
+        try:
+            for index, sale in accepted.items():
+                try:
+                    self._inventory_repo.decrease_stock(_quantities(sale.lines))
+                except InsufficientStockError as exc:
+                    rejected[index] = str(exc)
+                    continue
+                kept[index] = sale
+        except Exception:
+            with deadline_suspended():
+                self._inventory_repo.increase_stock(_batch_quantities(kept.values()))
+            raise
+        return kept
+
+
+class AsyncRegisterSalesBatchUseCase:
+    def __init__(
+        self,
+        product_repo: AsyncProductRepositoryPort,
+        client_repo: AsyncClientRepositoryPort,
+        inventory_repo: AsyncInventoryRepositoryPort,
+        sale_repo: AsyncSaleRepositoryPort,
+        authz: AuthorizationService,
+        rollups: AsyncSalesRollupPort | None = None,
+    ) -> None:
+        self._product_repo = product_repo
+        self._client_repo = client_repo
+        self._inventory_repo = inventory_repo
+        self._sale_repo = sale_repo
+        self._authz = authz
+        self._rollups = rollups
+
+    async def execute(self, dtos: Sequence[RegisterSaleInputDTO], role: Role) -> list[SaleBatchResultDTO]:
+        self._authz.ensure_permission(role, "register_sale")
+
+        client_ids, product_ids = _batch_ids(dtos)
+        clients = await self._client_repo.get_many(client_ids)
+        products = await self._product_repo.get_many(product_ids)
+        inventory = await self._inventory_repo.get_items(product_ids)
+        accepted, rejected = _plan_batch(dtos, clients, products, inventory)
+        check_deadline()
+        accepted = await self._decrease_stock(accepted, rejected)
+        rollups = self._rollups
+        applied: list[SalesRollup] = []
+        try:
+            if rollups is not None and accepted:
+                increments = _batch_rollups(accepted.values())
+                await rollups.apply(increments)
+                applied = increments
+            duplicated = await self._sale_repo.save_sales(list(accepted.values()))
+        except Exception as exc:
+            unsaved = _unsaved(accepted.values(), exc)
+            with deadline_suspended():
+                if rollups is not None and applied and unsaved:
+                    await rollups.apply(_reverted(_batch_rollups(unsaved)))
+                if unsaved:
+                    await self._inventory_repo.increase_stock(_batch_quantities(unsaved))
+            raise
+
+        stale = _split_duplicates(accepted, rejected, duplicated)
+        if stale:
+            with deadline_suspended():
+                if rollups is not None and applied:
+                    await rollups.apply(_reverted(_batch_rollups(stale)))
+                await self._inventory_repo.increase_stock(_batch_quantities(stale))
+        return _batch_results(dtos, accepted, rejected)
+
+    async def _decrease_stock(self, accepted: dict[int, SaleAggregate], rejected: dict[int, str]) -> dict[int, SaleAggregate]:
+        if not accepted:
+            return accepted
+        try:
+            await self._inventory_repo.decrease_stock(_batch_quantities(accepted.values()))
+            return accepted
+        except InsufficientStockError:
+            pass
+        # Otra petición consumió stock después de la lectura: se descuenta venta por venta.
+        kept: dict[int, SaleAggregate] = {}
+        try:
+            for index, sale in accepted.items():
+                try:
+                    await self._inventory_repo.decrease_stock(_quantities(sale.lines))
+                except InsufficientStockError as exc:
+                    rejected[index] = str(exc)
+                    continue
+                kept[index] = sale
+        except Exception:
+            with deadline_suspended():
+                await self._inventory_repo.increase_stock(_batch_quantities(kept.values()))
+            raise
+        return kept
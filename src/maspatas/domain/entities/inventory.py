@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from bisect import bisect_left
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field, replace
 from enum import Enum
 
@@ -7,6 +9,10 @@ from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation,
 from maspatas.domain.value_objects.common import ProductId
 
 
+def insufficient_stock(product_id: ProductId, available: int, quantity: int) -> InsufficientStockError:
+    return InsufficientStockError(f"Stock insuficiente para {product_id.value}. Actual={available}, requerido={quantity}")
+
+
 class InventoryMovementType(str, Enum):
     ENTRADA = "ENTRADA"
     SALIDA = "SALIDA"
@@ -27,9 +33,7 @@ class InventoryItem:
         if quantity <= 0:
             raise BusinessRuleViolation("La cantidad a descontar debe ser positiva")
         if self.stock < quantity:
-            raise InsufficientStockError(
-                f"Stock insuficiente para {self.product_id.value}. Actual={self.stock}, requerido={quantity}"
-            )
+            raise insufficient_stock(self.product_id, self.stock, quantity)
         return replace(self, stock=self.stock - quantity)
 
     def adjust(self, new_stock: int) -> "InventoryItem":
@@ -38,9 +42,100 @@ class InventoryItem:
         return replace(self, stock=new_stock)
 
 
+class _ChangeLog:
+    # Registro compartido de movimientos: cada versión de InventoryItems ve solo sus primeras
+    # `length` entradas, así que extender la última versión no copia los cambios anteriores.
+    __slots__ = ("entries", "positions")
+
+    def __init__(self) -> None:
+        self.entries: list[InventoryItem] = []
+        self.positions: dict[ProductId, list[int]] = {}
+
+    def append(self, item: InventoryItem) -> None:
+        self.positions.setdefault(item.product_id, []).append(len(self.entries))
+        self.entries.append(item)
+
+
+class InventoryItems(Mapping[ProductId, InventoryItem]):
+    __slots__ = ("_base", "_log", "_length")
+
+    def __init__(
+        self,
+        base: Mapping[ProductId, InventoryItem] | None = None,
+        changes: Mapping[ProductId, InventoryItem] | None = None,
+    ) -> None:
+        self._base = base if base is not None else {}
+        self._log = _ChangeLog()
+        for item in (changes or {}).values():
+            self._log.append(item)
+        self._length = len(self._log.entries)
+
+    def _changed(self, product_id: object) -> InventoryItem | None:
+        positions = self._log.positions.get(product_id)  # type: ignore[call-overload]
+        if not positions or positions[0] >= self._length:
+            return None
+        return self._log.entries[positions[bisect_left(positions, self._length) - 1]]
+
+    def __getitem__(self, product_id: ProductId) -> InventoryItem:
+        changed = self._changed(product_id)
+        if changed is not None:
+            return changed
+        return self._base[product_id]
+
+    def __contains__(self, product_id: object) -> bool:
+        return self._changed(product_id) is not None or product_id in self._base
+
+    def __iter__(self) -> Iterator[ProductId]:
+        changed = self.changed_ids
+        yield from (product_id for product_id in self._log.positions if product_id in changed)
+        for product_id in self._base:
+            if product_id not in changed:
+                yield product_id
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(1 for product_id in self.changed_ids if product_id not in self._base)
+
+    def __repr__(self) -> str:
+        return f"InventoryItems({dict(self)!r})"
+
+    @property
+    def changed_ids(self) -> frozenset[ProductId]:
+        return frozenset(product_id for product_id, positions in self._log.positions.items() if positions[0] < self._length)
+
+    def changed_items(self) -> tuple[InventoryItem, ...]:
+        return tuple(self[product_id] for product_id in self._log.positions if self._changed(product_id) is not None)
+
+    def with_item(self, item: InventoryItem) -> "InventoryItems":
+        updated = InventoryItems.__new__(InventoryItems)
+        updated._base = self._base
+        if self._length == len(self._log.entries):
+            updated._log = self._log
+        else:
+            # Se ramifica desde una versión anterior: copia solo su prefijo del registro.
+            updated._log = _ChangeLog()
+            for entry in self._log.entries[: self._length]:
+                updated._log.append(entry)
+        updated._log.append(item)
+        updated._length = self._length + 1
+        return updated
+
+
 @dataclass(frozen=True)
 class InventoryAggregate:
-    items: dict[ProductId, InventoryItem] = field(default_factory=dict)
+    items: Mapping[ProductId, InventoryItem] = field(default_factory=dict)
+    _tracked: InventoryItems = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        tracked = self.items if isinstance(self.items, InventoryItems) else InventoryItems(self.items)
+        object.__setattr__(self, "items", tracked)
+        object.__setattr__(self, "_tracked", tracked)
+
+    @property
+    def changed_product_ids(self) -> frozenset[ProductId]:
+        return self._tracked.changed_ids
+
+    def changed_items(self) -> tuple[InventoryItem, ...]:
+        return self._tracked.changed_items()
 
     def get_item(self, product_id: ProductId) -> InventoryItem:
         return self.items.get(product_id, InventoryItem(product_id=product_id, stock=0))
@@ -56,6 +151,4 @@ class InventoryAggregate:
         else:
             raise BusinessRuleViolation("Tipo de movimiento no soportado")
 
-        new_items = dict(self.items)
-        new_items[product_id] = updated
-        return replace(self, items=new_items)
+        return replace(self, items=self._tracked.with_item(updated))
@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+
 class DomainError(Exception):
     """Base para errores de dominio."""
 
@@ -12,3 +17,27 @@ class InsufficientStockError(BusinessRuleViolation):
 
 class UnauthorizedOperationError(DomainError):
     """Operación no permitida por reglas de seguridad."""
+
+
+class LockTimeoutError(DomainError):
+    """No se pudo adquirir un bloqueo dentro del tiempo permitido."""
+
+
+class DeadlineExceededError(DomainError):
+    """La operación superó el tiempo máximo asignado a la petición."""
+
+
+class IdempotencyConflictError(DomainError):
+    """La llave de idempotencia está en uso o pertenece a otra solicitud."""
+
+
+class DependencyUnavailableError(DomainError):
+    """La dependencia está degradada o saturada y rechaza nuevas peticiones."""
+
+
+class PartialBatchWriteError(Exception):
+    """Un lote falló después de guardar una parte; `written` trae los ids que sí quedaron."""
+
+    def __init__(self, written: Iterable[str]) -> None:
+        self.written = frozenset(written)
+        super().__init__(f"El lote se guardó parcialmente ({len(self.written)} registros)")
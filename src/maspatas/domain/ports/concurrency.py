@@ -1,10 +1,32 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from contextlib import AbstractContextManager
+from collections.abc import Iterable
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Lease:
+    keys: tuple[str, ...]
+    owner: str
 
 
 class ConcurrencyControlPort(ABC):
     @abstractmethod
-    def lock(self, key: str) -> AbstractContextManager[None]:
+    def lock(self, key: str, timeout: float | None = None) -> AbstractContextManager[Lease | None]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def lock_many(self, keys: Iterable[str], timeout: float | None = None) -> AbstractContextManager[Lease | None]:
+        raise NotImplementedError
+
+
+class AsyncConcurrencyControlPort(ABC):
+    @abstractmethod
+    def lock(self, key: str, timeout: float | None = None) -> AbstractAsyncContextManager[Lease | None]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def lock_many(self, keys: Iterable[str], timeout: float | None = None) -> AbstractAsyncContextManager[Lease | None]:
         raise NotImplementedError
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+
+class ExistenceFilterPort(ABC):
+    @abstractmethod
+    def might_contain(self, key: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, key: str) -> None:
+        raise NotImplementedError
+
+
+def might_exist(existence_filter: ExistenceFilterPort | None, key: str) -> bool:
+    return existence_filter is None or existence_filter.might_contain(key)
+
+
+def remember(existence_filter: ExistenceFilterPort | None, key: str) -> None:
+    if existence_filter is not None:
+        existence_filter.add(key)
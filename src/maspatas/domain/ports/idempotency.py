@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    key: str
+    fingerprint: str
+    result: dict | None = None
+    owner: str | None = None
+
+    @property
+    def in_flight(self) -> bool:
+        return self.result is None
+
+
+class IdempotencyStorePort(ABC):
+    @abstractmethod
+    async def begin(self, key: str, fingerprint: str, owner: str) -> IdempotencyRecord | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete(self, key: str, fingerprint: str, result: dict, owner: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, key: str, owner: str) -> None:
+        raise NotImplementedError
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation
+
+T = TypeVar("T")
+
+_SEPARATOR = "\x1f"
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: tuple[T, ...]
+    next_cursor: str | None = None
+
+
+def encode_cursor(*parts: str) -> str:
+    return base64.urlsafe_b64encode(_SEPARATOR.join(parts).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parts: int) -> tuple[str, ...]:
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8").split(_SEPARATOR)
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise BusinessRuleViolation("Cursor de paginación inválido") from exc
+    if len(decoded) != parts:
+        raise BusinessRuleViolation("Cursor de paginación inválido")
+    return tuple(decoded)
+
+
+def page_of(items: list[T], limit: int, cursor_for) -> Page[T]:
+    if len(items) <= limit:
+        return Page(items=tuple(items))
+    page = tuple(items[:limit])
+    return Page(items=page, next_cursor=cursor_for(page[-1]))
+
+
+def id_cursor(entity) -> str:
+    return encode_cursor(entity.id.value)
+
+
+def sale_cursor(sale) -> str:
+    return encode_cursor(sale.created_at.isoformat(), sale.sale_id)
+
+
+def decode_id_cursor(cursor: str) -> str:
+    return decode_cursor(cursor, 1)[0]
+
+
+def decode_sale_cursor(cursor: str) -> tuple[str, str]:
+    created_at, sale_id = decode_cursor(cursor, 2)
+    try:
+        datetime.fromisoformat(created_at)
+    except ValueError as exc:
+        raise BusinessRuleViolation("Cursor de paginación inválido") from exc
+    return created_at, sale_id
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal
+
+SalesGrouping = Literal["product", "day", "client"]
+
+
+@dataclass(frozen=True)
+class SalesReportRow:
+    key: str
+    currency: str
+    revenue: Decimal
+    units: int
+    sales: int
+
+
+class SalesReportPort(ABC):
+    @abstractmethod
+    def sales_report(
+        self,
+        grouping: SalesGrouping,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[SalesReportRow]:
+        raise NotImplementedError
+
+
+class AsyncSalesReportPort(ABC):
+    @abstractmethod
+    async def sales_report(
+        self,
+        grouping: SalesGrouping,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[SalesReportRow]:
+        raise NotImplementedError
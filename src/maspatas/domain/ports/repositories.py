@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import datetime
 
 from maspatas.domain.entities.client import Client
 from maspatas.domain.entities.inventory import InventoryAggregate
 from maspatas.domain.entities.product import Product
 from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.ports.pagination import Page
+from maspatas.domain.ports.sale_filter import SaleFilter
 from maspatas.domain.value_objects.common import ClientId, ProductId
 
 
@@ -14,16 +18,36 @@ class ProductRepositoryPort(ABC):
     def get_by_id(self, product_id: ProductId) -> Product | None:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_many(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Product]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_page(self, limit: int, after: str | None = None) -> Page[Product]:
+        raise NotImplementedError
+
     @abstractmethod
     def save_product(self, product: Product) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def save_products(self, products: Sequence[Product]) -> dict[str, str]:
+        raise NotImplementedError
+
 
 class ClientRepositoryPort(ABC):
     @abstractmethod
     def get_by_id(self, client_id: ClientId) -> Client | None:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_many(self, client_ids: Iterable[ClientId]) -> dict[ClientId, Client]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_page(self, limit: int, after: str | None = None) -> Page[Client]:
+        raise NotImplementedError
+
     @abstractmethod
     def save_client(self, client: Client) -> None:
         raise NotImplementedError
@@ -34,12 +58,45 @@ class InventoryRepositoryPort(ABC):
     def get_inventory(self) -> InventoryAggregate:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_items(self, product_ids: Iterable[ProductId]) -> InventoryAggregate:
+        raise NotImplementedError
+
     @abstractmethod
     def save_inventory(self, inventory: InventoryAggregate) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def decrease_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def increase_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        raise NotImplementedError
+
 
 class SaleRepositoryPort(ABC):
     @abstractmethod
     def save_sale(self, sale: SaleAggregate) -> None:
         raise NotImplementedError
+
+    @abstractmethod
+    def save_sales(self, sales: Sequence[SaleAggregate]) -> set[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_by_id(self, sale_id: str) -> SaleAggregate | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_page(self, limit: int, after: str | None = None, filters: SaleFilter | None = None) -> Page[SaleAggregate]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_sales(
+        self,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[SaleAggregate]:
+        raise NotImplementedError
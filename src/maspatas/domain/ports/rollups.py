@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from decimal import Decimal
+from typing import Literal
+
+RollupKind = Literal["product_day", "client_month"]
+
+
+@dataclass(frozen=True)
+class SalesRollup:
+    kind: RollupKind
+    key: str
+    period: str
+    currency: str
+    units: int
+    revenue: Decimal
+    sales: int
+
+    @property
+    def identity(self) -> tuple[str, str, str, str]:
+        return (self.kind, self.key, self.period, self.currency)
+
+    def negated(self) -> "SalesRollup":
+        return replace(self, units=-self.units, revenue=-self.revenue, sales=-self.sales)
+
+
+class SalesRollupPort(ABC):
+    @abstractmethod
+    def apply(self, increments: Sequence[SalesRollup]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def read(
+        self,
+        kind: RollupKind,
+        period_from: str | None = None,
+        period_to: str | None = None,
+        key: str | None = None,
+    ) -> list[SalesRollup]:
+        raise NotImplementedError
+
+
+class AsyncSalesRollupPort(ABC):
+    @abstractmethod
+    async def apply(self, increments: Sequence[SalesRollup]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def read(
+        self,
+        kind: RollupKind,
+        period_from: str | None = None,
+        period_to: str | None = None,
+        key: str | None = None,
+    ) -> list[SalesRollup]:
+        raise NotImplementedError
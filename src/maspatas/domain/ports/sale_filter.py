@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.value_objects.common import ClientId, ProductId
+
+
+@dataclass(frozen=True)
+class SaleFilter:
+    client_id: ClientId | None = None
+    product_id: ProductId | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+    def matches(self, sale: SaleAggregate) -> bool:
+        if self.client_id is not None and sale.client_id != self.client_id:
+            return False
+        if self.product_id is not None and all(line.product_id != self.product_id for line in sale.lines):
+            return False
+        if self.created_from is not None and sale.created_at < self.created_from:
+            return False
+        return self.created_to is None or sale.created_at < self.created_to
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+
+class CollectionVersionPort(ABC):
+    @abstractmethod
+    def current(self, collection: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def bump(self, collection: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def observe(self, collection: str, version: int) -> int:
+        raise NotImplementedError
+
+
+def bump_version(versions: CollectionVersionPort | None, collection: str) -> None:
+    if versions is not None:
+        versions.bump(collection)
+
+
+def observe_version(versions: CollectionVersionPort | None, collection: str, version: int) -> None:
+    if versions is not None:
+        versions.observe(collection, version)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from maspatas.domain.exceptions.domain_exceptions import DeadlineExceededError
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar("maspatas_deadline", default=None)
+
+
+@dataclass(frozen=True)
+class Deadline:
+    expires_at: float
+    budget_seconds: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(expires_at=time.monotonic() + seconds, budget_seconds=seconds)
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceededError(f"Tiempo máximo excedido: {self.budget_seconds:g}s")
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+def remaining_seconds() -> float | None:
+    deadline = _current_deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def check_deadline() -> None:
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[Deadline]:
+    deadline = Deadline.after(seconds)
+    outer = _current_deadline.get()
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+@contextmanager
+def deadline_suspended() -> Iterator[None]:
+    token = _current_deadline.set(None)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
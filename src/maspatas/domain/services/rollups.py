@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import replace
+from datetime import timezone
+
+from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.ports.rollups import SalesRollup
+
+
+def add_rollup(current: SalesRollup | None, increment: SalesRollup) -> SalesRollup:
+    if current is None:
+        return increment
+    return replace(
+        current,
+        units=current.units + increment.units,
+        revenue=current.revenue + increment.revenue,
+        sales=current.sales + increment.sales,
+    )
+
+
+def merge_rollups(increments: Iterable[SalesRollup]) -> list[SalesRollup]:
+    merged: dict[tuple[str, str, str, str], SalesRollup] = {}
+    for increment in increments:
+        merged[increment.identity] = add_rollup(merged.get(increment.identity), increment)
+    return [merged[identity] for identity in sorted(merged)]
+
+
+def sale_rollups(sale: SaleAggregate) -> list[SalesRollup]:
+    created_at = sale.created_at.astimezone(timezone.utc)
+    day = created_at.date().isoformat()
+    month = created_at.strftime("%Y-%m")
+    increments = []
+    for line in sale.lines:
+        amount = line.subtotal.amount
+        currency = line.unit_price.currency
+        increments.append(SalesRollup("product_day", line.product_id.value, day, currency, line.quantity, amount, 0))
+        increments.append(SalesRollup("client_month", sale.client_id.value, month, currency, line.quantity, amount, 0))
+    return [replace(rollup, sales=1) for rollup in merge_rollups(increments)]
+
+
+def rollup_matches(rollup: SalesRollup, period_from: str | None, period_to: str | None, key: str | None) -> bool:
+    if key is not None and rollup.key != key:
+        return False
+    if period_from is not None and rollup.period < period_from:
+        return False
+    return period_to is None or rollup.period < period_to
+
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Sequence
+from datetime import timezone
+from decimal import ROUND_HALF_EVEN, Decimal
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from maspatas.domain.entities.sale import SaleAggregate
+
+AMOUNT_SCALE = 4
+AMOUNT_TYPE = pa.decimal128(18, AMOUNT_SCALE)
+_AMOUNT_QUANTUM = Decimal(1).scaleb(-AMOUNT_SCALE)
+SALE_LINES_SCHEMA = pa.schema(
+    [
+        pa.field("sale_id", pa.string(), nullable=False),
+        pa.field("client_id", pa.string(), nullable=False),
+        pa.field("created_at", pa.timestamp("us", tz="UTC"), nullable=False),
+        pa.field("product_id", pa.string(), nullable=False),
+        pa.field("quantity", pa.int32(), nullable=False),
+        pa.field("unit_price", AMOUNT_TYPE, nullable=False),
+        pa.field("subtotal", AMOUNT_TYPE, nullable=False),
+        pa.field("currency", pa.string(), nullable=False),
+    ]
+)
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+def _amount(value: Decimal) -> Decimal:
+    # Arrow rechaza un decimal con más escala que la columna; redondear evita cortar el stream a medias.
+    return value.quantize(_AMOUNT_QUANTUM, rounding=ROUND_HALF_EVEN)
+
+
+def sale_lines_batch(sales: Sequence[SaleAggregate]) -> pa.RecordBatch:
+    columns: dict[str, list] = {name: [] for name in SALE_LINES_SCHEMA.names}
+    for sale in sales:
+        created_at = sale.created_at.astimezone(timezone.utc)
+        for line in sale.lines:
+            columns["sale_id"].append(sale.sale_id)
+            columns["client_id"].append(sale.client_id.value)
+            columns["created_at"].append(created_at)
+            columns["product_id"].append(line.product_id.value)
+            columns["quantity"].append(line.quantity)
+            columns["unit_price"].append(_amount(line.unit_price.amount))
+            columns["subtotal"].append(_amount(line.subtotal.amount))
+            columns["currency"].append(line.unit_price.currency)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(columns[field.name], type=field.type) for field in SALE_LINES_SCHEMA],
+        schema=SALE_LINES_SCHEMA,
+    )
+
+
+def iter_record_batches(sales: Iterable[SaleAggregate], chunk_size: int = 5000) -> Iterator[pa.RecordBatch]:
+    pending: list[SaleAggregate] = []
+    for sale in sales:
+        pending.append(sale)
+        if len(pending) >= chunk_size:
+            yield sale_lines_batch(pending)
+            pending = []
+    if pending:
+        yield sale_lines_batch(pending)
+
+
+async def aiter_record_batches(sales: AsyncIterator[SaleAggregate], chunk_size: int = 5000) -> AsyncIterator[pa.RecordBatch]:
+    pending: list[SaleAggregate] = []
+    async for sale in sales:
+        pending.append(sale)
+        if len(pending) >= chunk_size:
+            yield await asyncio.to_thread(sale_lines_batch, pending)
+            pending = []
+    if pending:
+        yield await asyncio.to_thread(sale_lines_batch, pending)
+
+
+def sales_table(sales: Iterable[SaleAggregate], chunk_size: int = 5000) -> pa.Table:
+    return pa.Table.from_batches(list(iter_record_batches(sales, chunk_size)), schema=SALE_LINES_SCHEMA)
+
+
+def write_parquet(
+    sales: Iterable[SaleAggregate],
+    path: str | Path,
+    chunk_size: int = 5000,
+    compression: str = "zstd",
+) -> int:
+    rows = 0
+    with pq.ParquetWriter(str(path), SALE_LINES_SCHEMA, compression=compression) as writer:
+        for batch in iter_record_batches(sales, chunk_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+class _DrainableSink(io.RawIOBase):
+    # Los escritores de Arrow/Parquet guardan offsets con tell(), por eso la posición
+    # sigue avanzando aunque los bytes ya entregados se liberen en cada drain().
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _columnar_stream(
+    sales: AsyncIterator[SaleAggregate],
+    open_writer: Callable[[_DrainableSink], object],
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    sink = _DrainableSink()
+    writer = await asyncio.to_thread(open_writer, sink)
+    try:
+        async for batch in aiter_record_batches(sales, chunk_size):
+            await asyncio.to_thread(writer.write_batch, batch)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        await asyncio.to_thread(writer.close)
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def arrow_stream(sales: AsyncIterator[SaleAggregate], chunk_size: int = 5000) -> AsyncIterator[bytes]:
+    return _columnar_stream(sales, lambda sink: pa.ipc.new_stream(sink, SALE_LINES_SCHEMA), chunk_size)
+
+
+def parquet_stream(sales: AsyncIterator[SaleAggregate], chunk_size: int = 5000, compression: str = "zstd") -> AsyncIterator[bytes]:
+    return _columnar_stream(sales, lambda sink: pq.ParquetWriter(sink, SALE_LINES_SCHEMA, compression=compression), chunk_size)
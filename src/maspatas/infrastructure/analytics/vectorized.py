@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Literal
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from maspatas.domain.ports.reports import SalesReportRow
+
+ABC_CLASSES = np.array(["A", "B", "C"])
+
+
+def _in_currency(table: pa.Table, currency: str) -> pa.Table:
+    return table.filter(pc.equal(table["currency"], currency))
+
+
+def product_totals(table: pa.Table, currency: str = "MXN") -> pa.Table:
+    totals = (
+        _in_currency(table, currency)
+        .group_by("product_id")
+        .aggregate([("quantity", "sum"), ("subtotal", "sum"), ("sale_id", "count_distinct")])
+    )
+    return totals.select(["product_id", "quantity_sum", "subtotal_sum", "sale_id_count_distinct"]).rename_columns(
+        ["product_id", "units", "revenue", "sales"]
+    )
+
+
+def top_sellers(
+    table: pa.Table,
+    limit: int = 10,
+    by: Literal["revenue", "units"] = "revenue",
+    currency: str = "MXN",
+) -> list[SalesReportRow]:
+    totals = product_totals(table, currency)
+    order = pc.sort_indices(totals, sort_keys=[(by, "descending"), ("product_id", "ascending")])
+    top = totals.take(order[:limit])
+    return [
+        SalesReportRow(key=row["product_id"], currency=currency, revenue=row["revenue"], units=row["units"], sales=row["sales"])
+        for row in top.to_pylist()
+    ]
+
+
+def abc_classification(
+    table: pa.Table,
+    thresholds: tuple[float, float] = (0.8, 0.95),
+    currency: str = "MXN",
+) -> dict[str, str]:
+    totals = product_totals(table, currency)
+    if totals.num_rows == 0:
+        return {}
+    order = pc.sort_indices(totals, sort_keys=[("revenue", "descending"), ("product_id", "ascending")])
+    ranked = totals.take(order)
+    revenue = pc.cast(ranked["revenue"], pa.float64()).to_numpy()
+    grand_total = revenue.sum()
+    if grand_total <= 0:
+        return dict.fromkeys(ranked["product_id"].to_pylist(), "C")
+    # Un producto entra en la clase cuyo umbral aún no se había alcanzado antes de sumarlo.
+    share_before = (np.cumsum(revenue) - revenue) / grand_total
+    classes = ABC_CLASSES[np.searchsorted(np.asarray(thresholds), share_before, side="right")]
+    return dict(zip(ranked["product_id"].to_pylist(), classes.tolist()))
+
+
+def basket_size_distribution(table: pa.Table) -> dict[int, int]:
+    units = table.group_by("sale_id").aggregate([("quantity", "sum")])["quantity_sum"].to_numpy()
+    sizes, counts = np.unique(units, return_counts=True)
+    return dict(zip(sizes.tolist(), counts.tolist()))
+
+
+def hourly_heatmap(
+    table: pa.Table,
+    value: Literal["revenue", "units"] = "revenue",
+    currency: str = "MXN",
+) -> np.ndarray:
+    lines = _in_currency(table, currency)
+    cells = pc.add(pc.multiply(pc.day_of_week(lines["created_at"]), 24), pc.hour(lines["created_at"]))
+    column = lines["subtotal"] if value == "revenue" else lines["quantity"]
+    weights = pc.cast(column, pa.float64()).to_numpy()
+    return np.bincount(cells.to_numpy(), weights=weights, minlength=7 * 24).reshape(7, 24)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import hashlib
+import math
+from collections.abc import Iterable
+from threading import Lock
+
+from maspatas.domain.ports.existence_filter import ExistenceFilterPort
+
+
+class BloomFilter(ExistenceFilterPort):
+    def __init__(self, expected_items: int = 100_000, false_positive_rate: float = 0.01) -> None:
+        if expected_items <= 0:
+            raise ValueError("expected_items debe ser positivo")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate debe estar entre 0 y 1")
+        self._size = max(8, math.ceil(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / expected_items * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._lock = Lock()
+        self.items = 0
+        self.lookups = 0
+        self.definite_misses = 0
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str], expected_items: int = 100_000, false_positive_rate: float = 0.01) -> "BloomFilter":
+        bloom = cls(expected_items=expected_items, false_positive_rate=false_positive_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self._size for index in range(self._hashes)]
+
+    def add(self, key: str) -> None:
+        positions = self._positions(key)
+        with self._lock:
+            self.items += 1
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, key: str) -> bool:
+        positions = self._positions(key)
+        with self._lock:
+            self.lookups += 1
+            present = all(self._bits[position >> 3] & (1 << (position & 7)) for position in positions)
+            if not present:
+                self.definite_misses += 1
+            return present
+
+    def estimated_false_positive_rate(self) -> float:
+        return (1 - math.exp(-self._hashes * self.items / self._size)) ** self._hashes
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "items": self.items,
+                "bits": self._size,
+                "hashes": self._hashes,
+                "memory_bytes": len(self._bits),
+                "lookups": self.lookups,
+                "definite_misses": self.definite_misses,
+                "estimated_false_positive_rate": round(self.estimated_false_positive_rate(), 6),
+            }
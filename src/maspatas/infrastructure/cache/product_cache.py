@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+
+from maspatas.domain.entities.product import Product
+from maspatas.domain.ports.async_repositories import AsyncProductRepositoryPort
+from maspatas.domain.ports.pagination import Page
+from maspatas.domain.ports.repositories import ProductRepositoryPort
+from maspatas.domain.value_objects.common import ProductId
+from maspatas.infrastructure.cache.ttl_lru import TTLCache
+
+_ABSENT = object()
+
+
+class _ProductCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, negative_ttl_seconds: float) -> None:
+        self._entries: TTLCache[str, Product | object] = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._negative_ttl_seconds = negative_ttl_seconds
+
+    def _lookup(self, product_id: ProductId) -> Product | object | None:
+        return self._entries.get(product_id.value)
+
+    def _remember(self, product_id: ProductId, product: Product | None) -> None:
+        if product is None:
+            self._entries.set(product_id.value, _ABSENT, ttl_seconds=self._negative_ttl_seconds)
+        else:
+            self._entries.set(product_id.value, product)
+
+    def _partition(self, product_ids: Iterable[ProductId]) -> tuple[dict[ProductId, Product], list[ProductId]]:
+        found: dict[ProductId, Product] = {}
+        missing: list[ProductId] = []
+        for product_id in dict.fromkeys(product_ids):
+            cached = self._lookup(product_id)
+            if cached is None:
+                missing.append(product_id)
+            elif cached is not _ABSENT:
+                found[product_id] = cached
+        return found, missing
+
+    def _remember_many(self, product_ids: list[ProductId], products: dict[ProductId, Product]) -> None:
+        for product_id in product_ids:
+            self._remember(product_id, products.get(product_id))
+
+    def _remember_saved(self, products: Sequence[Product], rejected: Mapping[str, str]) -> None:
+        for product in products:
+            if product.id.value not in rejected:
+                self._remember(product.id, product)
+
+    def invalidate(self, product_id: ProductId) -> None:
+        self._entries.pop(product_id.value)
+
+    def stats(self) -> dict[str, int]:
+        return self._entries.stats()
+
+
+class CachedProductRepository(_ProductCache, ProductRepositoryPort):
+    def __init__(
+        self,
+        repo: ProductRepositoryPort,
+        max_entries: int = 4096,
+        ttl_seconds: float = 300,
+        negative_ttl_seconds: float = 5,
+    ) -> None:
+        super().__init__(max_entries, ttl_seconds, negative_ttl_seconds)
+        self._repo = repo
+
+    def get_by_id(self, product_id: ProductId) -> Product | None:
+        cached = self._lookup(product_id)
+        if cached is not None:
+            return None if cached is _ABSENT else cached
+        product = self._repo.get_by_id(product_id)
+        self._remember(product_id, product)
+        return product
+
+    def get_many(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Product]:
+        found, missing = self._partition(product_ids)
+        if missing:
+            loaded = self._repo.get_many(missing)
+            self._remember_many(missing, loaded)
+            found.update(loaded)
+        return found
+
+    def list_page(self, limit: int, after: str | None = None) -> Page[Product]:
+        return self._repo.list_page(limit, after)
+
+    def save_product(self, product: Product) -> None:
+        self.invalidate(product.id)
+        self._repo.save_product(product)
+        self._remember(product.id, product)
+
+    def save_products(self, products: Sequence[Product]) -> dict[str, str]:
+        rejected = self._repo.save_products(products)
+        self._remember_saved(products, rejected)
+        return rejected
+
+
+class AsyncCachedProductRepository(_ProductCache, AsyncProductRepositoryPort):
+    def __init__(
+        self,
+        repo: AsyncProductRepositoryPort,
+        max_entries: int = 4096,
+        ttl_seconds: float = 300,
+        negative_ttl_seconds: float = 5,
+    ) -> None:
+        super().__init__(max_entries, ttl_seconds, negative_ttl_seconds)
+        self._repo = repo
+
+    async def get_by_id(self, product_id: ProductId) -> Product | None:
+        cached = self._lookup(product_id)
+        if cached is not None:
+            return None if cached is _ABSENT else cached
+        product = await self._repo.get_by_id(product_id)
+        self._remember(product_id, product)
+        return product
+
+    async def get_many(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Product]:
+        found, missing = self._partition(product_ids)
+        if missing:
+            loaded = await self._repo.get_many(missing)
+            self._remember_many(missing, loaded)
+            found.update(loaded)
+        return found
+
+    async def list_page(self, limit: int, after: str | None = None) -> Page[Product]:
+        return await self._repo.list_page(limit, after)
+
+    async def save_product(self, product: Product) -> None:
+        self.invalidate(product.id)
+        await self._repo.save_product(product)
+        self._remember(product.id, product)
+
+    async def save_products(self, products: Sequence[Product]) -> dict[str, str]:
+        rejected = await self._repo.save_products(products)
+        self._remember_saved(products, rejected)
+        return rejected
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from maspatas.infrastructure.cache.versions import STAMPED_COLLECTIONS, CollectionVersions
+from maspatas.infrastructure.db.models import CollectionVersionModel, InventoryModel
+
+
+class SQLAlchemyVersionRefresher:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        versions: CollectionVersions,
+        refresh_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._session_factory = session_factory
+        self._versions = versions
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._refreshed_at: dict[str, float] = {}
+        self._observed: dict[str, int] = {}
+
+    def _should_refresh(self, collection: str, now: float) -> bool:
+        if self._observed.get(collection) != self._versions.current(collection):
+            return True
+        return now - self._refreshed_at.get(collection, float("-inf")) >= self._refresh_seconds
+
+    async def entity_tag(self, collection: str) -> str:
+        now = self._clock()
+        if self._should_refresh(collection, now):
+            self._refreshed_at[collection] = now
+            version = await asyncio.to_thread(self._read_version, collection)
+            if version is not None:
+                self._versions.observe(collection, version)
+            self._observed[collection] = self._versions.current(collection)
+        return self._versions.entity_tag(collection)
+
+    def _read_version(self, collection: str) -> int | None:
+        with self._session_factory() as session:
+            if collection in STAMPED_COLLECTIONS:
+                changed_at = session.scalar(select(func.max(InventoryModel.changed_at)))
+                return round(changed_at.timestamp() * 1_000_000) if changed_at else None
+            return session.scalar(
+                select(CollectionVersionModel.version).where(CollectionVersionModel.collection == collection)
+            )
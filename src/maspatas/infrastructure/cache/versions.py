@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import time
+import uuid
+from collections.abc import Callable, Mapping
+from threading import Lock
+
+from bson import Timestamp
+from pymongo import DESCENDING
+from pymongo.asynchronous.database import AsyncDatabase
+
+from maspatas.domain.ports.versioning import CollectionVersionPort
+
+
+class CollectionVersions(CollectionVersionPort):
+    def __init__(self, initial: Mapping[str, int] | None = None, epoch: str | None = None) -> None:
+        self._versions = dict(initial or {})
+        self._lock = Lock()
+        self.epoch = epoch or uuid.uuid4().hex[:8]
+
+    def current(self, collection: str) -> int:
+        return self._versions.get(collection, 0)
+
+    def bump(self, collection: str) -> int:
+        with self._lock:
+            version = self._versions.get(collection, 0) + 1
+            self._versions[collection] = version
+            return version
+
+    def observe(self, collection: str, version: int) -> int:
+        with self._lock:
+            version = max(version, self._versions.get(collection, 0))
+            self._versions[collection] = version
+            return version
+
+    def entity_tag(self, collection: str) -> str:
+        return f'"{collection}.{self.epoch}.{self.current(collection)}"'
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._versions)
+
+
+# El inventario no lleva contador en collection_versions: cada escritura marca su documento
+# (changed_at) y la versión es el sello más reciente, así las ventas no compiten por una llave.
+STAMPED_COLLECTIONS = frozenset({"inventory"})
+
+
+def stamp_version(stamp: Timestamp) -> int:
+    return (stamp.time << 32) | stamp.inc
+
+
+class MongoVersionRefresher:
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        versions: CollectionVersions,
+        refresh_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._db = db
+        self._collection = db.collection_versions
+        self._versions = versions
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._refreshed_at: dict[str, float] = {}
+        self._observed: dict[str, int] = {}
+
+    def _should_refresh(self, collection: str, now: float) -> bool:
+        # Una escritura local mueve la versión en memoria: se relee antes del siguiente ETag.
+        if self._observed.get(collection) != self._versions.current(collection):
+            return True
+        return now - self._refreshed_at.get(collection, float("-inf")) >= self._refresh_seconds
+
+    async def entity_tag(self, collection: str) -> str:
+        now = self._clock()
+        if self._should_refresh(collection, now):
+            self._refreshed_at[collection] = now
+            version = await self._read_version(collection)
+            if version is not None:
+                self._versions.observe(collection, version)
+            self._observed[collection] = self._versions.current(collection)
+        return self._versions.entity_tag(collection)
+
+    async def _read_version(self, collection: str) -> int | None:
+        if collection in STAMPED_COLLECTIONS:
+            doc = await self._db[collection].find_one(
+                {"changed_at": {"$exists": True}}, {"changed_at": 1}, sort=[("changed_at", DESCENDING)]
+            )
+            return stamp_version(doc["changed_at"]) if doc else None
+        doc = await self._collection.find_one({"_id": collection})
+        return doc["version"] if doc else None
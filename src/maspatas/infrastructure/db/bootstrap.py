@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterator
 
 import psycopg2
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from maspatas.domain.value_objects.common import ProductId
@@ -32,6 +34,10 @@ def create_database_if_not_exists() -> None:
     connection.close()
 
 
+def scan_ids(session: Session, model: type[ProductModel] | type[ClientModel]) -> Iterator[str]:
+    yield from session.scalars(select(model.id).execution_options(yield_per=10_000))
+
+
 def seed_if_empty(session: Session) -> None:
     has_products = session.query(ProductModel).first() is not None
     if has_products:
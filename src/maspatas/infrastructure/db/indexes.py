@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.database import Database
+
+
+@dataclass(frozen=True)
+class MongoIndex:
+    collection: str
+    keys: tuple[tuple[str, int], ...]
+    name: str
+    unique: bool = False
+    expire_after_seconds: int | None = None
+
+    def model(self) -> IndexModel:
+        options: dict[str, object] = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        return IndexModel(list(self.keys), **options)
+
+
+MONGO_INDEXES = (
+    MongoIndex("sales", (("created_at", ASCENDING), ("_id", ASCENDING)), "sales_keyset"),
+    MongoIndex("sales", (("client_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)), "sales_client_keyset"),
+    MongoIndex("sales", (("lines.product_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)), "sales_product_keyset"),
+    MongoIndex("products", (("sku", ASCENDING),), "products_sku_unique", unique=True),
+    MongoIndex("inventory", (("changed_at", DESCENDING),), "inventory_changed_at"),
+    MongoIndex(
+        "sales_rollups",
+        (("kind", ASCENDING), ("period", ASCENDING), ("key", ASCENDING), ("currency", ASCENDING)),
+        "sales_rollups_period",
+    ),
+    MongoIndex("idempotency_keys", (("expires_at", ASCENDING),), "idempotency_ttl", expire_after_seconds=0),
+)
+
+
+def ensure_mongo_indexes(db: Database, indexes: Iterable[MongoIndex] = MONGO_INDEXES) -> list[str]:
+    by_collection: dict[str, list[IndexModel]] = {}
+    for index in indexes:
+        by_collection.setdefault(index.collection, []).append(index.model())
+    created: list[str] = []
+    for collection, models in by_collection.items():
+        created.extend(db[collection].create_indexes(models))
+    return created
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, Numeric, String, func
 from sqlalchemy.orm import DeclarativeBase
 
 
@@ -31,10 +31,15 @@ class InventoryModel(Base):
 
     product_id = Column(String, primary_key=True)
     stock = Column(Integer, nullable=False)
+    changed_at = Column(DateTime(timezone=True), default=func.clock_timestamp(), onupdate=func.clock_timestamp(), index=True)
 
 
 class SaleModel(Base):
     __tablename__ = "sales"
+    __table_args__ = (
+        Index("ix_sales_keyset", "created_at", "sale_id"),
+        Index("ix_sales_client_keyset", "client_id", "created_at", "sale_id"),
+    )
 
     sale_id = Column(String, primary_key=True)
     client_id = Column(String, nullable=False)
@@ -45,6 +50,10 @@ class SaleModel(Base):
 
 class SaleLineModel(Base):
     __tablename__ = "sale_lines"
+    __table_args__ = (
+        Index("ix_sale_lines_sale_id", "sale_id"),
+        Index("ix_sale_lines_product_id", "product_id", "sale_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     sale_id = Column(String, ForeignKey("sales.sale_id", ondelete="CASCADE"), nullable=False)
@@ -52,3 +61,23 @@ class SaleLineModel(Base):
     quantity = Column(Integer, nullable=False)
     unit_price_amount = Column(Numeric(12, 2), nullable=False)
     currency = Column(String(3), nullable=False)
+
+
+class SalesRollupModel(Base):
+    __tablename__ = "sales_rollups"
+    __table_args__ = (Index("ix_sales_rollups_period", "kind", "period", "key", "currency"),)
+
+    kind = Column(String(16), primary_key=True)
+    key = Column(String, primary_key=True)
+    period = Column(String(10), primary_key=True)
+    currency = Column(String(3), primary_key=True)
+    units = Column(Integer, nullable=False)
+    revenue = Column(Numeric(14, 2), nullable=False)
+    sales = Column(Integer, nullable=False)
+
+
+class CollectionVersionModel(Base):
+    __tablename__ = "collection_versions"
+
+    collection = Column(String(32), primary_key=True)
+    version = Column(BigInteger, nullable=False)
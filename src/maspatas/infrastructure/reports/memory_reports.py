@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime, timezone
+from decimal import Decimal
+from threading import Lock
+
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.ports.reports import SalesGrouping, SalesReportPort, SalesReportRow
+from maspatas.domain.ports.repositories import SaleRepositoryPort
+from maspatas.domain.ports.rollups import RollupKind, SalesRollup, SalesRollupPort
+from maspatas.domain.services.rollups import add_rollup, rollup_matches
+
+_GROUP_KEYS: dict[str, Callable[[SaleAggregate, SaleLine], str]] = {
+    "product": lambda sale, line: line.product_id.value,
+    "day": lambda sale, line: sale.created_at.astimezone(timezone.utc).date().isoformat(),
+    "client": lambda sale, line: sale.client_id.value,
+}
+
+
+def aggregate_sales(sales: Iterable[SaleAggregate], grouping: SalesGrouping) -> list[SalesReportRow]:
+    key_for = _GROUP_KEYS[grouping]
+    revenue: dict[tuple[str, str], Decimal] = {}
+    units: dict[tuple[str, str], int] = {}
+    counts: dict[tuple[str, str], int] = {}
+    for sale in sales:
+        touched: set[tuple[str, str]] = set()
+        for line in sale.lines:
+            group = (key_for(sale, line), line.unit_price.currency)
+            revenue[group] = revenue.get(group, Decimal("0")) + line.subtotal.amount
+            units[group] = units.get(group, 0) + line.quantity
+            touched.add(group)
+        for group in touched:
+            counts[group] = counts.get(group, 0) + 1
+    return [
+        SalesReportRow(key=group[0], currency=group[1], revenue=revenue[group], units=units[group], sales=counts[group])
+        for group in sorted(revenue)
+    ]
+
+
+class InMemorySalesReport(SalesReportPort):
+    def __init__(self, sale_repo: SaleRepositoryPort) -> None:
+        self._sale_repo = sale_repo
+
+    def sales_report(
+        self,
+        grouping: SalesGrouping,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[SalesReportRow]:
+        return aggregate_sales(self._sale_repo.iter_sales(created_from, created_to), grouping)
+
+
+class InMemorySalesRollups(SalesRollupPort):
+    def __init__(self) -> None:
+        self._rollups: dict[tuple[str, str, str, str], SalesRollup] = {}
+        self._lock = Lock()
+
+    def apply(self, increments: Sequence[SalesRollup]) -> None:
+        with self._lock:
+            for increment in increments:
+                self._rollups[increment.identity] = add_rollup(self._rollups.get(increment.identity), increment)
+
+    def read(
+        self,
+        kind: RollupKind,
+        period_from: str | None = None,
+        period_to: str | None = None,
+        key: str | None = None,
+    ) -> list[SalesRollup]:
+        with self._lock:
+            rollups = [rollup for rollup in self._rollups.values() if rollup.kind == kind]
+        return sorted(
+            (rollup for rollup in rollups if rollup_matches(rollup, period_from, period_to, key)),
+            key=lambda rollup: (rollup.period, rollup.key, rollup.currency),
+        )
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal
+
+from bson.decimal128 import Decimal128
+from pymongo import ASCENDING, UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.database import Database
+
+from maspatas.domain.ports.reports import AsyncSalesReportPort, SalesGrouping, SalesReportPort, SalesReportRow
+from maspatas.domain.ports.rollups import AsyncSalesRollupPort, RollupKind, SalesRollup, SalesRollupPort
+from maspatas.infrastructure.repositories.mongo_repositories import bounded_by_deadline, created_at_filter, retry_reads
+
+_GROUP_KEYS: dict[str, object] = {
+    "product": "$lines.product_id",
+    "day": {"$substrCP": ["$created_at", 0, 10]},
+    "client": "$client_id",
+}
+
+
+def sales_report_pipeline(grouping: SalesGrouping, created_from: datetime | None, created_to: datetime | None) -> list[dict]:
+    pipeline: list[dict] = []
+    match = created_at_filter(created_from, created_to)
+    if match:
+        pipeline.append({"$match": match})
+    pipeline.extend(
+        [
+            {"$unwind": "$lines"},
+            {
+                "$group": {
+                    "_id": {"sale": "$_id", "key": _GROUP_KEYS[grouping], "currency": "$lines.currency"},
+                    "revenue": {"$sum": {"$multiply": [{"$toDecimal": "$lines.unit_price_amount"}, "$lines.quantity"]}},
+                    "units": {"$sum": "$lines.quantity"},
+                }
+            },
+            {
+                "$group": {
+                    "_id": {"key": "$_id.key", "currency": "$_id.currency"},
+                    "revenue": {"$sum": "$revenue"},
+                    "units": {"$sum": "$units"},
+                    "sales": {"$sum": 1},
+                }
+            },
+            {"$sort": {"_id.key": 1, "_id.currency": 1}},
+        ]
+    )
+    return pipeline
+
+
+def _decimal(value: Decimal128 | int | str) -> Decimal:
+    return value.to_decimal() if isinstance(value, Decimal128) else Decimal(value)
+
+
+def report_row_from_document(doc: dict) -> SalesReportRow:
+    return SalesReportRow(
+        key=doc["_id"]["key"],
+        currency=doc["_id"]["currency"],
+        revenue=_decimal(doc["revenue"]),
+        units=doc["units"],
+        sales=doc["sales"],
+    )
+
+
+ROLLUPS_COLLECTION = "sales_rollups"
+ROLLUP_ORDER = [("period", ASCENDING), ("key", ASCENDING), ("currency", ASCENDING)]
+
+
+def rollup_operations(increments: Sequence[SalesRollup]) -> list[UpdateOne]:
+    return [
+        UpdateOne(
+            {"_id": "|".join(rollup.identity)},
+            {
+                "$inc": {"units": rollup.units, "revenue": Decimal128(rollup.revenue), "sales": rollup.sales},
+                "$setOnInsert": {"kind": rollup.kind, "key": rollup.key, "period": rollup.period, "currency": rollup.currency},
+            },
+            upsert=True,
+        )
+        for rollup in increments
+    ]
+
+
+def rollup_query(kind: RollupKind, period_from: str | None, period_to: str | None, key: str | None) -> dict:
+    query: dict[str, object] = {"kind": kind}
+    bounds: dict[str, str] = {}
+    if period_from is not None:
+        bounds["$gte"] = period_from
+    if period_to is not None:
+        bounds["$lt"] = period_to
+    if bounds:
+        query["period"] = bounds
+    if key is not None:
+        query["key"] = key
+    return query
+
+
+def rollup_from_document(doc: dict) -> SalesRollup:
+    return SalesRollup(
+        kind=doc["kind"],
+        key=doc["key"],
+        period=doc["period"],
+        currency=doc["currency"],
+        units=doc["units"],
+        revenue=_decimal(doc["revenue"]),
+        sales=doc["sales"],
+    )
+
+
+class MongoSalesReport(SalesReportPort):
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    @retry_reads
+    def sales_report(
+        self,
+        grouping: SalesGrouping,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[SalesReportRow]:
+        with bounded_by_deadline():
+            docs = self._db.sales.aggregate(sales_report_pipeline(grouping, created_from, created_to), allowDiskUse=True)
+            return [report_row_from_document(doc) for doc in docs]
+
+
+class AsyncMongoSalesReport(AsyncSalesReportPort):
+    def __init__(self, db: AsyncDatabase) -> None:
+        self._db = db
+
+    @retry_reads
+    async def sales_report(
+        self,
+        grouping: SalesGrouping,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[SalesReportRow]:
+        with bounded_by_deadline():
+            cursor = await self._db.sales.aggregate(sales_report_pipeline(grouping, created_from, created_to), allowDiskUse=True)
+            return [report_row_from_document(doc) for doc in await cursor.to_list()]
+
+
+class MongoSalesRollups(SalesRollupPort):
+    def __init__(self, db: Database, collection: str = ROLLUPS_COLLECTION) -> None:
+        self._collection = db[collection]
+
+    def apply(self, increments: Sequence[SalesRollup]) -> None:
+        if increments:
+            with bounded_by_deadline():
+                self._collection.bulk_write(rollup_operations(increments), ordered=False)
+
+    @retry_reads
+    def read(
+        self,
+        kind: RollupKind,
+        period_from: str | None = None,
+        period_to: str | None = None,
+        key: str | None = None,
+    ) -> list[SalesRollup]:
+        with bounded_by_deadline():
+            docs = self._collection.find(rollup_query(kind, period_from, period_to, key)).sort(ROLLUP_ORDER)
+            return [rollup_from_document(doc) for doc in docs]
+
+
+class AsyncMongoSalesRollups(AsyncSalesRollupPort):
+    def __init__(self, db: AsyncDatabase, collection: str = ROLLUPS_COLLECTION) -> None:
+        self._collection = db[collection]
+
+    async def apply(self, increments: Sequence[SalesRollup]) -> None:
+        if increments:
+            with bounded_by_deadline():
+                await self._collection.bulk_write(rollup_operations(increments), ordered=False)
+
+    @retry_reads
+    async def read(
+        self,
+        kind: RollupKind,
+        period_from: str | None = None,
+        period_to: str | None = None,
+        key: str | None = None,
+    ) -> list[SalesRollup]:
+        with bounded_by_deadline():
+            docs = await self._collection.find(rollup_query(kind, period_from, period_to, key)).sort(ROLLUP_ORDER).to_list()
+        return [rollup_from_document(doc) for doc in docs]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from maspatas.domain.ports.reports import SalesGrouping, SalesReportPort, SalesReportRow
+from maspatas.domain.ports.rollups import RollupKind, SalesRollup, SalesRollupPort
+from maspatas.infrastructure.db.models import SaleLineModel, SaleModel, SalesRollupModel
+from maspatas.infrastructure.repositories.sqlalchemy_repositories import bounded_by_deadline
+
+_GROUP_KEYS = {
+    "product": SaleLineModel.product_id,
+    "day": func.to_char(func.timezone("UTC", SaleModel.created_at), "YYYY-MM-DD"),
+    "client": SaleModel.client_id,
+}
+
+
+class SQLAlchemySalesReport(SalesReportPort):
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def sales_report(
+        self,
+        grouping: SalesGrouping,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[SalesReportRow]:
+        key = _GROUP_KEYS[grouping].label("key")
+        query = (
+            select(
+                key,
+                SaleLineModel.currency,
+                func.sum(SaleLineModel.unit_price_amount * SaleLineModel.quantity),
+                func.sum(SaleLineModel.quantity),
+                func.count(func.distinct(SaleLineModel.sale_id)),
+            )
+            .join(SaleModel, SaleModel.sale_id == SaleLineModel.sale_id)
+            .group_by(key, SaleLineModel.currency)
+            .order_by(key, SaleLineModel.currency)
+        )
+        if created_from is not None:
+            query = query.where(SaleModel.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(SaleModel.created_at < created_to)
+        with bounded_by_deadline(self._session):
+            rows = self._session.execute(query).all()
+        return [
+            SalesReportRow(key=row[0], currency=row[1], revenue=Decimal(row[2]), units=int(row[3]), sales=int(row[4]))
+            for row in rows
+        ]
+
+
+class SQLAlchemySalesRollups(SalesRollupPort):
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def apply(self, increments: Sequence[SalesRollup]) -> None:
+        if not increments:
+            return
+        statement = insert(SalesRollupModel).values(
+            [
+                {
+                    "kind": rollup.kind,
+                    "key": rollup.key,
+                    "period": rollup.period,
+                    "currency": rollup.currency,
+                    "units": rollup.units,
+                    "revenue": rollup.revenue,
+                    "sales": rollup.sales,
+                }
+                for rollup in increments
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["kind", "key", "period", "currency"],
+            set_={
+                "units": SalesRollupModel.units + statement.excluded.units,
+                "revenue": SalesRollupModel.revenue + statement.excluded.revenue,
+                "sales": SalesRollupModel.sales + statement.excluded.sales,
+            },
+        )
+        with bounded_by_deadline(self._session):
+            self._session.execute(statement)
+            self._session.commit()
+
+    def read(
+        self,
+        kind: RollupKind,
+        period_from: str | None = None,
+        period_to: str | None = None,
+        key: str | None = None,
+    ) -> list[SalesRollup]:
+        query = (
+            select(SalesRollupModel)
+            .where(SalesRollupModel.kind == kind)
+            .order_by(SalesRollupModel.period, SalesRollupModel.key, SalesRollupModel.currency)
+        )
+        if period_from is not None:
+            query = query.where(SalesRollupModel.period >= period_from)
+        if period_to is not None:
+            query = query.where(SalesRollupModel.period < period_to)
+        if key is not None:
+            query = query.where(SalesRollupModel.key == key)
+        with bounded_by_deadline(self._session):
+            rows = self._session.scalars(query).all()
+        return [
+            SalesRollup(
+                kind=row.kind,
+                key=row.key,
+                period=row.period,
+                currency=row.currency,
+                units=row.units,
+                revenue=Decimal(row.revenue),
+                sales=row.sales,
+            )
+            for row in rows
+        ]
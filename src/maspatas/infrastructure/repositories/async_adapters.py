@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Mapping, Sequence
+from datetime import datetime
+from itertools import islice
+from typing import TypeVar
+
+from maspatas.domain.entities.client import Client
+from maspatas.domain.entities.inventory import InventoryAggregate
+from maspatas.domain.entities.product import Product
+from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.ports.async_repositories import (
+    AsyncClientRepositoryPort,
+    AsyncInventoryRepositoryPort,
+    AsyncProductRepositoryPort,
+    AsyncSaleRepositoryPort,
+)
+from maspatas.domain.ports.pagination import Page
+from maspatas.domain.ports.reports import AsyncSalesReportPort, SalesGrouping, SalesReportPort, SalesReportRow
+from maspatas.domain.ports.rollups import AsyncSalesRollupPort, RollupKind, SalesRollup, SalesRollupPort
+from maspatas.domain.ports.sale_filter import SaleFilter
+from maspatas.domain.ports.repositories import (
+    ClientRepositoryPort,
+    InventoryRepositoryPort,
+    ProductRepositoryPort,
+    SaleRepositoryPort,
+)
+from maspatas.domain.value_objects.common import ClientId, ProductId
+
+T = TypeVar("T")
+
+
+def _take(iterator: Iterator[T], count: int) -> list[T]:
+    return list(islice(iterator, count))
+
+
+class _SyncRepositoryBridge:
+    def __init__(self, offload: bool) -> None:
+        self._offload = offload
+
+    async def _call(self, fn: Callable[..., T], *args: object) -> T:
+        if self._offload:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+
+class AsyncProductRepositoryAdapter(_SyncRepositoryBridge, AsyncProductRepositoryPort):
+    def __init__(self, repo: ProductRepositoryPort, offload: bool = False) -> None:
+        super().__init__(offload)
+        self._repo = repo
+
+    async def get_by_id(self, product_id: ProductId) -> Product | None:
+        return await self._call(self._repo.get_by_id, product_id)
+
+    async def get_many(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Product]:
+        return await self._call(self._repo.get_many, tuple(product_ids))
+
+    async def list_page(self, limit: int, after: str | None = None) -> Page[Product]:
+        return await self._call(self._repo.list_page, limit, after)
+
+    async def save_product(self, product: Product) -> None:
+        await self._call(self._repo.save_product, product)
+
+    async def save_products(self, products: Sequence[Product]) -> dict[str, str]:
+        return await self._call(self._repo.save_products, products)
+
+
+class AsyncClientRepositoryAdapter(_SyncRepositoryBridge, AsyncClientRepositoryPort):
+    def __init__(self, repo: ClientRepositoryPort, offload: bool = False) -> None:
+        super().__init__(offload)
+        self._repo = repo
+
+    async def get_by_id(self, client_id: ClientId) -> Client | None:
+        return await self._call(self._repo.get_by_id, client_id)
+
+    async def get_many(self, client_ids: Iterable[ClientId]) -> dict[ClientId, Client]:
+        return await self._call(self._repo.get_many, tuple(client_ids))
+
+    async def list_page(self, limit: int, after: str | None = None) -> Page[Client]:
+        return await self._call(self._repo.list_page, limit, after)
+
+    async def save_client(self, client: Client) -> None:
+        await self._call(self._repo.save_client, client)
+
+
+class AsyncInventoryRepositoryAdapter(_SyncRepositoryBridge, AsyncInventoryRepositoryPort):
+    def __init__(self, repo: InventoryRepositoryPort, offload: bool = False) -> None:
+        super().__init__(offload)
+        self._repo = repo
+
+    async def get_inventory(self) -> InventoryAggregate:
+        return await self._call(self._repo.get_inventory)
+
+    async def get_items(self, product_ids: Iterable[ProductId]) -> InventoryAggregate:
+        return await self._call(self._repo.get_items, tuple(product_ids))
+
+    async def save_inventory(self, inventory: InventoryAggregate) -> None:
+        await self._call(self._repo.save_inventory, inventory)
+
+    async def decrease_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        await self._call(self._repo.decrease_stock, quantities)
+
+    async def increase_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        await self._call(self._repo.increase_stock, quantities)
+
+
+class AsyncSaleRepositoryAdapter(_SyncRepositoryBridge, AsyncSaleRepositoryPort):
+    def __init__(self, repo: SaleRepositoryPort, offload: bool = False) -> None:
+        super().__init__(offload)
+        self._repo = repo
+
+    async def save_sale(self, sale: SaleAggregate) -> None:
+        await self._call(self._repo.save_sale, sale)
+
+    async def save_sales(self, sales: Sequence[SaleAggregate]) -> set[str]:
+        return await self._call(self._repo.save_sales, sales)
+
+    async def get_by_id(self, sale_id: str) -> SaleAggregate | None:
+        return await self._call(self._repo.get_by_id, sale_id)
+
+    async def list_page(self, limit: int, after: str | None = None, filters: SaleFilter | None = None) -> Page[SaleAggregate]:
+        return await self._call(self._repo.list_page, limit, after, filters)
+
+    async def iter_sales(
+        self,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[SaleAggregate]:
+        sales = iter(self._repo.iter_sales(created_from, created_to, batch_size))
+        while batch := await self._call(_take, sales, batch_size):
+            for sale in batch:
+                yield sale
+
+
+class AsyncSalesReportAdapter(_SyncRepositoryBridge, AsyncSalesReportPort):
+    def __init__(self, report: SalesReportPort, offload: bool = False) -> None:
+        super().__init__(offload)
+        self._report = report
+
+    async def sales_report(
+        self,
+        grouping: SalesGrouping,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[SalesReportRow]:
+        return await self._call(self._report.sales_report, grouping, created_from, created_to)
+
+
+class AsyncSalesRollupAdapter(_SyncRepositoryBridge, AsyncSalesRollupPort):
+    def __init__(self, rollups: SalesRollupPort, offload: bool = False) -> None:
+        super().__init__(offload)
+        self._rollups = rollups
+
+    async def apply(self, increments: Sequence[SalesRollup]) -> None:
+        await self._call(self._rollups.apply, increments)
+
+    async def read(
+        self,
+        kind: RollupKind,
+        period_from: str | None = None,
+        period_to: str | None = None,
+        key: str | None = None,
+    ) -> list[SalesRollup]:
+        return await self._call(self._rollups.read, kind, period_from, period_to, key)
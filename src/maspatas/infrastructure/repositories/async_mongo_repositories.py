@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from datetime import datetime
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from maspatas.domain.entities.client import Client
+from maspatas.domain.entities.inventory import InventoryAggregate, insufficient_stock
+from maspatas.domain.entities.product import Product
+from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.ports.async_repositories import (
+    AsyncClientRepositoryPort,
+    AsyncInventoryRepositoryPort,
+    AsyncProductRepositoryPort,
+    AsyncSaleRepositoryPort,
+)
+from maspatas.domain.ports.pagination import Page, id_cursor, page_of, sale_cursor
+from maspatas.domain.ports.sale_filter import SaleFilter
+from maspatas.domain.ports.versioning import CollectionVersionPort, bump_version, observe_version
+from maspatas.domain.services.deadline import deadline_suspended
+from maspatas.domain.value_objects.common import ClientId, ProductId
+from maspatas.infrastructure.repositories.metrics import WriteCounters
+from maspatas.infrastructure.repositories.mongo_repositories import (
+    SALE_ORDER,
+    STOCK_STAMP,
+    bounded_by_deadline,
+    created_at_filter,
+    client_from_document,
+    client_to_document,
+    duplicated_client,
+    duplicated_sale,
+    duplicated_sale_ids,
+    id_after_filter,
+    id_in_filter,
+    increment_stock_operations,
+    inventory_from_documents,
+    product_conflict,
+    product_from_document,
+    product_to_document,
+    rejected_products,
+    retry_reads,
+    sale_after_filter,
+    sale_from_document,
+    sale_query,
+    sale_to_document,
+    set_stock_operations,
+    sorted_quantities,
+)
+
+
+async def next_version(db: AsyncDatabase, collection: str) -> int:
+    doc = await db.collection_versions.find_one_and_update(
+        {"_id": collection},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["version"]
+
+
+class AsyncMongoProductRepository(AsyncProductRepositoryPort):
+    def __init__(self, db: AsyncDatabase, versions: CollectionVersionPort | None = None) -> None:
+        self._db = db
+        self._versions = versions
+
+    @retry_reads
+    async def get_by_id(self, product_id: ProductId) -> Product | None:
+        with bounded_by_deadline():
+            doc = await self._db.products.find_one({"_id": product_id.value})
+        if not doc:
+            return None
+        return product_from_document(doc)
+
+    @retry_reads
+    async def get_many(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Product]:
+        query = id_in_filter(product_ids)
+        if query is None:
+            return {}
+        with bounded_by_deadline():
+            products = [product_from_document(doc) for doc in await self._db.products.find(query).to_list()]
+        return {product.id: product for product in products}
+
+    @retry_reads
+    async def list_page(self, limit: int, after: str | None = None) -> Page[Product]:
+        with bounded_by_deadline():
+            docs = await self._db.products.find(id_after_filter(after)).sort("_id", ASCENDING).limit(limit + 1).to_list()
+        return page_of([product_from_document(doc) for doc in docs], limit, id_cursor)
+
+    async def save_product(self, product: Product) -> None:
+        try:
+            with bounded_by_deadline():
+                await self._db.products.insert_one(product_to_document(product))
+        except DuplicateKeyError as exc:
+            raise product_conflict(product, exc.details) from exc
+        await self._bump()
+
+    async def save_products(self, products: Sequence[Product]) -> dict[str, str]:
+        if not products:
+            return {}
+        rejected: dict[str, str] = {}
+        try:
+            with bounded_by_deadline():
+                await self._db.products.insert_many([product_to_document(product) for product in products], ordered=False)
+        except BulkWriteError as exc:
+            rejected = rejected_products(exc, products)
+        if len(rejected) < len(products):
+            await self._bump()
+        return rejected
+
+    async def _bump(self) -> None:
+        with bounded_by_deadline():
+            observe_version(self._versions, "products", await next_version(self._db, "products"))
+
+
+class AsyncMongoClientRepository(AsyncClientRepositoryPort):
+    def __init__(self, db: AsyncDatabase, versions: CollectionVersionPort | None = None) -> None:
+        self._db = db
+        self._versions = versions
+
+    @retry_reads
+    async def get_by_id(self, client_id: ClientId) -> Client | None:
+        with bounded_by_deadline():
+            doc = await self._db.clients.find_one({"_id": client_id.value})
+        if not doc:
+            return None
+        return client_from_document(doc)
+
+    @retry_reads
+    async def get_many(self, client_ids: Iterable[ClientId]) -> dict[ClientId, Client]:
+        query = id_in_filter(client_ids)
+        if query is None:
+            return {}
+        with bounded_by_deadline():
+            clients = [client_from_document(doc) for doc in await self._db.clients.find(query).to_list()]
+        return {client.id: client for client in clients}
+
+    @retry_reads
+    async def list_page(self, limit: int, after: str | None = None) -> Page[Client]:
+        with bounded_by_deadline():
+            docs = await self._db.clients.find(id_after_filter(after)).sort("_id", ASCENDING).limit(limit + 1).to_list()
+        return page_of([client_from_document(doc) for doc in docs], limit, id_cursor)
+
+    async def save_client(self, client: Client) -> None:
+        try:
+            with bounded_by_deadline():
+                await self._db.clients.insert_one(client_to_document(client))
+        except DuplicateKeyError as exc:
+            raise duplicated_client(client.id.value) from exc
+        await self._bump()
+
+    async def _bump(self) -> None:
+        with bounded_by_deadline():
+            observe_version(self._versions, "clients", await next_version(self._db, "clients"))
+
+
+class AsyncMongoInventoryRepository(AsyncInventoryRepositoryPort):
+    def __init__(self, db: AsyncDatabase, versions: CollectionVersionPort | None = None) -> None:
+        self._db = db
+        self._versions = versions
+        self.write_counters = WriteCounters()
+
+    @retry_reads
+    async def get_inventory(self) -> InventoryAggregate:
+        with bounded_by_deadline():
+            return inventory_from_documents(await self._db.inventory.find({}).to_list())
+
+    @retry_reads
+    async def get_items(self, product_ids: Iterable[ProductId]) -> InventoryAggregate:
+        query = id_in_filter(product_ids)
+        if query is None:
+            return InventoryAggregate()
+        with bounded_by_deadline():
+            return inventory_from_documents(await self._db.inventory.find(query).to_list())
+
+    async def save_inventory(self, inventory: InventoryAggregate) -> None:
+        changed = inventory.changed_items()
+        if changed:
+            with bounded_by_deadline():
+                await self._db.inventory.bulk_write(set_stock_operations(changed), ordered=False)
+            bump_version(self._versions, "inventory")
+        self.write_counters.record(len(changed))
+
+    async def decrease_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        applied: dict[ProductId, int] = {}
+        try:
+            for product_id, quantity in sorted_quantities(quantities):
+                with bounded_by_deadline():
+                    doc = await self._db.inventory.find_one_and_update(
+                        {"_id": product_id.value, "stock": {"$gte": quantity}},
+                        {"$inc": {"stock": -quantity}, "$currentDate": STOCK_STAMP},
+                        projection={"stock": 1},
+                        return_document=ReturnDocument.AFTER,
+                    )
+                    if doc is None:
+                        current = await self._db.inventory.find_one({"_id": product_id.value}, {"stock": 1})
+                        raise insufficient_stock(product_id, current["stock"] if current else 0, quantity)
+                applied[product_id] = quantity
+            bump_version(self._versions, "inventory")
+        except Exception:
+            if applied:
+                with deadline_suspended():
+                    await self.increase_stock(applied)
+            raise
+
+    async def increase_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        if quantities:
+            with bounded_by_deadline():
+                await self._db.inventory.bulk_write(increment_stock_operations(quantities), ordered=False)
+            bump_version(self._versions, "inventory")
+
+
+class AsyncMongoSaleRepository(AsyncSaleRepositoryPort):
+    def __init__(self, db: AsyncDatabase) -> None:
+        self._db = db
+
+    async def save_sale(self, sale: SaleAggregate) -> None:
+        try:
+            with bounded_by_deadline():
+                await self._db.sales.insert_one(sale_to_document(sale))
+        except DuplicateKeyError as exc:
+            raise duplicated_sale(sale.sale_id) from exc
+
+    async def save_sales(self, sales: Sequence[SaleAggregate]) -> set[str]:
+        if not sales:
+            return set()
+        try:
+            with bounded_by_deadline():
+                await self._db.sales.insert_many([sale_to_document(sale) for sale in sales], ordered=False)
+        except BulkWriteError as exc:
+            return duplicated_sale_ids(exc, sales)
+        return set()
+
+    @retry_reads
+    async def get_by_id(self, sale_id: str) -> SaleAggregate | None:
+        with bounded_by_deadline():
+            doc = await self._db.sales.find_one({"_id": sale_id})
+        return sale_from_document(doc) if doc else None
+
+    @retry_reads
+    async def list_page(self, limit: int, after: str | None = None, filters: SaleFilter | None = None) -> Page[SaleAggregate]:
+        with bounded_by_deadline():
+            query = {**sale_query(filters), **sale_after_filter(after)}
+            docs = await self._db.sales.find(query).sort(SALE_ORDER).limit(limit + 1).to_list()
+        return page_of([sale_from_document(doc) for doc in docs], limit, sale_cursor)
+
+    async def iter_sales(
+        self,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[SaleAggregate]:
+        cursor = self._db.sales.find(created_at_filter(created_from, created_to)).sort(SALE_ORDER).batch_size(batch_size)
+        try:
+            async for doc in cursor:
+                yield sale_from_document(doc)
+        finally:
+            await cursor.close()
@@ -1,27 +1,39 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import datetime
 from decimal import Decimal
 
 from maspatas.domain.entities.client import Client
-from maspatas.domain.entities.inventory import InventoryAggregate
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
 from maspatas.domain.entities.product import Product
 from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation
+from maspatas.domain.ports.pagination import Page, decode_id_cursor, decode_sale_cursor, id_cursor, page_of, sale_cursor
 from maspatas.domain.ports.repositories import (
     ClientRepositoryPort,
     InventoryRepositoryPort,
     ProductRepositoryPort,
     SaleRepositoryPort,
 )
+from maspatas.domain.ports.sale_filter import SaleFilter
+from maspatas.domain.ports.versioning import CollectionVersionPort, bump_version
 from maspatas.domain.value_objects.common import ClientId, Money, ProductId
+from maspatas.infrastructure.repositories.metrics import WriteCounters
+from maspatas.infrastructure.resilience.concurrency import InMemoryLockAdapter
 
 
 class InMemoryProductRepository(ProductRepositoryPort):
-    def __init__(self, products: dict[str, Product] | None = None) -> None:
+    def __init__(self, products: dict[str, Product] | None = None, versions: CollectionVersionPort | None = None) -> None:
         self._products = products or {}
+        self._skus = {product.sku: product_id for product_id, product in self._products.items()}
+        self._versions = versions
 
     @classmethod
-    def with_seed(cls) -> "InMemoryProductRepository":
+    def with_seed(cls, versions: CollectionVersionPort | None = None) -> "InMemoryProductRepository":
         return cls(
+            versions=versions,
             products={
                 "P-001": Product(id=ProductId("P-001"), name="Croquetas Premium", sku="CROQ-01", price=Money(Decimal("550.00"))),
                 "P-002": Product(id=ProductId("P-002"), name="Correa Ajustable", sku="CORR-01", price=Money(Decimal("220.00"))),
@@ -31,39 +43,165 @@ class InMemoryProductRepository(ProductRepositoryPort):
     def get_by_id(self, product_id: ProductId) -> Product | None:
         return self._products.get(product_id.value)
 
+    def get_many(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Product]:
+        return {product_id: self._products[product_id.value] for product_id in product_ids if product_id.value in self._products}
+
+    def list_page(self, limit: int, after: str | None = None) -> Page[Product]:
+        ids = sorted(self._products)
+        start = 0 if after is None else bisect_right(ids, decode_id_cursor(after))
+        return page_of([self._products[product_id] for product_id in ids[start : start + limit + 1]], limit, id_cursor)
+
     def save_product(self, product: Product) -> None:
+        owner = self._skus.get(product.sku)
+        if owner is not None and owner != product.id.value:
+            raise BusinessRuleViolation(f"Ya existe un producto con SKU {product.sku}")
+        previous = self._products.get(product.id.value)
+        if previous is not None:
+            self._skus.pop(previous.sku, None)
         self._products[product.id.value] = product
+        self._skus[product.sku] = product.id.value
+        bump_version(self._versions, "products")
+
+    def save_products(self, products: Sequence[Product]) -> dict[str, str]:
+        rejected: dict[str, str] = {}
+        for product in products:
+            if product.id.value in self._products:
+                rejected[product.id.value] = f"Ya existe un producto con id {product.id.value}"
+            elif product.sku in self._skus:
+                rejected[product.id.value] = f"Ya existe un producto con SKU {product.sku}"
+            else:
+                self._products[product.id.value] = product
+                self._skus[product.sku] = product.id.value
+        if len(rejected) < len(products):
+            bump_version(self._versions, "products")
+        return rejected
 
 
 class InMemoryClientRepository(ClientRepositoryPort):
-    def __init__(self, clients: dict[str, Client] | None = None) -> None:
+    def __init__(self, clients: dict[str, Client] | None = None, versions: CollectionVersionPort | None = None) -> None:
         self._clients = clients or {}
+        self._versions = versions
 
     @classmethod
-    def with_seed(cls) -> "InMemoryClientRepository":
-        return cls(clients={"C-001": Client(id=ClientId("C-001"), full_name="Ana Pérez", email="ana@cliente.com")})
+    def with_seed(cls, versions: CollectionVersionPort | None = None) -> "InMemoryClientRepository":
+        return cls(
+            clients={"C-001": Client(id=ClientId("C-001"), full_name="Ana Pérez", email="ana@cliente.com")},
+            versions=versions,
+        )
 
     def get_by_id(self, client_id: ClientId) -> Client | None:
         return self._clients.get(client_id.value)
 
+    def get_many(self, client_ids: Iterable[ClientId]) -> dict[ClientId, Client]:
+        return {client_id: self._clients[client_id.value] for client_id in client_ids if client_id.value in self._clients}
+
+    def list_page(self, limit: int, after: str | None = None) -> Page[Client]:
+        ids = sorted(self._clients)
+        start = 0 if after is None else bisect_right(ids, decode_id_cursor(after))
+        return page_of([self._clients[client_id] for client_id in ids[start : start + limit + 1]], limit, id_cursor)
+
     def save_client(self, client: Client) -> None:
         self._clients[client.id.value] = client
+        bump_version(self._versions, "clients")
 
 
 class InMemoryInventoryRepository(InventoryRepositoryPort):
-    def __init__(self, inventory: InventoryAggregate | None = None) -> None:
-        self._inventory = inventory or InventoryAggregate()
+    def __init__(
+        self,
+        inventory: InventoryAggregate | None = None,
+        locks: InMemoryLockAdapter | None = None,
+        versions: CollectionVersionPort | None = None,
+    ) -> None:
+        self._items: dict[ProductId, InventoryItem] = dict((inventory or InventoryAggregate()).items)
+        self._locks = locks or InMemoryLockAdapter(stripes=256)
+        self._versions = versions
+        self.write_counters = WriteCounters()
 
     def get_inventory(self) -> InventoryAggregate:
-        return self._inventory
+        return InventoryAggregate(items=dict(self._items))
+
+    def get_items(self, product_ids: Iterable[ProductId]) -> InventoryAggregate:
+        items = self._items
+        return InventoryAggregate(items={product_id: items[product_id] for product_id in set(product_ids) if product_id in items})
 
     def save_inventory(self, inventory: InventoryAggregate) -> None:
-        self._inventory = inventory
+        changed = inventory.changed_items()
+        with self._locks.lock_many(item.product_id.value for item in changed):
+            for item in changed:
+                self._items[item.product_id] = item
+        if changed:
+            bump_version(self._versions, "inventory")
+        self.write_counters.record(len(changed))
+
+    def decrease_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        with self._locks.lock_many(product_id.value for product_id in quantities):
+            updated = [self._current(product_id).decrease(quantity) for product_id, quantity in quantities.items()]
+            for item in updated:
+                self._items[item.product_id] = item
+        bump_version(self._versions, "inventory")
+
+    def increase_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        with self._locks.lock_many(product_id.value for product_id in quantities):
+            updated = [self._current(product_id).increase(quantity) for product_id, quantity in quantities.items()]
+            for item in updated:
+                self._items[item.product_id] = item
+        bump_version(self._versions, "inventory")
+
+    def _current(self, product_id: ProductId) -> InventoryItem:
+        return self._items.get(product_id, InventoryItem(product_id=product_id, stock=0))
 
 
 class InMemorySaleRepository(SaleRepositoryPort):
     def __init__(self) -> None:
         self.sales: list[SaleAggregate] = []
+        self._by_id: dict[str, SaleAggregate] = {}
+        self._keys: list[tuple[datetime, str]] = []
 
     def save_sale(self, sale: SaleAggregate) -> None:
+        if sale.sale_id in self._by_id:
+            raise BusinessRuleViolation(f"Ya existe una venta con id {sale.sale_id}")
+        self._by_id[sale.sale_id] = sale
+        insort(self._keys, (sale.created_at, sale.sale_id))
         self.sales.append(sale)
+
+    def save_sales(self, sales: Sequence[SaleAggregate]) -> set[str]:
+        duplicated: set[str] = set()
+        for sale in sales:
+            if sale.sale_id in self._by_id:
+                duplicated.add(sale.sale_id)
+                continue
+            self._by_id[sale.sale_id] = sale
+            self._keys.append((sale.created_at, sale.sale_id))
+            self.sales.append(sale)
+        self._keys.sort()
+        return duplicated
+
+    def get_by_id(self, sale_id: str) -> SaleAggregate | None:
+        return self._by_id.get(sale_id)
+
+    def list_page(self, limit: int, after: str | None = None, filters: SaleFilter | None = None) -> Page[SaleAggregate]:
+        filters = filters or SaleFilter()
+        start = 0 if filters.created_from is None else bisect_left(self._keys, (filters.created_from,))
+        end = len(self._keys) if filters.created_to is None else bisect_left(self._keys, (filters.created_to,))
+        if after is not None:
+            created_at, sale_id = decode_sale_cursor(after)
+            start = max(start, bisect_right(self._keys, (datetime.fromisoformat(created_at), sale_id)))
+        sales: list[SaleAggregate] = []
+        for _, sale_id in self._keys[start:end]:
+            sale = self._by_id[sale_id]
+            if filters.matches(sale):
+                sales.append(sale)
+                if len(sales) > limit:
+                    break
+        return page_of(sales, limit, sale_cursor)
+
+    def iter_sales(
+        self,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[SaleAggregate]:
+        start = 0 if created_from is None else bisect_left(self._keys, (created_from,))
+        end = len(self._keys) if created_to is None else bisect_left(self._keys, (created_to,))
+        for _, sale_id in self._keys[start:end]:
+            yield self._by_id[sale_id]
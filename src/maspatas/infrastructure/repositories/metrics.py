@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from threading import Lock
+
+
+@dataclass
+class WriteCounters:
+    calls: int = 0
+    last_written: int = 0
+    total_written: int = 0
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def record(self, written: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.last_written = written
+            self.total_written += written
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "last_written": self.last_written, "total_written": self.total_written}
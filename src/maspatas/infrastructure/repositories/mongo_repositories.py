@@ -1,91 +1,407 @@
 from __future__ import annotations
 
-from datetime import datetime
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from decimal import Decimal
 
+import pymongo
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
 from pymongo.database import Database
+from pymongo.errors import AutoReconnect, BulkWriteError, DuplicateKeyError, PyMongoError
 
 from maspatas.domain.entities.client import Client
-from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem, insufficient_stock
 from maspatas.domain.entities.product import Product
-from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation, DeadlineExceededError, PartialBatchWriteError
+from maspatas.domain.ports.pagination import Page, decode_id_cursor, decode_sale_cursor, id_cursor, page_of, sale_cursor
 from maspatas.domain.ports.repositories import (
     ClientRepositoryPort,
     InventoryRepositoryPort,
     ProductRepositoryPort,
     SaleRepositoryPort,
 )
+from maspatas.domain.ports.sale_filter import SaleFilter
+from maspatas.domain.ports.versioning import CollectionVersionPort, bump_version, observe_version
+from maspatas.domain.services.deadline import check_deadline, deadline_suspended, remaining_seconds
 from maspatas.domain.value_objects.common import ClientId, Money, ProductId
+from maspatas.infrastructure.repositories.metrics import WriteCounters
+from maspatas.infrastructure.resilience.policy import idempotent_retry
+
+
+@contextmanager
+def bounded_by_deadline() -> Iterator[None]:
+    remaining = remaining_seconds()
+    if remaining is None:
+        yield
+        return
+    check_deadline()
+    try:
+        with pymongo.timeout(remaining):
+            yield
+    except PyMongoError as exc:
+        if exc.timeout:
+            raise DeadlineExceededError("Tiempo máximo excedido en MongoDB") from exc
+        raise
+
+
+retry_reads = idempotent_retry(AutoReconnect)
+DUPLICATE_KEY_CODE = 11000
+# Sello por documento con el que se deriva la versión del inventario (ver cache/versions.py).
+STOCK_STAMP = {"changed_at": {"$type": "timestamp"}}
+
+
+def next_version(db: Database, collection: str) -> int:
+    doc = db.collection_versions.find_one_and_update(
+        {"_id": collection},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["version"]
+
+
+def duplicated_product(product_id: str) -> BusinessRuleViolation:
+    return BusinessRuleViolation(f"Ya existe un producto con id {product_id}")
+
+
+def product_conflict(product: Product, details: Mapping | None) -> BusinessRuleViolation:
+    if "sku" in (details or {}).get("keyPattern", {}):
+        return BusinessRuleViolation(f"Ya existe un producto con SKU {product.sku}")
+    return duplicated_product(product.id.value)
+
+
+def duplicated_client(client_id: str) -> BusinessRuleViolation:
+    return BusinessRuleViolation(f"Ya existe un cliente con id {client_id}")
+
+
+def duplicated_sale(sale_id: str) -> BusinessRuleViolation:
+    return BusinessRuleViolation(f"Ya existe una venta con id {sale_id}")
+
+
+def duplicate_key_errors(exc: BulkWriteError) -> list[dict]:
+    errors = exc.details.get("writeErrors", [])
+    if exc.details.get("writeConcernErrors") or any(error["code"] != DUPLICATE_KEY_CODE for error in errors):
+        raise exc
+    return errors
+
+
+def duplicated_sale_ids(exc: BulkWriteError, sales: Sequence[SaleAggregate]) -> set[str]:
+    try:
+        return {sales[error["index"]].sale_id for error in duplicate_key_errors(exc)}
+    except BulkWriteError:
+        # Con ordered=False los documentos sin error sí se insertaron.
+        failed = {error["index"] for error in exc.details.get("writeErrors", [])}
+        raise PartialBatchWriteError(sale.sale_id for index, sale in enumerate(sales) if index not in failed) from exc
+
+
+def rejected_products(exc: BulkWriteError, products: Sequence[Product]) -> dict[str, str]:
+    # Con ordered=False las filas sin error sí se insertaron; se reporta cada fallida para que las
+    # demás reciban su stock inicial en lugar de cortar la importación.
+    rejected: dict[str, str] = {}
+    for error in exc.details.get("writeErrors", []):
+        product = products[error["index"]]
+        if error["code"] == DUPLICATE_KEY_CODE:
+            rejected[product.id.value] = str(product_conflict(product, error))
+        else:
+            rejected[product.id.value] = f"No se pudo guardar el producto {product.id.value}: {error.get('errmsg', error['code'])}"
+    return rejected
+
+
+def product_to_document(product: Product) -> dict:
+    return {
+        "_id": product.id.value,
+        "id": product.id.value,
+        "name": product.name,
+        "sku": product.sku,
+        "price_amount": str(product.price.amount),
+        "price_currency": product.price.currency,
+    }
+
+
+def product_from_document(doc: dict) -> Product:
+    return Product(
+        id=ProductId(doc["id"]),
+        name=doc["name"],
+        sku=doc["sku"],
+        price=Money(amount=Decimal(doc["price_amount"]), currency=doc["price_currency"]),
+    )
+
+
+def client_to_document(client: Client) -> dict:
+    return {
+        "_id": client.id.value,
+        "id": client.id.value,
+        "full_name": client.full_name,
+        "email": client.email,
+    }
+
+
+def client_from_document(doc: dict) -> Client:
+    return Client(id=ClientId(doc["id"]), full_name=doc["full_name"], email=doc["email"])
+
+
+def inventory_from_documents(docs: Iterable[dict]) -> InventoryAggregate:
+    items = {
+        ProductId(doc["product_id"]): InventoryItem(product_id=ProductId(doc["product_id"]), stock=doc["stock"])
+        for doc in docs
+    }
+    return InventoryAggregate(items=items)
+
+
+def id_in_filter(ids: Iterable[ProductId | ClientId]) -> dict | None:
+    values = sorted({entity_id.value for entity_id in ids})
+    if not values:
+        return None
+    return {"_id": {"$in": values}}
+
+
+def set_stock_operations(items: Iterable[InventoryItem]) -> list[UpdateOne]:
+    return [
+        UpdateOne(
+            {"_id": item.product_id.value},
+            {"$set": {"product_id": item.product_id.value, "stock": item.stock}, "$currentDate": STOCK_STAMP},
+            upsert=True,
+        )
+        for item in items
+    ]
+
+
+def increment_stock_operations(quantities: Mapping[ProductId, int]) -> list[UpdateOne]:
+    return [
+        UpdateOne(
+            {"_id": product_id.value},
+            {"$inc": {"stock": quantity}, "$setOnInsert": {"product_id": product_id.value}, "$currentDate": STOCK_STAMP},
+            upsert=True,
+        )
+        for product_id, quantity in quantities.items()
+    ]
+
+
+def sorted_quantities(quantities: Mapping[ProductId, int]) -> list[tuple[ProductId, int]]:
+    return sorted(quantities.items(), key=lambda entry: entry[0].value)
+
+
+SALE_ORDER = [("created_at", ASCENDING), ("_id", ASCENDING)]
+
+
+def id_after_filter(after: str | None) -> dict:
+    return {} if after is None else {"_id": {"$gt": decode_id_cursor(after)}}
+
+
+def sale_after_filter(after: str | None) -> dict:
+    if after is None:
+        return {}
+    created_at, sale_id = decode_sale_cursor(after)
+    return {"$or": [{"created_at": {"$gt": created_at}}, {"created_at": created_at, "_id": {"$gt": sale_id}}]}
+
+
+def created_at_filter(created_from: datetime | None, created_to: datetime | None) -> dict:
+    bounds: dict[str, str] = {}
+    if created_from is not None:
+        bounds["$gte"] = created_from.astimezone(timezone.utc).isoformat()
+    if created_to is not None:
+        bounds["$lt"] = created_to.astimezone(timezone.utc).isoformat()
+    return {"created_at": bounds} if bounds else {}
+
+
+def sale_query(filters: SaleFilter | None) -> dict:
+    if filters is None:
+        return {}
+    query = created_at_filter(filters.created_from, filters.created_to)
+    if filters.client_id is not None:
+        query["client_id"] = filters.client_id.value
+    if filters.product_id is not None:
+        query["lines.product_id"] = filters.product_id.value
+    return query
+
+
+def sale_from_document(doc: dict) -> SaleAggregate:
+    return SaleAggregate(
+        sale_id=doc["sale_id"],
+        client_id=ClientId(doc["client_id"]),
+        created_at=parse_sale_datetime(doc["created_at"]),
+        lines=tuple(
+            SaleLine(
+                product_id=ProductId(line["product_id"]),
+                quantity=line["quantity"],
+                unit_price=Money(amount=Decimal(line["unit_price_amount"]), currency=line["currency"]),
+            )
+            for line in doc["lines"]
+        ),
+    )
+
+
+def sale_to_document(sale: SaleAggregate) -> dict:
+    return {
+        "_id": sale.sale_id,
+        "sale_id": sale.sale_id,
+        "client_id": sale.client_id.value,
+        "created_at": sale.created_at.isoformat(),
+        "total_amount": str(sale.total.amount),
+        "currency": sale.total.currency,
+        "lines": [
+            {
+                "product_id": line.product_id.value,
+                "quantity": line.quantity,
+                "unit_price_amount": str(line.unit_price.amount),
+                "currency": line.unit_price.currency,
+            }
+            for line in sale.lines
+        ],
+    }
 
 
 class MongoProductRepository(ProductRepositoryPort):
-    def __init__(self, db: Database) -> None:
+    def __init__(self, db: Database, versions: CollectionVersionPort | None = None) -> None:
         self._db = db
+        self._versions = versions
 
+    @retry_reads
     def get_by_id(self, product_id: ProductId) -> Product | None:
-        doc = self._db.products.find_one({"_id": product_id.value})
+        with bounded_by_deadline():
+            doc = self._db.products.find_one({"_id": product_id.value})
         if not doc:
             return None
-        return Product(
-            id=ProductId(doc["id"]),
-            name=doc["name"],
-            sku=doc["sku"],
-            price=Money(amount=Decimal(doc["price_amount"]), currency=doc["price_currency"]),
-        )
+        return product_from_document(doc)
+
+    @retry_reads
+    def get_many(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Product]:
+        query = id_in_filter(product_ids)
+        if query is None:
+            return {}
+        with bounded_by_deadline():
+            products = [product_from_document(doc) for doc in self._db.products.find(query)]
+        return {product.id: product for product in products}
+
+    @retry_reads
+    def list_page(self, limit: int, after: str | None = None) -> Page[Product]:
+        with bounded_by_deadline():
+            docs = self._db.products.find(id_after_filter(after)).sort("_id", ASCENDING).limit(limit + 1)
+            return page_of([product_from_document(doc) for doc in docs], limit, id_cursor)
 
     def save_product(self, product: Product) -> None:
-        self._db.products.insert_one(
-            {
-                "_id": product.id.value,
-                "id": product.id.value,
-                "name": product.name,
-                "sku": product.sku,
-                "price_amount": str(product.price.amount),
-                "price_currency": product.price.currency,
-            }
-        )
+        try:
+            with bounded_by_deadline():
+                self._db.products.insert_one(product_to_document(product))
+        except DuplicateKeyError as exc:
+            raise product_conflict(product, exc.details) from exc
+        self._bump()
+
+    def save_products(self, products: Sequence[Product]) -> dict[str, str]:
+        if not products:
+            return {}
+        rejected: dict[str, str] = {}
+        try:
+            with bounded_by_deadline():
+                self._db.products.insert_many([product_to_document(product) for product in products], ordered=False)
+        except BulkWriteError as exc:
+            rejected = rejected_products(exc, products)
+        if len(rejected) < len(products):
+            self._bump()
+        return rejected
+
+    def _bump(self) -> None:
+        with bounded_by_deadline():
+            observe_version(self._versions, "products", next_version(self._db, "products"))
 
 
 class MongoClientRepository(ClientRepositoryPort):
-    def __init__(self, db: Database) -> None:
+    def __init__(self, db: Database, versions: CollectionVersionPort | None = None) -> None:
         self._db = db
+        self._versions = versions
 
+    @retry_reads
     def get_by_id(self, client_id: ClientId) -> Client | None:
-        doc = self._db.clients.find_one({"_id": client_id.value})
+        with bounded_by_deadline():
+            doc = self._db.clients.find_one({"_id": client_id.value})
         if not doc:
             return None
-        return Client(id=ClientId(doc["id"]), full_name=doc["full_name"], email=doc["email"])
+        return client_from_document(doc)
+
+    @retry_reads
+    def get_many(self, client_ids: Iterable[ClientId]) -> dict[ClientId, Client]:
+        query = id_in_filter(client_ids)
+        if query is None:
+            return {}
+        with bounded_by_deadline():
+            clients = [client_from_document(doc) for doc in self._db.clients.find(query)]
+        return {client.id: client for client in clients}
+
+    @retry_reads
+    def list_page(self, limit: int, after: str | None = None) -> Page[Client]:
+        with bounded_by_deadline():
+            docs = self._db.clients.find(id_after_filter(after)).sort("_id", ASCENDING).limit(limit + 1)
+            return page_of([client_from_document(doc) for doc in docs], limit, id_cursor)
 
     def save_client(self, client: Client) -> None:
-        self._db.clients.insert_one(
-            {
-                "_id": client.id.value,
-                "id": client.id.value,
-                "full_name": client.full_name,
-                "email": client.email,
-            }
-        )
+        try:
+            with bounded_by_deadline():
+                self._db.clients.insert_one(client_to_document(client))
+        except DuplicateKeyError as exc:
+            raise duplicated_client(client.id.value) from exc
+        self._bump()
+
+    def _bump(self) -> None:
+        with bounded_by_deadline():
+            observe_version(self._versions, "clients", next_version(self._db, "clients"))
 
 
 class MongoInventoryRepository(InventoryRepositoryPort):
-    def __init__(self, db: Database) -> None:
+    def __init__(self, db: Database, versions: CollectionVersionPort | None = None) -> None:
         self._db = db
+        self._versions = versions
+        self.write_counters = WriteCounters()
 
+    @retry_reads
     def get_inventory(self) -> InventoryAggregate:
-        docs = self._db.inventory.find({})
-        items = {
-            ProductId(doc["product_id"]): InventoryItem(product_id=ProductId(doc["product_id"]), stock=doc["stock"])
-            for doc in docs
-        }
-        return InventoryAggregate(items=items)
+        with bounded_by_deadline():
+            return inventory_from_documents(self._db.inventory.find({}))
+
+    @retry_reads
+    def get_items(self, product_ids: Iterable[ProductId]) -> InventoryAggregate:
+        query = id_in_filter(product_ids)
+        if query is None:
+            return InventoryAggregate()
+        with bounded_by_deadline():
+            return inventory_from_documents(self._db.inventory.find(query))
 
     def save_inventory(self, inventory: InventoryAggregate) -> None:
-        for item in inventory.items.values():
-            self._db.inventory.update_one(
-                {"_id": item.product_id.value},
-                {"$set": {"product_id": item.product_id.value, "stock": item.stock}},
-                upsert=True,
-            )
+        changed = inventory.changed_items()
+        if changed:
+            with bounded_by_deadline():
+                self._db.inventory.bulk_write(set_stock_operations(changed), ordered=False)
+            bump_version(self._versions, "inventory")
+        self.write_counters.record(len(changed))
+
+    def decrease_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        applied: dict[ProductId, int] = {}
+        try:
+            for product_id, quantity in sorted_quantities(quantities):
+                with bounded_by_deadline():
+                    doc = self._db.inventory.find_one_and_update(
+                        {"_id": product_id.value, "stock": {"$gte": quantity}},
+                        {"$inc": {"stock": -quantity}, "$currentDate": STOCK_STAMP},
+                        projection={"stock": 1},
+                        return_document=ReturnDocument.AFTER,
+                    )
+                    if doc is None:
+                        current = self._db.inventory.find_one({"_id": product_id.value}, {"stock": 1})
+                        raise insufficient_stock(product_id, current["stock"] if current else 0, quantity)
+                applied[product_id] = quantity
+            bump_version(self._versions, "inventory")
+        except Exception:
+            if applied:
+                with deadline_suspended():
+                    self.increase_stock(applied)
+            raise
+
+    def increase_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        if quantities:
+            with bounded_by_deadline():
+                self._db.inventory.bulk_write(increment_stock_operations(quantities), ordered=False)
+            bump_version(self._versions, "inventory")
 
 
 class MongoSaleRepository(SaleRepositoryPort):
@@ -93,25 +409,44 @@ class MongoSaleRepository(SaleRepositoryPort):
         self._db = db
 
     def save_sale(self, sale: SaleAggregate) -> None:
-        self._db.sales.insert_one(
-            {
-                "_id": sale.sale_id,
-                "sale_id": sale.sale_id,
-                "client_id": sale.client_id.value,
-                "created_at": sale.created_at.isoformat(),
-                "total_amount": str(sale.total.amount),
-                "currency": sale.total.currency,
-                "lines": [
-                    {
-                        "product_id": line.product_id.value,
-                        "quantity": line.quantity,
-                        "unit_price_amount": str(line.unit_price.amount),
-                        "currency": line.unit_price.currency,
-                    }
-                    for line in sale.lines
-                ],
-            }
-        )
+        try:
+            with bounded_by_deadline():
+                self._db.sales.insert_one(sale_to_document(sale))
+        except DuplicateKeyError as exc:
+            raise duplicated_sale(sale.sale_id) from exc
+
+    def save_sales(self, sales: Sequence[SaleAggregate]) -> set[str]:
+        if not sales:
+            return set()
+        try:
+            with bounded_by_deadline():
+                self._db.sales.insert_many([sale_to_document(sale) for sale in sales], ordered=False)
+        except BulkWriteError as exc:
+            return duplicated_sale_ids(exc, sales)
+        return set()
+
+    @retry_reads
+    def get_by_id(self, sale_id: str) -> SaleAggregate | None:
+        with bounded_by_deadline():
+            doc = self._db.sales.find_one({"_id": sale_id})
+        return sale_from_document(doc) if doc else None
+
+    @retry_reads
+    def list_page(self, limit: int, after: str | None = None, filters: SaleFilter | None = None) -> Page[SaleAggregate]:
+        with bounded_by_deadline():
+            docs = self._db.sales.find({**sale_query(filters), **sale_after_filter(after)}).sort(SALE_ORDER).limit(limit + 1)
+            return page_of([sale_from_document(doc) for doc in docs], limit, sale_cursor)
+
+    def iter_sales(
+        self,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[SaleAggregate]:
+        cursor = self._db.sales.find(created_at_filter(created_from, created_to)).sort(SALE_ORDER).batch_size(batch_size)
+        with cursor:
+            for doc in cursor:
+                yield sale_from_document(doc)
 
 
 def parse_sale_datetime(raw_value: str) -> datetime:
@@ -1,81 +1,419 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from datetime import datetime
 from decimal import Decimal
 
+from sqlalchemy import Select, func, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import Session
 
 from maspatas.domain.entities.client import Client
-from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem, insufficient_stock
 from maspatas.domain.entities.product import Product
-from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation, DeadlineExceededError
+from maspatas.domain.ports.pagination import Page, decode_id_cursor, decode_sale_cursor, id_cursor, page_of, sale_cursor
 from maspatas.domain.ports.repositories import (
     ClientRepositoryPort,
     InventoryRepositoryPort,
     ProductRepositoryPort,
     SaleRepositoryPort,
 )
+from maspatas.domain.ports.sale_filter import SaleFilter
+from maspatas.domain.ports.versioning import CollectionVersionPort, bump_version, observe_version
+from maspatas.domain.services.deadline import check_deadline, remaining_seconds
 from maspatas.domain.value_objects.common import ClientId, Money, ProductId
-from maspatas.infrastructure.db.models import ClientModel, InventoryModel, ProductModel, SaleLineModel, SaleModel
+from maspatas.infrastructure.db.models import (
+    ClientModel,
+    CollectionVersionModel,
+    InventoryModel,
+    ProductModel,
+    SaleLineModel,
+    SaleModel,
+)
+from maspatas.infrastructure.repositories.metrics import WriteCounters
+from maspatas.infrastructure.repositories.mongo_repositories import duplicated_client, duplicated_sale
+
+_QUERY_CANCELED = "57014"
+
+
+@contextmanager
+def bounded_by_deadline(session: Session) -> Iterator[None]:
+    remaining = remaining_seconds()
+    if remaining is not None:
+        check_deadline()
+        session.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {"timeout": str(max(int(remaining * 1000), 1))},
+        )
+    try:
+        yield
+    except OperationalError as exc:
+        if getattr(exc.orig, "pgcode", None) == _QUERY_CANCELED:
+            session.rollback()
+            raise DeadlineExceededError("Tiempo máximo excedido en PostgreSQL") from exc
+        raise
+
+
+def next_version(session: Session, collection: str) -> int:
+    statement = insert(CollectionVersionModel).values(collection=collection, version=1)
+    version = session.scalar(
+        statement.on_conflict_do_update(
+            index_elements=[CollectionVersionModel.collection],
+            set_={"version": CollectionVersionModel.version + 1},
+        ).returning(CollectionVersionModel.version)
+    )
+    session.commit()
+    return version
+
+
+def product_from_model(model: ProductModel) -> Product:
+    return Product(
+        id=ProductId(model.id),
+        name=model.name,
+        sku=model.sku,
+        price=Money(amount=Decimal(model.price_amount), currency=model.price_currency),
+    )
+
+
+def client_from_model(model: ClientModel) -> Client:
+    return Client(id=ClientId(model.id), full_name=model.full_name, email=model.email)
+
+
+def sale_from_models(sale: SaleModel, lines: Iterable[SaleLineModel]) -> SaleAggregate:
+    return SaleAggregate(
+        sale_id=sale.sale_id,
+        client_id=ClientId(sale.client_id),
+        created_at=sale.created_at,
+        lines=tuple(
+            SaleLine(
+                product_id=ProductId(line.product_id),
+                quantity=line.quantity,
+                unit_price=Money(amount=Decimal(line.unit_price_amount), currency=line.currency),
+            )
+            for line in lines
+        ),
+    )
+
+
+def filtered_sales(query: Select, filters: SaleFilter | None) -> Select:
+    if filters is None:
+        return query
+    if filters.client_id is not None:
+        query = query.where(SaleModel.client_id == filters.client_id.value)
+    if filters.product_id is not None:
+        lines = select(SaleLineModel.sale_id).where(SaleLineModel.product_id == filters.product_id.value)
+        query = query.where(SaleModel.sale_id.in_(lines))
+    if filters.created_from is not None:
+        query = query.where(SaleModel.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        query = query.where(SaleModel.created_at < filters.created_to)
+    return query
 
 
 class SQLAlchemyProductRepository(ProductRepositoryPort):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, versions: CollectionVersionPort | None = None) -> None:
         self._session = session
+        self._versions = versions
 
     def get_by_id(self, product_id: ProductId) -> Product | None:
-        model = self._session.get(ProductModel, product_id.value)
+        with bounded_by_deadline(self._session):
+            model = self._session.get(ProductModel, product_id.value)
         if not model:
             return None
-        return Product(
-            id=ProductId(model.id),
-            name=model.name,
-            sku=model.sku,
-            price=Money(amount=Decimal(model.price_amount), currency=model.price_currency),
-        )
+        return product_from_model(model)
+
+    def get_many(self, product_ids: Iterable[ProductId]) -> dict[ProductId, Product]:
+        values = sorted({product_id.value for product_id in product_ids})
+        if not values:
+            return {}
+        with bounded_by_deadline(self._session):
+            rows = self._session.query(ProductModel).filter(ProductModel.id.in_(values)).all()
+        return {ProductId(row.id): product_from_model(row) for row in rows}
+
+    def list_page(self, limit: int, after: str | None = None) -> Page[Product]:
+        query = select(ProductModel).order_by(ProductModel.id).limit(limit + 1)
+        if after is not None:
+            query = query.where(ProductModel.id > decode_id_cursor(after))
+        with bounded_by_deadline(self._session):
+            rows = self._session.scalars(query).all()
+        return page_of([product_from_model(row) for row in rows], limit, id_cursor)
+
+    def save_product(self, product: Product) -> None:
+        rejected = self.save_products([product])
+        if rejected:
+            raise BusinessRuleViolation(rejected[product.id.value])
+
+    def save_products(self, products: Sequence[Product]) -> dict[str, str]:
+        if not products:
+            return {}
+        rows = [
+            {
+                "id": product.id.value,
+                "name": product.name,
+                "sku": product.sku,
+                "price_amount": product.price.amount,
+                "price_currency": product.price.currency,
+            }
+            for product in products
+        ]
+        statement = insert(ProductModel).values(rows).on_conflict_do_nothing().returning(ProductModel.id)
+        with bounded_by_deadline(self._session):
+            inserted = set(self._session.scalars(statement))
+            conflicts = [product.id.value for product in products if product.id.value not in inserted]
+            existing = set(self._session.scalars(select(ProductModel.id).where(ProductModel.id.in_(conflicts)))) if conflicts else set()
+            self._session.commit()
+        if inserted:
+            self._bump("products")
+        return {
+            product.id.value: f"Ya existe un producto con id {product.id.value}"
+            if product.id.value in existing
+            else f"Ya existe un producto con SKU {product.sku}"
+            for product in products
+            if product.id.value not in inserted
+        }
+
+    def _bump(self, collection: str) -> None:
+        if self._versions is not None:
+            with bounded_by_deadline(self._session):
+                observe_version(self._versions, collection, next_version(self._session, collection))
 
 
 class SQLAlchemyClientRepository(ClientRepositoryPort):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, versions: CollectionVersionPort | None = None) -> None:
         self._session = session
+        self._versions = versions
 
     def get_by_id(self, client_id: ClientId) -> Client | None:
-        model = self._session.get(ClientModel, client_id.value)
+        with bounded_by_deadline(self._session):
+            model = self._session.get(ClientModel, client_id.value)
         if not model:
             return None
-        return Client(id=ClientId(model.id), full_name=model.full_name, email=model.email)
+        return client_from_model(model)
+
+    def get_many(self, client_ids: Iterable[ClientId]) -> dict[ClientId, Client]:
+        values = sorted({client_id.value for client_id in client_ids})
+        if not values:
+            return {}
+        with bounded_by_deadline(self._session):
+            rows = self._session.query(ClientModel).filter(ClientModel.id.in_(values)).all()
+        return {ClientId(row.id): client_from_model(row) for row in rows}
+
+    def list_page(self, limit: int, after: str | None = None) -> Page[Client]:
+        query = select(ClientModel).order_by(ClientModel.id).limit(limit + 1)
+        if after is not None:
+            query = query.where(ClientModel.id > decode_id_cursor(after))
+        with bounded_by_deadline(self._session):
+            rows = self._session.scalars(query).all()
+        return page_of([client_from_model(row) for row in rows], limit, id_cursor)
 
     def save_client(self, client: Client) -> None:
-        self._session.add(ClientModel(id=client.id.value, full_name=client.full_name, email=client.email))
-        self._session.commit()
+        try:
+            with bounded_by_deadline(self._session):
+                self._session.add(ClientModel(id=client.id.value, full_name=client.full_name, email=client.email))
+                self._session.commit()
+        except IntegrityError as exc:
+            self._session.rollback()
+            if self._session.get(ClientModel, client.id.value) is not None:
+                raise duplicated_client(client.id.value) from exc
+            raise
+        except Exception:
+            self._session.rollback()
+            raise
+        self._bump("clients")
+
+    def _bump(self, collection: str) -> None:
+        if self._versions is not None:
+            with bounded_by_deadline(self._session):
+                observe_version(self._versions, collection, next_version(self._session, collection))
 
 
 class SQLAlchemyInventoryRepository(InventoryRepositoryPort):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, versions: CollectionVersionPort | None = None) -> None:
         self._session = session
+        self._versions = versions
+        self.write_counters = WriteCounters()
 
     def get_inventory(self) -> InventoryAggregate:
-        rows = self._session.query(InventoryModel).all()
+        with bounded_by_deadline(self._session):
+            return self._to_aggregate(self._session.query(InventoryModel).all())
+
+    def get_items(self, product_ids: Iterable[ProductId]) -> InventoryAggregate:
+        values = sorted({product_id.value for product_id in product_ids})
+        if not values:
+            return InventoryAggregate()
+        with bounded_by_deadline(self._session):
+            rows = self._session.query(InventoryModel).filter(InventoryModel.product_id.in_(values)).all()
+        return self._to_aggregate(rows)
+
+    def save_inventory(self, inventory: InventoryAggregate) -> None:
+        changed = inventory.changed_items()
+        if changed:
+            statement = insert(InventoryModel)
+            with bounded_by_deadline(self._session):
+                self._session.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[InventoryModel.product_id],
+                        set_={"stock": statement.excluded.stock, "changed_at": func.clock_timestamp()},
+                    ),
+                    [{"product_id": item.product_id.value, "stock": item.stock} for item in changed],
+                )
+                self._session.commit()
+            bump_version(self._versions, "inventory")
+        self.write_counters.record(len(changed))
+
+    def decrease_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        try:
+            with bounded_by_deadline(self._session):
+                self._decrease_each(quantities)
+                self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        bump_version(self._versions, "inventory")
+
+    def _decrease_each(self, quantities: Mapping[ProductId, int]) -> None:
+        for product_id, quantity in sorted(quantities.items(), key=lambda entry: entry[0].value):
+            updated = self._session.execute(
+                update(InventoryModel)
+                .where(InventoryModel.product_id == product_id.value, InventoryModel.stock >= quantity)
+                .values(stock=InventoryModel.stock - quantity)
+                .returning(InventoryModel.stock)
+            ).first()
+            if updated is None:
+                available = self._session.execute(
+                    select(InventoryModel.stock).where(InventoryModel.product_id == product_id.value)
+                ).scalar()
+                raise insufficient_stock(product_id, available or 0, quantity)
+
+    def increase_stock(self, quantities: Mapping[ProductId, int]) -> None:
+        if not quantities:
+            return
+        statement = insert(InventoryModel).values(
+            [{"product_id": product_id.value, "stock": quantity} for product_id, quantity in quantities.items()]
+        )
+        with bounded_by_deadline(self._session):
+            self._session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[InventoryModel.product_id],
+                    set_={"stock": InventoryModel.stock + statement.excluded.stock, "changed_at": func.clock_timestamp()},
+                )
+            )
+            self._session.commit()
+        bump_version(self._versions, "inventory")
+
+    @staticmethod
+    def _to_aggregate(rows: Iterable[InventoryModel]) -> InventoryAggregate:
         items = {
             ProductId(row.product_id): InventoryItem(product_id=ProductId(row.product_id), stock=row.stock)
             for row in rows
         }
         return InventoryAggregate(items=items)
 
-    def save_inventory(self, inventory: InventoryAggregate) -> None:
-        for item in inventory.items.values():
-            row = self._session.get(InventoryModel, item.product_id.value)
-            if row:
-                row.stock = item.stock
-            else:
-                self._session.add(InventoryModel(product_id=item.product_id.value, stock=item.stock))
-        self._session.commit()
-
 
 class SQLAlchemySaleRepository(SaleRepositoryPort):
     def __init__(self, session: Session) -> None:
         self._session = session
 
     def save_sale(self, sale: SaleAggregate) -> None:
+        try:
+            with bounded_by_deadline(self._session):
+                self._add_sale(sale)
+                self._session.commit()
+        except IntegrityError as exc:
+            self._session.rollback()
+            if self._session.get(SaleModel, sale.sale_id) is not None:
+                raise duplicated_sale(sale.sale_id) from exc
+            raise
+        except Exception:
+            self._session.rollback()
+            raise
+
+    def save_sales(self, sales: Sequence[SaleAggregate]) -> set[str]:
+        if not sales:
+            return set()
+        rows = [
+            {
+                "sale_id": sale.sale_id,
+                "client_id": sale.client_id.value,
+                "created_at": sale.created_at,
+                "total_amount": sale.total.amount,
+                "currency": sale.total.currency,
+            }
+            for sale in sales
+        ]
+        statement = insert(SaleModel).values(rows).on_conflict_do_nothing(index_elements=[SaleModel.sale_id])
+        with bounded_by_deadline(self._session):
+            inserted = set(self._session.scalars(statement.returning(SaleModel.sale_id)))
+            lines = [
+                {
+                    "sale_id": sale.sale_id,
+                    "product_id": line.product_id.value,
+                    "quantity": line.quantity,
+                    "unit_price_amount": line.unit_price.amount,
+                    "currency": line.unit_price.currency,
+                }
+                for sale in sales
+                if sale.sale_id in inserted
+                for line in sale.lines
+            ]
+            if lines:
+                self._session.execute(insert(SaleLineModel), lines)
+            self._session.commit()
+        return {sale.sale_id for sale in sales} - inserted
+
+    def get_by_id(self, sale_id: str) -> SaleAggregate | None:
+        with bounded_by_deadline(self._session):
+            sale = self._session.get(SaleModel, sale_id)
+            if sale is None:
+                return None
+            lines = self._lines_for([sale_id])
+        return sale_from_models(sale, lines.get(sale_id, []))
+
+    def list_page(self, limit: int, after: str | None = None, filters: SaleFilter | None = None) -> Page[SaleAggregate]:
+        query = filtered_sales(select(SaleModel), filters).order_by(SaleModel.created_at, SaleModel.sale_id).limit(limit + 1)
+        if after is not None:
+            created_at, sale_id = decode_sale_cursor(after)
+            query = query.where(tuple_(SaleModel.created_at, SaleModel.sale_id) > (datetime.fromisoformat(created_at), sale_id))
+        with bounded_by_deadline(self._session):
+            sales = self._session.scalars(query).all()
+            lines = self._lines_for([sale.sale_id for sale in sales])
+        return page_of([sale_from_models(sale, lines.get(sale.sale_id, [])) for sale in sales], limit, sale_cursor)
+
+    def iter_sales(
+        self,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[SaleAggregate]:
+        query = select(SaleModel).order_by(SaleModel.created_at, SaleModel.sale_id).limit(batch_size)
+        if created_from is not None:
+            query = query.where(SaleModel.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(SaleModel.created_at < created_to)
+        last: SaleModel | None = None
+        while True:
+            batch_query = query if last is None else query.where(tuple_(SaleModel.created_at, SaleModel.sale_id) > (last.created_at, last.sale_id))
+            sales = self._session.scalars(batch_query).all()
+            if not sales:
+                return
+            lines = self._lines_for([sale.sale_id for sale in sales])
+            for sale in sales:
+                yield sale_from_models(sale, lines.get(sale.sale_id, []))
+            last = sales[-1]
+
+    def _lines_for(self, sale_ids: list[str]) -> dict[str, list[SaleLineModel]]:
+        grouped: dict[str, list[SaleLineModel]] = {}
+        if sale_ids:
+            query = select(SaleLineModel).where(SaleLineModel.sale_id.in_(sale_ids)).order_by(SaleLineModel.id)
+            for line in self._session.scalars(query):
+                grouped.setdefault(line.sale_id, []).append(line)
+        return grouped
+
+    def _add_sale(self, sale: SaleAggregate) -> None:
         self._session.add(
             SaleModel(
                 sale_id=sale.sale_id,
@@ -97,5 +435,3 @@ class SQLAlchemySaleRepository(SaleRepositoryPort):
                     currency=line.unit_price.currency,
                 )
             )
-
-        self._session.commit()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from threading import BoundedSemaphore, Lock
+
+from maspatas.domain.exceptions.domain_exceptions import DeadlineExceededError, DependencyUnavailableError
+from maspatas.domain.services.deadline import remaining_seconds
+
+
+def bulkhead_full_error(name: str) -> DependencyUnavailableError:
+    return DependencyUnavailableError(f"La dependencia {name} está saturada, intenta más tarde")
+
+
+class _BulkheadState:
+    def __init__(self, name: str, max_concurrent: int, max_queue: int) -> None:
+        if max_concurrent <= 0 or max_queue < 0:
+            raise ValueError("max_concurrent debe ser positivo y max_queue no negativo")
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._counters = Lock()
+
+    def _enqueue(self) -> None:
+        with self._counters:
+            if self.in_flight + self.waiting >= self.max_concurrent + self.max_queue:
+                self.rejected += 1
+                raise bulkhead_full_error(self.name)
+            self.waiting += 1
+
+    def _admit(self, acquired: bool) -> None:
+        with self._counters:
+            self.waiting -= 1
+            if acquired:
+                self.in_flight += 1
+
+    def _leave(self) -> None:
+        with self._counters:
+            self.in_flight -= 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._counters:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "rejected": self.rejected,
+            }
+
+
+class Bulkhead(_BulkheadState):
+    def __init__(self, name: str, max_concurrent: int = 16, max_queue: int = 32) -> None:
+        super().__init__(name, max_concurrent, max_queue)
+        self._semaphore = BoundedSemaphore(max_concurrent)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        self._enqueue()
+        acquired = False
+        try:
+            remaining = remaining_seconds()
+            acquired = self._semaphore.acquire(timeout=None if remaining is None else max(remaining, 0))
+        finally:
+            self._admit(acquired)
+        if not acquired:
+            raise DeadlineExceededError(f"Tiempo máximo excedido esperando a {self.name}")
+        try:
+            yield
+        finally:
+            self._leave()
+            self._semaphore.release()
+
+
+class AsyncBulkhead(_BulkheadState):
+    def __init__(self, name: str, max_concurrent: int = 16, max_queue: int = 32) -> None:
+        super().__init__(name, max_concurrent, max_queue)
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        self._enqueue()
+        acquired = False
+        try:
+            async with asyncio.timeout(remaining_seconds()):
+                acquired = await self._semaphore.acquire()
+        except TimeoutError as exc:
+            raise DeadlineExceededError(f"Tiempo máximo excedido esperando a {self.name}") from exc
+        finally:
+            self._admit(acquired)
+        try:
+            yield
+        finally:
+            self._leave()
+            self._semaphore.release()
@@ -1,22 +1,148 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
-from threading import Lock
+import asyncio
+import time
+import zlib
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from threading import Lock, RLock
 
-from maspatas.domain.ports.concurrency import ConcurrencyControlPort
+from maspatas.domain.exceptions.domain_exceptions import LockTimeoutError
+from maspatas.domain.ports.concurrency import AsyncConcurrencyControlPort, ConcurrencyControlPort, Lease
+
+
+@dataclass
+class LockMetrics:
+    acquisitions: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    _lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def record(self, wait_seconds: float, acquired: bool) -> None:
+        with self._lock:
+            if acquired:
+                self.acquisitions += 1
+            else:
+                self.timeouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            attempts = self.acquisitions + self.timeouts
+            return {
+                "acquisitions": self.acquisitions,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": (self.total_wait_seconds / attempts * 1000) if attempts else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+            }
+
+
+def stripe_index(key: str, stripes: int) -> int:
+    return zlib.crc32(key.encode("utf-8")) % stripes
+
+
+def lock_timeout_error(keys: Iterable[str]) -> LockTimeoutError:
+    return LockTimeoutError(f"No se pudo adquirir el bloqueo para {', '.join(sorted(keys))}")
 
 
 class InMemoryLockAdapter(ConcurrencyControlPort):
-    def __init__(self) -> None:
-        self._locks: dict[str, Lock] = {}
+    def __init__(self, stripes: int = 1024, default_timeout: float | None = 10.0) -> None:
+        if stripes <= 0:
+            raise ValueError("stripes debe ser positivo")
+        self._stripes = tuple(RLock() for _ in range(stripes))
+        self._default_timeout = default_timeout
+        self.metrics = LockMetrics()
+
+    @property
+    def stripe_count(self) -> int:
+        return len(self._stripes)
+
+    def stripe_for(self, key: str) -> int:
+        return stripe_index(key, len(self._stripes))
+
+    def lock(self, key: str, timeout: float | None = None):
+        return self.lock_many((key,), timeout=timeout)
 
     @contextmanager
-    def lock(self, key: str):
-        if key not in self._locks:
-            self._locks[key] = Lock()
-        lock = self._locks[key]
-        lock.acquire()
+    def lock_many(self, keys: Iterable[str], timeout: float | None = None) -> Iterator[None]:
+        keys = tuple(keys)
+        indexes = sorted({self.stripe_for(key) for key in keys})
+        timeout = self._default_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        acquired: list[RLock] = []
+        try:
+            for index in indexes:
+                stripe = self._stripes[index]
+                if deadline is None:
+                    stripe.acquire()
+                elif not stripe.acquire(timeout=max(deadline - time.monotonic(), 0)):
+                    self.metrics.record(time.monotonic() - started, acquired=False)
+                    raise lock_timeout_error(keys)
+                acquired.append(stripe)
+            self.metrics.record(time.monotonic() - started, acquired=True)
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                stripe.release()
+
+
+class AsyncInMemoryLockAdapter(AsyncConcurrencyControlPort):
+    def __init__(self, stripes: int = 1024, default_timeout: float | None = 10.0) -> None:
+        if stripes <= 0:
+            raise ValueError("stripes debe ser positivo")
+        self._stripes = tuple(asyncio.Lock() for _ in range(stripes))
+        self._default_timeout = default_timeout
+        self.metrics = LockMetrics()
+
+    def lock(self, key: str, timeout: float | None = None):
+        return self.lock_many((key,), timeout=timeout)
+
+    @asynccontextmanager
+    async def lock_many(self, keys: Iterable[str], timeout: float | None = None) -> AsyncIterator[None]:
+        keys = tuple(keys)
+        indexes = sorted({stripe_index(key, len(self._stripes)) for key in keys})
+        timeout = self._default_timeout if timeout is None else timeout
+        started = time.monotonic()
+        acquired: list[asyncio.Lock] = []
         try:
+            try:
+                async with asyncio.timeout(timeout):
+                    for index in indexes:
+                        await self._stripes[index].acquire()
+                        acquired.append(self._stripes[index])
+            except TimeoutError:
+                self.metrics.record(time.monotonic() - started, acquired=False)
+                raise lock_timeout_error(keys) from None
+            self.metrics.record(time.monotonic() - started, acquired=True)
             yield
         finally:
-            lock.release()
+            for stripe in reversed(acquired):
+                stripe.release()
+
+
+class AsyncLockBridge(AsyncConcurrencyControlPort):
+    def __init__(self, adapter: ConcurrencyControlPort) -> None:
+        self._adapter = adapter
+
+    @property
+    def metrics(self) -> LockMetrics:
+        return self._adapter.metrics  # type: ignore[attr-defined]
+
+    def lock(self, key: str, timeout: float | None = None):
+        return self.lock_many((key,), timeout=timeout)
+
+    @asynccontextmanager
+    async def lock_many(self, keys: Iterable[str], timeout: float | None = None) -> AsyncIterator[Lease | None]:
+        context = self._adapter.lock_many(tuple(keys), timeout=timeout)
+        lease = await asyncio.to_thread(context.__enter__)
+        try:
+            yield lease
+        except BaseException as exc:
+            if not await asyncio.to_thread(context.__exit__, type(exc), exc, exc.__traceback__):
+                raise
+        else:
+            await asyncio.to_thread(context.__exit__, None, None, None)
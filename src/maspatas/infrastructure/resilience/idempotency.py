@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
+
+from maspatas.domain.ports.idempotency import IdempotencyRecord, IdempotencyStorePort
+from maspatas.infrastructure.cache.ttl_lru import TTLCache
+
+_IN_PROGRESS = "IN_PROGRESS"
+_COMPLETED = "COMPLETED"
+
+
+class InMemoryIdempotencyStore(IdempotencyStorePort):
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 86_400, in_flight_ttl_seconds: float = 60) -> None:
+        self._records: TTLCache[str, IdempotencyRecord] = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._in_flight_ttl_seconds = in_flight_ttl_seconds
+
+    @property
+    def cache(self) -> TTLCache[str, IdempotencyRecord]:
+        return self._records
+
+    async def begin(self, key: str, fingerprint: str, owner: str) -> IdempotencyRecord | None:
+        existing = self._records.get(key)
+        if existing is not None:
+            return existing
+        claim = IdempotencyRecord(key=key, fingerprint=fingerprint, owner=owner)
+        self._records.set(key, claim, ttl_seconds=self._in_flight_ttl_seconds)
+        return None
+
+    async def complete(self, key: str, fingerprint: str, result: dict, owner: str) -> None:
+        record = self._records.get(key)
+        if record is None or record.owner == owner:
+            self._records.set(key, IdempotencyRecord(key=key, fingerprint=fingerprint, result=result, owner=owner))
+
+    async def release(self, key: str, owner: str) -> None:
+        record = self._records.get(key)
+        if record is not None and record.in_flight and record.owner == owner:
+            self._records.pop(key)
+
+
+class MongoIdempotencyStore(IdempotencyStorePort):
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        cache: TTLCache[str, IdempotencyRecord] | None = None,
+        ttl_seconds: float = 86_400,
+        in_flight_ttl_seconds: float = 60,
+    ) -> None:
+        self._collection = db.idempotency_keys
+        self._cache = cache or TTLCache(max_entries=10_000, ttl_seconds=ttl_seconds)
+        self._ttl_seconds = ttl_seconds
+        self._in_flight_ttl_seconds = in_flight_ttl_seconds
+
+    @property
+    def cache(self) -> TTLCache[str, IdempotencyRecord]:
+        return self._cache
+
+    async def begin(self, key: str, fingerprint: str, owner: str) -> IdempotencyRecord | None:
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        now = datetime.now(timezone.utc)
+        in_flight = {
+            "fingerprint": fingerprint,
+            "status": _IN_PROGRESS,
+            "owner": owner,
+            "expires_at": now + timedelta(seconds=self._in_flight_ttl_seconds),
+        }
+        try:
+            await self._collection.insert_one({"_id": key, **in_flight})
+            return None
+        except DuplicateKeyError:
+            pass
+
+        taken_over = await self._collection.find_one_and_update(
+            {"_id": key, "status": _IN_PROGRESS, "expires_at": {"$lte": now}},
+            {"$set": in_flight},
+        )
+        if taken_over is not None:
+            return None
+
+        doc = await self._collection.find_one({"_id": key})
+        if doc is None:
+            return await self.begin(key, fingerprint, owner)
+        record = IdempotencyRecord(key=key, fingerprint=doc["fingerprint"], result=doc.get("result"))
+        if not record.in_flight:
+            self._cache.set(key, record)
+        return record
+
+    async def complete(self, key: str, fingerprint: str, result: dict, owner: str) -> None:
+        try:
+            await self._collection.update_one(
+                {"_id": key, "owner": owner},
+                {
+                    "$set": {
+                        "fingerprint": fingerprint,
+                        "status": _COMPLETED,
+                        "result": result,
+                        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=self._ttl_seconds),
+                    }
+                },
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # Otro dueño tomó la llave al vencer el claim; su resultado es el que vale.
+            return
+        self._cache.set(key, IdempotencyRecord(key=key, fingerprint=fingerprint, result=result, owner=owner))
+
+    async def release(self, key: str, owner: str) -> None:
+        await self._collection.delete_one({"_id": key, "status": _IN_PROGRESS, "owner": owner})
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import fcntl
+import os
+import socket
+import tempfile
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from threading import Event, Thread
+
+from pymongo import ASCENDING
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from maspatas.domain.ports.concurrency import ConcurrencyControlPort, Lease
+from maspatas.infrastructure.resilience.concurrency import LockMetrics, lock_timeout_error, stripe_index
+
+
+class MongoLeaseLockAdapter(ConcurrencyControlPort):
+    def __init__(
+        self,
+        db: Database,
+        lease_seconds: float = 15.0,
+        default_timeout: float | None = 10.0,
+        poll_interval: float = 0.02,
+    ) -> None:
+        self._locks = db.locks
+        self._lease_seconds = lease_seconds
+        self._default_timeout = default_timeout
+        self._poll_interval = poll_interval
+        self._process_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.metrics = LockMetrics()
+        self._locks.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0, name="lease_ttl")
+
+    def lock(self, key: str, timeout: float | None = None):
+        return self.lock_many((key,), timeout=timeout)
+
+    @contextmanager
+    def lock_many(self, keys: Iterable[str], timeout: float | None = None) -> Iterator[Lease]:
+        ordered = tuple(sorted(set(keys)))
+        owner = f"{self._process_id}:{uuid.uuid4().hex}"
+        timeout = self._default_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        acquired: list[str] = []
+        stop_renewal = Event()
+        renewal: Thread | None = None
+        try:
+            for key in ordered:
+                while not self._try_acquire(key, owner):
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self.metrics.record(time.monotonic() - started, acquired=False)
+                        raise lock_timeout_error(ordered)
+                    time.sleep(self._poll_interval)
+                acquired.append(key)
+            self.metrics.record(time.monotonic() - started, acquired=True)
+
+            lease = Lease(keys=ordered, owner=owner)
+            renewal = Thread(target=self._renew_until, args=(ordered, owner, stop_renewal), daemon=True)
+            renewal.start()
+            yield lease
+        finally:
+            stop_renewal.set()
+            if renewal is not None:
+                renewal.join()
+            for key in reversed(acquired):
+                self._locks.delete_one({"_id": key, "owner": owner})
+
+    def _try_acquire(self, key: str, owner: str) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            self._locks.find_one_and_update(
+                {"_id": key, "expires_at": {"$lte": now}},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=self._lease_seconds)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    def _renew_until(self, keys: tuple[str, ...], owner: str, stop: Event) -> None:
+        while not stop.wait(self._lease_seconds / 3):
+            self._locks.update_many(
+                {"_id": {"$in": list(keys)}, "owner": owner},
+                {"$set": {"expires_at": datetime.now(timezone.utc) + timedelta(seconds=self._lease_seconds)}},
+            )
+
+
+class FileLockAdapter(ConcurrencyControlPort):
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        stripes: int = 256,
+        default_timeout: float | None = 10.0,
+        poll_interval: float = 0.005,
+    ) -> None:
+        if stripes <= 0:
+            raise ValueError("stripes debe ser positivo")
+        self._directory = Path(directory or Path(tempfile.gettempdir()) / "maspatas-locks")
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._stripes = stripes
+        self._default_timeout = default_timeout
+        self._poll_interval = poll_interval
+        self.metrics = LockMetrics()
+
+    def lock(self, key: str, timeout: float | None = None):
+        return self.lock_many((key,), timeout=timeout)
+
+    @contextmanager
+    def lock_many(self, keys: Iterable[str], timeout: float | None = None) -> Iterator[None]:
+        keys = tuple(keys)
+        indexes = sorted({stripe_index(key, self._stripes) for key in keys})
+        timeout = self._default_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        descriptors: list[int] = []
+        try:
+            for index in indexes:
+                descriptor = os.open(self._directory / f"stripe-{index}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+                descriptors.append(descriptor)
+                while not self._try_flock(descriptor):
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self.metrics.record(time.monotonic() - started, acquired=False)
+                        raise lock_timeout_error(keys)
+                    time.sleep(self._poll_interval)
+            self.metrics.record(time.monotonic() - started, acquired=True)
+            yield
+        finally:
+            for descriptor in reversed(descriptors):
+                os.close(descriptor)
+
+    @staticmethod
+    def _try_flock(descriptor: int) -> bool:
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
@@ -1,40 +1,112 @@
 from __future__ import annotations
 
-import signal
-from contextlib import contextmanager
-from typing import Callable, TypeVar
+from collections.abc import Mapping
+from dataclasses import dataclass
+from threading import Lock
+from typing import Awaitable, Callable, TypeVar
 
 import pybreaker
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import RetryCallState, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from maspatas.domain.exceptions.domain_exceptions import DeadlineExceededError, DependencyUnavailableError, DomainError
+from maspatas.domain.services.deadline import current_deadline, deadline_scope
+from maspatas.infrastructure.resilience.bulkhead import AsyncBulkhead, Bulkhead
 
 T = TypeVar("T")
 
 
-class TimeoutError(Exception):
-    pass
+def stop_before_deadline(retry_state: RetryCallState) -> bool:
+    deadline = current_deadline()
+    return deadline is not None and deadline.remaining() <= (retry_state.upcoming_sleep or 0)
+
+
+def idempotent_retry(*exception_types: type[BaseException], attempts: int = 3):
+    return retry(
+        retry=retry_if_exception_type(exception_types),
+        stop=stop_after_attempt(attempts) | stop_before_deadline,
+        wait=wait_exponential(multiplier=0.05, min=0.05, max=0.5),
+        reraise=True,
+    )
+
+
+def is_business_error(exc: BaseException) -> bool:
+    return isinstance(exc, DomainError) and not isinstance(exc, (DeadlineExceededError, DependencyUnavailableError))
+
+
+def circuit_open_error(name: str) -> DependencyUnavailableError:
+    return DependencyUnavailableError(f"La dependencia {name} no está disponible temporalmente")
+
+
+@dataclass(frozen=True)
+class DependencyLimits:
+    fail_max: int = 3
+    reset_timeout: float = 30
+    max_concurrent: int = 16
+    max_queue: int = 32
+
+
+class DependencyGuard:
+    def __init__(self, name: str, limits: DependencyLimits) -> None:
+        self.name = name
+        self.breaker = pybreaker.CircuitBreaker(
+            fail_max=limits.fail_max,
+            reset_timeout=limits.reset_timeout,
+            exclude=[is_business_error],
+            name=name,
+            throw_new_error_on_trip=False,
+        )
+        self.bulkhead = Bulkhead(name, limits.max_concurrent, limits.max_queue)
+        self.async_bulkhead = AsyncBulkhead(name, limits.max_concurrent, limits.max_queue)
+
+    def snapshot(self) -> dict[str, object]:
+        threads = self.bulkhead.snapshot()
+        tasks = self.async_bulkhead.snapshot()
+        return {
+            "breaker": self.breaker.current_state,
+            "failures": self.breaker.fail_counter,
+            "max_concurrent": threads["max_concurrent"],
+            "max_queue": threads["max_queue"],
+            "in_flight": threads["in_flight"] + tasks["in_flight"],
+            "waiting": threads["waiting"] + tasks["waiting"],
+            "rejected": threads["rejected"] + tasks["rejected"],
+        }
 
 
 class ResiliencePolicy:
-    def __init__(self) -> None:
-        self._breaker = pybreaker.CircuitBreaker(fail_max=3, reset_timeout=30)
-
-    @contextmanager
-    def timeout(self, seconds: int):
-        def _handler(signum, frame):  # type: ignore[no-untyped-def]
-            raise TimeoutError(f"Tiempo máximo excedido: {seconds}s")
-
-        old_handler = signal.signal(signal.SIGALRM, _handler)
-        signal.alarm(seconds)
-        try:
-            yield
-        finally:
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, old_handler)
-
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=4), reraise=True)
-    def with_retry(self, fn: Callable[[], T]) -> T:
-        return fn()
-
-    def protected_call(self, fn: Callable[[], T], timeout_seconds: int = 5) -> T:
-        with self.timeout(timeout_seconds):
-            return self._breaker.call(lambda: self.with_retry(fn))
+    def __init__(self, limits: Mapping[str, DependencyLimits] | None = None, default_limits: DependencyLimits | None = None) -> None:
+        self._limits = dict(limits or {})
+        self._default_limits = default_limits or DependencyLimits()
+        self._dependencies: dict[str, DependencyGuard] = {}
+        self._guard = Lock()
+
+    def dependency(self, name: str) -> DependencyGuard:
+        with self._guard:
+            guard = self._dependencies.get(name)
+            if guard is None:
+                guard = DependencyGuard(name, self._limits.get(name, self._default_limits))
+                self._dependencies[name] = guard
+            return guard
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        with self._guard:
+            guards = list(self._dependencies.values())
+        return {guard.name: guard.snapshot() for guard in guards}
+
+    def protected_call(self, fn: Callable[[], T], timeout_seconds: float = 5, dependency: str = "default") -> T:
+        guard = self.dependency(dependency)
+        with deadline_scope(timeout_seconds):
+            with guard.bulkhead.slot():
+                try:
+                    return guard.breaker.call(fn)
+                except pybreaker.CircuitBreakerError as exc:
+                    raise circuit_open_error(dependency) from exc
+
+    async def protected_call_async(self, fn: Callable[[], Awaitable[T]], timeout_seconds: float = 5, dependency: str = "default") -> T:
+        guard = self.dependency(dependency)
+        with deadline_scope(timeout_seconds):
+            async with guard.async_bulkhead.slot():
+                try:
+                    with guard.breaker.calling():
+                        return await fn()
+                except pybreaker.CircuitBreakerError as exc:
+                    raise circuit_open_error(dependency) from exc
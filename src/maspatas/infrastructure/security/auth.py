@@ -26,7 +26,7 @@ _USER_TO_ROLE = {
 }
 
 
-def get_current_role(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Role:
+async def get_current_role(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Role:
     token = credentials.credentials
     role = _TOKEN_TO_ROLE.get(token)
     if not role:
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass(frozen=True)
+class RouteGroup:
+    name: str
+    priority: int
+    methods: frozenset[str]
+    prefixes: tuple[str, ...]
+
+    def matches(self, method: str, path: str) -> bool:
+        return self.match_length(method, path) >= 0
+
+    def match_length(self, method: str, path: str) -> int:
+        if method not in self.methods:
+            return -1
+        return max((len(prefix) for prefix in self.prefixes if path == prefix or path.startswith(f"{prefix}/")), default=-1)
+
+
+@dataclass
+class RouteGroupStats:
+    in_flight: int = 0
+    admitted: int = 0
+    shed: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+
+    def p99_ms(self) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.99) - 1)] * 1000
+
+
+class AIMDLimiter:
+    def __init__(
+        self,
+        initial_limit: float = 32,
+        min_limit: float = 4,
+        max_limit: float = 256,
+        target_latency_seconds: float = 0.25,
+        backoff: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < min_limit <= initial_limit <= max_limit:
+            raise ValueError("Se requiere 0 < min_limit <= initial_limit <= max_limit")
+        self._limit = float(initial_limit)
+        self._min_limit = float(min_limit)
+        self._max_limit = float(max_limit)
+        self.target_latency_seconds = target_latency_seconds
+        self._backoff = backoff
+        self._clock = clock
+        self._last_decrease = float("-inf")
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    def on_sample(self, latency_seconds: float) -> None:
+        if latency_seconds > self.target_latency_seconds:
+            now = self._clock()
+            if now - self._last_decrease >= self.target_latency_seconds:
+                self._limit = max(self._min_limit, self._limit * self._backoff)
+                self._last_decrease = now
+        else:
+            self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        groups: Iterable[RouteGroup],
+        limiter: AIMDLimiter | None = None,
+        priority_shares: tuple[float, ...] = (1.0, 0.8, 0.6),
+        isolated_limiters: Mapping[str, AIMDLimiter] | None = None,
+    ) -> None:
+        self._groups = tuple(sorted(groups, key=lambda group: group.priority))
+        self.limiter = limiter or AIMDLimiter()
+        self._priority_shares = priority_shares
+        # Rutas largas (lotes, importaciones, reportes) tienen su propio límite y objetivo de latencia
+        # para que sus muestras no reduzcan el límite compartido de lecturas y ventas.
+        self._isolated = dict(isolated_limiters or {})
+        self._stats = {group.name: RouteGroupStats() for group in self._groups}
+        self.in_flight = 0
+
+    def limiter_for(self, group: RouteGroup) -> AIMDLimiter:
+        return self._isolated.get(group.name, self.limiter)
+
+    def retry_after_seconds(self, group: RouteGroup) -> int:
+        return max(1, math.ceil(self.limiter_for(group).target_latency_seconds))
+
+    def classify(self, method: str, path: str) -> RouteGroup | None:
+        best = max(self._groups, key=lambda group: group.match_length(method, path), default=None)
+        return best if best is not None and best.matches(method, path) else None
+
+    def try_acquire(self, group: RouteGroup) -> bool:
+        stats = self._stats[group.name]
+        isolated = self._isolated.get(group.name)
+        if isolated is not None:
+            admitted = stats.in_flight < max(1.0, isolated.limit)
+        else:
+            share = self._priority_shares[min(group.priority, len(self._priority_shares) - 1)]
+            admitted = self.in_flight < max(1.0, self.limiter.limit * share)
+        if not admitted:
+            stats.shed += 1
+            return False
+        if isolated is None:
+            self.in_flight += 1
+        stats.in_flight += 1
+        stats.admitted += 1
+        return True
+
+    def release(self, group: RouteGroup, latency_seconds: float) -> None:
+        if group.name not in self._isolated:
+            self.in_flight -= 1
+        stats = self._stats[group.name]
+        stats.in_flight -= 1
+        stats.latencies.append(latency_seconds)
+        self.limiter_for(group).on_sample(latency_seconds)
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "limit": round(self.limiter.limit, 2),
+            "in_flight": self.in_flight,
+            "target_p99_ms": self.limiter.target_latency_seconds * 1000,
+            "groups": {
+                group.name: {
+                    "priority": group.priority,
+                    "limit": round(self.limiter_for(group).limit, 2),
+                    "target_p99_ms": self.limiter_for(group).target_latency_seconds * 1000,
+                    "in_flight": self._stats[group.name].in_flight,
+                    "admitted": self._stats[group.name].admitted,
+                    "shed": self._stats[group.name].shed,
+                    "p99_ms": round(self._stats[group.name].p99_ms(), 2),
+                }
+                for group in self._groups
+            },
+        }
+
+
+def add_admission_control(app: FastAPI, controller: AdmissionController) -> None:
+    @app.middleware("http")
+    async def admission_control(request: Request, call_next):
+        group = controller.classify(request.method, request.url.path)
+        if group is None:
+            return await call_next(request)
+        if not controller.try_acquire(group):
+            return JSONResponse(
+                status_code=503,
+                content={"detail": "Servidor saturado, intenta más tarde"},
+                headers={"Retry-After": str(controller.retry_after_seconds(group))},
+            )
+        started = time.monotonic()
+        try:
+            return await call_next(request)
+        finally:
+            controller.release(group, time.monotonic() - started)
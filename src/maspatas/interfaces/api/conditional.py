@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from fastapi.responses import Response
+
+CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def validator_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag))
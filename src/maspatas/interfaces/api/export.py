@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import AsyncIterator, Callable
+
+import orjson
+
+from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.interfaces.api.serialization import sale_row
+
+CSV_COLUMNS = (
+    "sale_id",
+    "client_id",
+    "created_at",
+    "product_id",
+    "quantity",
+    "unit_price",
+    "subtotal",
+    "currency",
+    "sale_total",
+)
+
+
+def sale_to_ndjson(sale: SaleAggregate) -> bytes:
+    return orjson.dumps(sale_row(sale)) + b"\n"
+
+
+def sale_to_csv_rows(sale: SaleAggregate) -> list[tuple[str | int, ...]]:
+    total = str(sale.total.amount)
+    created_at = sale.created_at.isoformat()
+    return [
+        (
+            sale.sale_id,
+            sale.client_id.value,
+            created_at,
+            line.product_id.value,
+            line.quantity,
+            str(line.unit_price.amount),
+            str(line.subtotal.amount),
+            line.unit_price.currency,
+            total,
+        )
+        for line in sale.lines
+    ]
+
+
+async def _chunked(
+    sales: AsyncIterator[SaleAggregate],
+    render: Callable[[list[SaleAggregate]], str | bytes],
+    chunk_size: int,
+) -> AsyncIterator[str | bytes]:
+    pending: list[SaleAggregate] = []
+    async for sale in sales:
+        pending.append(sale)
+        if len(pending) >= chunk_size:
+            yield render(pending)
+            pending = []
+    if pending:
+        yield render(pending)
+
+
+async def ndjson_stream(sales: AsyncIterator[SaleAggregate], chunk_size: int = 500) -> AsyncIterator[bytes]:
+    async for chunk in _chunked(sales, lambda batch: b"".join(sale_to_ndjson(sale) for sale in batch), chunk_size):
+        yield chunk
+
+
+async def csv_stream(sales: AsyncIterator[SaleAggregate], chunk_size: int = 500) -> AsyncIterator[str]:
+    def render(batch: list[SaleAggregate]) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for sale in batch:
+            writer.writerows(sale_to_csv_rows(sale))
+        return buffer.getvalue()
+
+    yield ",".join(CSV_COLUMNS) + "\r\n"
+    async for chunk in _chunked(sales, render, chunk_size):
+        yield chunk
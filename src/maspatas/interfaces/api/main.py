@@ -1,40 +1,88 @@
 from __future__ import annotations
 
+import csv
+import io
 import os
-from decimal import Decimal
+import tempfile
+from collections.abc import AsyncIterator, Awaitable, Iterator
+from functools import partial
+from datetime import datetime, timezone
+from typing import Literal, TypeVar
 
+import orjson
 import structlog
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, status
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import Response, StreamingResponse
 
 from maspatas.application.dto.client_dto import RegisterClientInputDTO
-from maspatas.application.dto.product_dto import RegisterProductInputDTO
-from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, SaleLineInputDTO
+from maspatas.application.dto.product_dto import CatalogRowDTO, RegisterProductInputDTO
+from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, SaleBatchResultDTO, SaleLineInputDTO
 from maspatas.application.services.authorization import AuthorizationService, Role
-from maspatas.application.use_cases.register_client import RegisterClientUseCase
-from maspatas.application.use_cases.register_product import RegisterProductUseCase
-from maspatas.application.use_cases.register_sale import RegisterSaleUseCase
+from maspatas.application.services.catalog_import import CATALOG_PARSERS, CatalogFormat, chunked
+from maspatas.application.services.idempotency import IdempotencyService, request_fingerprint
+from maspatas.application.use_cases.register_client import AsyncRegisterClientUseCase
+from maspatas.application.use_cases.register_product import AsyncImportCatalogUseCase, AsyncRegisterProductUseCase
+from maspatas.application.use_cases.register_sale import AsyncRegisterSalesBatchUseCase, AsyncRegisterSaleUseCase
 from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
-from maspatas.domain.exceptions.domain_exceptions import DomainError
+from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.exceptions.domain_exceptions import (
+    DeadlineExceededError,
+    DependencyUnavailableError,
+    DomainError,
+    IdempotencyConflictError,
+)
+from maspatas.domain.ports.pagination import Page
+from maspatas.domain.ports.reports import SalesGrouping
+from maspatas.domain.ports.rollups import RollupKind
+from maspatas.domain.ports.sale_filter import SaleFilter
 from maspatas.domain.value_objects.common import ClientId, ProductId
-from maspatas.infrastructure.db.mongo import get_mongo_database, seed_if_empty
+from maspatas.infrastructure.cache.bloom import BloomFilter
+from maspatas.infrastructure.cache.product_cache import AsyncCachedProductRepository
+from maspatas.infrastructure.cache.versions import CollectionVersions, MongoVersionRefresher
+from maspatas.infrastructure.db.indexes import ensure_mongo_indexes
+from maspatas.infrastructure.db.mongo import get_async_mongo_database, get_mongo_database, scan_ids, seed_if_empty
 from maspatas.infrastructure.logging.config import configure_logging
+from maspatas.infrastructure.reports.memory_reports import InMemorySalesReport, InMemorySalesRollups
+from maspatas.infrastructure.reports.mongo_reports import AsyncMongoSalesReport, AsyncMongoSalesRollups
+from maspatas.infrastructure.repositories.async_adapters import (
+    AsyncClientRepositoryAdapter,
+    AsyncInventoryRepositoryAdapter,
+    AsyncProductRepositoryAdapter,
+    AsyncSaleRepositoryAdapter,
+    AsyncSalesReportAdapter,
+    AsyncSalesRollupAdapter,
+)
+from maspatas.infrastructure.repositories.async_mongo_repositories import (
+    AsyncMongoClientRepository,
+    AsyncMongoInventoryRepository,
+    AsyncMongoProductRepository,
+    AsyncMongoSaleRepository,
+)
 from maspatas.infrastructure.repositories.memory_repositories import (
     InMemoryClientRepository,
     InMemoryInventoryRepository,
     InMemoryProductRepository,
     InMemorySaleRepository,
 )
-from maspatas.infrastructure.repositories.mongo_repositories import (
-    MongoClientRepository,
-    MongoInventoryRepository,
-    MongoProductRepository,
-    MongoSaleRepository,
-    parse_sale_datetime,
-)
-from maspatas.infrastructure.resilience.concurrency import InMemoryLockAdapter
-from maspatas.infrastructure.resilience.policy import ResiliencePolicy
+from maspatas.infrastructure.resilience.concurrency import AsyncInMemoryLockAdapter, AsyncLockBridge
+from maspatas.infrastructure.resilience.idempotency import InMemoryIdempotencyStore, MongoIdempotencyStore
+from maspatas.infrastructure.resilience.lease_locks import FileLockAdapter, MongoLeaseLockAdapter
+from maspatas.infrastructure.resilience.policy import DependencyLimits, ResiliencePolicy
 from maspatas.infrastructure.security.auth import get_current_role, issue_token
+from maspatas.interfaces.api.admission import AdmissionController, AIMDLimiter, RouteGroup, add_admission_control
+from maspatas.interfaces.api.conditional import etag_matches, not_modified, validator_headers
+from maspatas.interfaces.api.export import csv_stream, ndjson_stream
+from maspatas.interfaces.api.serialization import (
+    FastJSONResponse,
+    client_row,
+    fast_json,
+    inventory_row,
+    product_row,
+    report_row,
+    rollup_row,
+    sale_row,
+)
 from maspatas.interfaces.api.schemas import (
     RegisterClientRequest,
     RegisterClientResponse,
@@ -42,6 +90,8 @@ from maspatas.interfaces.api.schemas import (
     RegisterProductResponse,
     RegisterSaleRequest,
     RegisterSaleResponse,
+    RegisterSalesBatchRequest,
+    RegisterSalesBatchResponse,
 )
 from maspatas.interfaces.api.schemas import (
     AuthTokenRequest,
@@ -49,13 +99,16 @@ from maspatas.interfaces.api.schemas import (
     ClientResponse,
     InventoryItemResponse,
     ProductResponse,
-    SaleLineResponse,
     SaleResponse,
+    SalesReportRowResponse,
+    SalesRollupResponse,
 )
 
 configure_logging()
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
+
 app = FastAPI(title="MasPatas Inventory & Sales")
 
 
@@ -80,58 +133,207 @@ def custom_openapi() -> dict:
 app.openapi = custom_openapi
 
 backend = os.getenv("MASPATAS_REPOSITORY_BACKEND", "mongo").lower()
+bloom_expected_items = int(os.getenv("MASPATAS_BLOOM_EXPECTED_ITEMS", "100000"))
 
 if backend == "mongo":
-    mongo_db = get_mongo_database()
-    seed_if_empty(mongo_db)
+    sync_mongo_db = get_mongo_database()
+    seed_if_empty(sync_mongo_db)
+    ensure_mongo_indexes(sync_mongo_db)
+    mongo_db = get_async_mongo_database()
+    versions = CollectionVersions(epoch=mongo_db.name)
+    version_refresher = MongoVersionRefresher(
+        mongo_db,
+        versions,
+        refresh_seconds=float(os.getenv("MASPATAS_VERSION_REFRESH_SECONDS", "1")),
+    )
+
+    product_repo = AsyncMongoProductRepository(db=mongo_db, versions=versions)
+    client_repo = AsyncMongoClientRepository(db=mongo_db, versions=versions)
+    inventory_repo = AsyncMongoInventoryRepository(db=mongo_db, versions=versions)
+    sale_repo = AsyncMongoSaleRepository(db=mongo_db)
+    sales_reports = AsyncMongoSalesReport(db=mongo_db)
+    sales_rollups = AsyncMongoSalesRollups(db=mongo_db)
+    idempotency_store = MongoIdempotencyStore(db=mongo_db)
+    known_product_ids = BloomFilter.from_keys(scan_ids(sync_mongo_db, "products"), expected_items=bloom_expected_items)
+    known_client_ids = BloomFilter.from_keys(scan_ids(sync_mongo_db, "clients"), expected_items=bloom_expected_items)
+elif backend == "postgres":
+    from maspatas.infrastructure.cache.sqlalchemy_versions import SQLAlchemyVersionRefresher
+    from maspatas.infrastructure.db.bootstrap import create_database_if_not_exists, scan_ids as scan_sql_ids
+    from maspatas.infrastructure.db.bootstrap import seed_if_empty as seed_sql_if_empty
+    from maspatas.infrastructure.db.models import ClientModel, ProductModel
+    from maspatas.infrastructure.db.session import (
+        get_engine,
+        get_request_session,
+        get_session_factory,
+        init_db,
+        request_session_dependency,
+    )
+    from maspatas.infrastructure.reports.sqlalchemy_reports import SQLAlchemySalesReport, SQLAlchemySalesRollups
+    from maspatas.infrastructure.repositories.sqlalchemy_repositories import (
+        SQLAlchemyClientRepository,
+        SQLAlchemyInventoryRepository,
+        SQLAlchemyProductRepository,
+        SQLAlchemySaleRepository,
+    )
+
+    create_database_if_not_exists()
+    init_db()
+    sync_mongo_db = None
+    mongo_db = None
+    versions = CollectionVersions(epoch=get_engine().url.database)
+    version_refresher = SQLAlchemyVersionRefresher(
+        get_session_factory(),
+        versions,
+        refresh_seconds=float(os.getenv("MASPATAS_VERSION_REFRESH_SECONDS", "1")),
+    )
+    with get_session_factory()() as bootstrap_session:
+        seed_sql_if_empty(bootstrap_session)
+        known_product_ids = BloomFilter.from_keys(
+            scan_sql_ids(bootstrap_session, ProductModel), expected_items=bloom_expected_items
+        )
+        known_client_ids = BloomFilter.from_keys(
+            scan_sql_ids(bootstrap_session, ClientModel), expected_items=bloom_expected_items
+        )
 
-    product_repo = MongoProductRepository(db=mongo_db)
-    client_repo = MongoClientRepository(db=mongo_db)
-    inventory_repo = MongoInventoryRepository(db=mongo_db)
-    sale_repo = MongoSaleRepository(db=mongo_db)
+    app.router.dependencies.append(Depends(request_session_dependency))
+    session = get_request_session()
+    product_repo = AsyncProductRepositoryAdapter(SQLAlchemyProductRepository(session, versions), offload=True)
+    client_repo = AsyncClientRepositoryAdapter(SQLAlchemyClientRepository(session, versions), offload=True)
+    inventory_repo = AsyncInventoryRepositoryAdapter(SQLAlchemyInventoryRepository(session, versions), offload=True)
+    sale_repo = AsyncSaleRepositoryAdapter(SQLAlchemySaleRepository(session), offload=True)
+    sales_reports = AsyncSalesReportAdapter(SQLAlchemySalesReport(session), offload=True)
+    sales_rollups = AsyncSalesRollupAdapter(SQLAlchemySalesRollups(session), offload=True)
+    idempotency_store = InMemoryIdempotencyStore()
 else:
+    sync_mongo_db = None
     mongo_db = None
-    product_repo = InMemoryProductRepository.with_seed()
-    client_repo = InMemoryClientRepository.with_seed()
-    inventory_repo = InMemoryInventoryRepository(
+    versions = CollectionVersions()
+    version_refresher = None
+    memory_products = InMemoryProductRepository.with_seed(versions=versions)
+    memory_clients = InMemoryClientRepository.with_seed(versions=versions)
+    memory_inventory = InMemoryInventoryRepository(
         InventoryAggregate(
             items={
                 ProductId("P-001"): InventoryItem(product_id=ProductId("P-001"), stock=15),
                 ProductId("P-002"): InventoryItem(product_id=ProductId("P-002"), stock=8),
             }
-        )
+        ),
+        versions=versions,
     )
-    sale_repo = InMemorySaleRepository()
+    memory_sales = InMemorySaleRepository()
+
+    product_repo = AsyncProductRepositoryAdapter(memory_products)
+    client_repo = AsyncClientRepositoryAdapter(memory_clients)
+    inventory_repo = AsyncInventoryRepositoryAdapter(memory_inventory)
+    sale_repo = AsyncSaleRepositoryAdapter(memory_sales)
+    sales_reports = AsyncSalesReportAdapter(InMemorySalesReport(memory_sales))
+    sales_rollups = AsyncSalesRollupAdapter(InMemorySalesRollups())
+    idempotency_store = InMemoryIdempotencyStore()
+    known_product_ids = BloomFilter.from_keys(memory_products._products, expected_items=bloom_expected_items)  # noqa: SLF001
+    known_client_ids = BloomFilter.from_keys(memory_clients._clients, expected_items=bloom_expected_items)  # noqa: SLF001
+
+product_repo = AsyncCachedProductRepository(
+    product_repo,
+    ttl_seconds=float(os.getenv("MASPATAS_PRODUCT_CACHE_TTL_SECONDS", "300")),
+)
+
+lock_backend = os.getenv("MASPATAS_LOCK_BACKEND", "memory").lower()
+
+if lock_backend == "mongo" and sync_mongo_db is not None:
+    concurrency = AsyncLockBridge(MongoLeaseLockAdapter(db=sync_mongo_db))
+elif lock_backend == "file":
+    concurrency = AsyncLockBridge(FileLockAdapter(directory=os.getenv("MASPATAS_LOCK_DIR")))
+else:
+    concurrency = AsyncInMemoryLockAdapter()
 
-concurrency = InMemoryLockAdapter()
 authz = AuthorizationService()
-resilience = ResiliencePolicy()
+resilience = ResiliencePolicy(
+    default_limits=DependencyLimits(
+        max_concurrent=int(os.getenv("MASPATAS_BULKHEAD_MAX_CONCURRENT", "16")),
+        max_queue=int(os.getenv("MASPATAS_BULKHEAD_MAX_QUEUE", "32")),
+    )
+)
+idempotency = IdempotencyService(idempotency_store)
+request_timeout_seconds = float(os.getenv("MASPATAS_REQUEST_TIMEOUT_SECONDS", "5"))
+batch_timeout_seconds = float(os.getenv("MASPATAS_BATCH_TIMEOUT_SECONDS", "30"))
+import_spool_bytes = int(os.getenv("MASPATAS_IMPORT_SPOOL_BYTES", str(4 * 1024 * 1024)))
+max_products_per_request = 200
+default_page_size = 100
+max_page_size = 500
+export_batch_size = int(os.getenv("MASPATAS_EXPORT_BATCH_SIZE", "500"))
+columnar_batch_size = int(os.getenv("MASPATAS_COLUMNAR_BATCH_SIZE", "5000"))
+
+admission = AdmissionController(
+    groups=(
+        RouteGroup("sales_write", priority=0, methods=frozenset({"POST"}), prefixes=("/sales",)),
+        RouteGroup("sales_batch", priority=0, methods=frozenset({"POST"}), prefixes=("/sales/batch",)),
+        RouteGroup("catalog_write", priority=1, methods=frozenset({"POST"}), prefixes=("/products", "/clients", "/auth")),
+        RouteGroup("catalog_import", priority=1, methods=frozenset({"POST"}), prefixes=("/products/import",)),
+        RouteGroup(
+            "reads",
+            priority=2,
+            methods=frozenset({"GET"}),
+            prefixes=("/products", "/clients", "/inventory", "/sales"),
+        ),
+        RouteGroup("analytics", priority=2, methods=frozenset({"GET"}), prefixes=("/reports", "/sales/export")),
+    ),
+    limiter=AIMDLimiter(
+        initial_limit=float(os.getenv("MASPATAS_ADMISSION_INITIAL_LIMIT", "32")),
+        max_limit=float(os.getenv("MASPATAS_ADMISSION_MAX_LIMIT", "256")),
+        target_latency_seconds=float(os.getenv("MASPATAS_ADMISSION_TARGET_P99_MS", "250")) / 1000,
+    ),
+    isolated_limiters={
+        "sales_batch": AIMDLimiter(initial_limit=8, min_limit=1, max_limit=32, target_latency_seconds=batch_timeout_seconds),
+        "catalog_import": AIMDLimiter(initial_limit=2, min_limit=1, max_limit=8, target_latency_seconds=batch_timeout_seconds),
+        "analytics": AIMDLimiter(initial_limit=8, min_limit=1, max_limit=32, target_latency_seconds=request_timeout_seconds),
+    },
+)
+add_admission_control(app, admission)
 
-register_sale_use_case = RegisterSaleUseCase(
+register_sale_use_case = AsyncRegisterSaleUseCase(
     product_repo=product_repo,
     client_repo=client_repo,
     inventory_repo=inventory_repo,
     sale_repo=sale_repo,
     concurrency=concurrency,
     authz=authz,
+    rollups=sales_rollups,
+)
+
+import_catalog_use_case = AsyncImportCatalogUseCase(
+    product_repo=product_repo,
+    inventory_repo=inventory_repo,
+    authz=authz,
+    known_ids=known_product_ids,
+)
+
+register_sales_batch_use_case = AsyncRegisterSalesBatchUseCase(
+    product_repo=product_repo,
+    client_repo=client_repo,
+    inventory_repo=inventory_repo,
+    sale_repo=sale_repo,
+    authz=authz,
+    rollups=sales_rollups,
 )
 
-register_product_use_case = RegisterProductUseCase(
+register_product_use_case = AsyncRegisterProductUseCase(
     product_repo=product_repo,
     inventory_repo=inventory_repo,
     concurrency=concurrency,
     authz=authz,
+    known_ids=known_product_ids,
 )
 
-register_client_use_case = RegisterClientUseCase(
+register_client_use_case = AsyncRegisterClientUseCase(
     client_repo=client_repo,
     concurrency=concurrency,
     authz=authz,
+    known_ids=known_client_ids,
 )
 
 
 @app.post("/auth/token", response_model=AuthTokenResponse, tags=["Auth"])
-def generate_token(request: AuthTokenRequest) -> AuthTokenResponse:
+async def generate_token(request: AuthTokenRequest) -> AuthTokenResponse:
     token = issue_token(username=request.username, password=request.password)
     if token is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
@@ -139,66 +341,96 @@ def generate_token(request: AuthTokenRequest) -> AuthTokenResponse:
 
 
 @app.get("/health")
-def health() -> dict[str, str]:
+async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/health/locks")
+async def lock_metrics() -> dict[str, float | str]:
+    return {"backend": lock_backend, **concurrency.metrics.snapshot()}
+
+
+@app.get("/health/admission")
+async def admission_health() -> dict[str, object]:
+    return admission.snapshot()
+
+
+@app.get("/health/cache")
+async def cache_health() -> dict[str, dict[str, float]]:
+    return {
+        "products": product_repo.stats(),
+        "product_ids": known_product_ids.stats(),
+        "client_ids": known_client_ids.stats(),
+        "versions": versions.snapshot(),
+    }
+
+
+@app.get("/health/dependencies")
+async def dependency_health() -> dict[str, dict[str, object]]:
+    return resilience.snapshot()
+
+
+async def _load_page(pending: Awaitable[Page[T]]) -> Page[T]:
+    try:
+        return await pending
+    except DomainError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _page_response(rows: list[dict], page: Page, etag: str) -> FastJSONResponse:
+    headers = validator_headers(etag)
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return fast_json(rows, headers=headers)
+
+
+async def _entity_tag(collection: str) -> str:
+    if version_refresher is None:
+        return versions.entity_tag(collection)
+    return await version_refresher.entity_tag(collection)
+
+
 @app.get("/products", response_model=list[ProductResponse], tags=["Products"])
-def list_products() -> list[ProductResponse]:
-    if mongo_db is None:
-        products = product_repo._products.values()  # noqa: SLF001
-        return [
-            ProductResponse(
-                id=product.id.value,
-                name=product.name,
-                sku=product.sku,
-                price_amount=str(product.price.amount),
-                currency=product.price.currency,
-            )
-            for product in products
-        ]
-
-    docs = mongo_db.products.find({})
-    return [
-        ProductResponse(
-            id=product["id"],
-            name=product["name"],
-            sku=product["sku"],
-            price_amount=str(Decimal(product["price_amount"])),
-            currency=product["price_currency"],
+async def list_products(
+    ids: str | None = Query(default=None, description="Ids separados por coma, p. ej. P-001,P-002"),
+    limit: int = Query(default=default_page_size, ge=1, le=max_page_size),
+    after: str | None = Query(default=None, description="Cursor devuelto en X-Next-Cursor"),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> Response:
+    etag = await _entity_tag("products")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if ids is not None:
+        product_ids = [ProductId(value.strip()) for value in ids.split(",") if value.strip()]
+        if len(product_ids) > max_products_per_request:
+            raise HTTPException(status_code=400, detail=f"Máximo {max_products_per_request} productos por consulta")
+        products = await product_repo.get_many(product_ids)
+        return fast_json(
+            [product_row(products[product_id]) for product_id in dict.fromkeys(product_ids) if product_id in products],
+            headers=validator_headers(etag),
         )
-        for product in docs
-    ]
 
+    page = await _load_page(product_repo.list_page(limit, after))
+    return _page_response([product_row(product) for product in page.items], page, etag)
 
-@app.get("/products/{product_id}", response_model=ProductResponse, tags=["Products"])
-def get_product(product_id: str) -> ProductResponse:
-    if mongo_db is None:
-        product = product_repo.get_by_id(ProductId(product_id))
-        if not product:
-            raise HTTPException(status_code=404, detail="Producto no encontrado")
-        return ProductResponse(
-            id=product.id.value,
-            name=product.name,
-            sku=product.sku,
-            price_amount=str(product.price.amount),
-            currency=product.price.currency,
-        )
 
-    product = mongo_db.products.find_one({"_id": product_id})
+@app.get("/products/{product_id}", response_model=ProductResponse, tags=["Products"])
+async def get_product(product_id: str, if_none_match: str | None = Header(default=None, alias="If-None-Match")) -> Response:
+    try:
+        entity_id = ProductId(product_id)
+    except DomainError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    etag = await _entity_tag("products")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    product = await product_repo.get_by_id(entity_id)
     if not product:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
-    return ProductResponse(
-        id=product["id"],
-        name=product["name"],
-        sku=product["sku"],
-        price_amount=str(Decimal(product["price_amount"])),
-        currency=product["price_currency"],
-    )
+    return fast_json(product_row(product), headers=validator_headers(etag))
 
 
 @app.post("/products", response_model=RegisterProductResponse, tags=["Products"])
-def register_product(
+async def register_product(
     request: RegisterProductRequest,
     role: Role = Depends(get_current_role),
 ) -> RegisterProductResponse:
@@ -211,9 +443,19 @@ def register_product(
             currency=request.currency,
             initial_stock=request.initial_stock,
         )
-        result = resilience.protected_call(lambda: register_product_use_case.execute(dto, role), timeout_seconds=5)
+        result = await resilience.protected_call_async(
+            lambda: register_product_use_case.execute(dto, role),
+            timeout_seconds=request_timeout_seconds,
+            dependency="register_product",
+        )
         logger.info("product_registered", product_id=result.product_id, role=role.value)
         return RegisterProductResponse(**result.__dict__)
+    except DeadlineExceededError as exc:
+        logger.warning("deadline_exceeded", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc)) from exc
+    except DependencyUnavailableError as exc:
+        logger.warning("dependency_unavailable", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
     except DomainError as exc:
         logger.warning("domain_error", detail=str(exc), role=role.value)
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -222,8 +464,68 @@ def register_product(
         raise HTTPException(status_code=500, detail="Error interno") from exc
 
 
+def _import_event(event: str, **fields: object) -> bytes:
+    return orjson.dumps({"event": event, **fields}) + b"\n"
+
+
+async def _catalog_import_events(
+    text: io.TextIOWrapper,
+    rows: Iterator[CatalogRowDTO],
+    role: Role,
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    processed = imported = failed = 0
+    try:
+        for chunk in chunked(rows, chunk_size):
+            result = await resilience.protected_call_async(
+                partial(import_catalog_use_case.execute, chunk, role),
+                timeout_seconds=batch_timeout_seconds,
+                dependency="import_catalog",
+            )
+            processed += result.processed
+            imported += result.imported
+            failed += len(result.errors)
+            for error in result.errors:
+                yield _import_event("error", line=error.line, product_id=error.product_id, error=error.error)
+            yield _import_event("progress", processed=processed, imported=imported, failed=failed)
+    except (DomainError, UnicodeDecodeError, csv.Error) as exc:
+        detail = "El archivo debe estar codificado en UTF-8" if isinstance(exc, UnicodeDecodeError) else str(exc)
+        logger.warning("catalog_import_aborted", detail=detail, processed=processed, role=role.value)
+        yield _import_event("aborted", processed=processed, imported=imported, failed=failed, error=detail)
+        return
+    except Exception as exc:  # noqa: BLE001
+        logger.error("catalog_import_aborted", detail=str(exc), processed=processed, role=role.value)
+        yield _import_event("aborted", processed=processed, imported=imported, failed=failed, error="Error interno")
+        return
+    finally:
+        text.close()
+    logger.info("catalog_imported", processed=processed, imported=imported, failed=failed, role=role.value)
+    yield _import_event("done", processed=processed, imported=imported, failed=failed)
+
+
+@app.post("/products/import", tags=["Products"])
+async def import_catalog(
+    request: Request,
+    format: CatalogFormat = Query(default="csv"),
+    chunk_size: int = Query(default=1000, ge=1, le=5000),
+    role: Role = Depends(get_current_role),
+) -> StreamingResponse:
+    try:
+        authz.ensure_permission(role, "manage_inventory")
+    except DomainError as exc:
+        logger.warning("domain_error", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    spool = tempfile.SpooledTemporaryFile(max_size=import_spool_bytes)
+    async for block in request.stream():
+        spool.write(block)
+    spool.seek(0)
+    text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+    rows = CATALOG_PARSERS[format](text)
+    return StreamingResponse(_catalog_import_events(text, rows, role, chunk_size), media_type="application/x-ndjson")
+
+
 @app.post("/clients", response_model=RegisterClientResponse, tags=["Clients"])
-def register_client(
+async def register_client(
     request: RegisterClientRequest,
     role: Role = Depends(get_current_role),
 ) -> RegisterClientResponse:
@@ -233,9 +535,19 @@ def register_client(
             full_name=request.full_name,
             email=request.email,
         )
-        result = resilience.protected_call(lambda: register_client_use_case.execute(dto, role), timeout_seconds=5)
+        result = await resilience.protected_call_async(
+            lambda: register_client_use_case.execute(dto, role),
+            timeout_seconds=request_timeout_seconds,
+            dependency="register_client",
+        )
         logger.info("client_registered", client_id=result.client_id, role=role.value)
         return RegisterClientResponse(**result.__dict__)
+    except DeadlineExceededError as exc:
+        logger.warning("deadline_exceeded", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc)) from exc
+    except DependencyUnavailableError as exc:
+        logger.warning("dependency_unavailable", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
     except DomainError as exc:
         logger.warning("domain_error", detail=str(exc), role=role.value)
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -245,141 +557,238 @@ def register_client(
 
 
 @app.get("/clients", response_model=list[ClientResponse], tags=["Clients"])
-def list_clients() -> list[ClientResponse]:
-    if mongo_db is None:
-        return [
-            ClientResponse(id=client.id.value, full_name=client.full_name, email=client.email)
-            for client in client_repo._clients.values()  # noqa: SLF001
-        ]
-
-    docs = mongo_db.clients.find({})
-    return [ClientResponse(id=client["id"], full_name=client["full_name"], email=client["email"]) for client in docs]
+async def list_clients(
+    limit: int = Query(default=default_page_size, ge=1, le=max_page_size),
+    after: str | None = Query(default=None, description="Cursor devuelto en X-Next-Cursor"),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> Response:
+    etag = await _entity_tag("clients")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    page = await _load_page(client_repo.list_page(limit, after))
+    return _page_response([client_row(client) for client in page.items], page, etag)
 
 
 @app.get("/clients/{client_id}", response_model=ClientResponse, tags=["Clients"])
-def get_client(client_id: str) -> ClientResponse:
-    if mongo_db is None:
-        client = client_repo.get_by_id(client_id=ClientId(client_id))
-        if not client:
-            raise HTTPException(status_code=404, detail="Cliente no encontrado")
-        return ClientResponse(id=client.id.value, full_name=client.full_name, email=client.email)
-
-    client = mongo_db.clients.find_one({"_id": client_id})
+async def get_client(client_id: str, if_none_match: str | None = Header(default=None, alias="If-None-Match")) -> Response:
+    try:
+        entity_id = ClientId(client_id)
+    except DomainError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    etag = await _entity_tag("clients")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    client = await client_repo.get_by_id(entity_id)
     if not client:
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
-    return ClientResponse(id=client["id"], full_name=client["full_name"], email=client["email"])
+    return fast_json(client_row(client), headers=validator_headers(etag))
 
 
 @app.get("/inventory", response_model=list[InventoryItemResponse], tags=["Inventory"])
-def get_inventory() -> list[InventoryItemResponse]:
-    inventory = inventory_repo.get_inventory()
-    return [InventoryItemResponse(product_id=item.product_id.value, stock=item.stock) for item in inventory.items.values()]
+async def get_inventory(if_none_match: str | None = Header(default=None, alias="If-None-Match")) -> Response:
+    etag = await _entity_tag("inventory")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    inventory = await inventory_repo.get_inventory()
+    return fast_json([inventory_row(item) for item in inventory.items.values()], headers=validator_headers(etag))
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
 
 
 @app.get("/sales", response_model=list[SaleResponse], tags=["Sales"])
-def list_sales() -> list[SaleResponse]:
-    if mongo_db is None:
-        return [
-            SaleResponse(
-                sale_id=sale.sale_id,
-                client_id=sale.client_id.value,
-                created_at=sale.created_at.isoformat(),
-                total_amount=str(sale.total.amount),
-                currency=sale.total.currency,
-                lines=[
-                    SaleLineResponse(
-                        product_id=line.product_id.value,
-                        quantity=line.quantity,
-                        unit_price=str(line.unit_price.amount),
-                        subtotal=str(line.subtotal.amount),
-                    )
-                    for line in sale.lines
-                ],
-            )
-            for sale in sale_repo.sales
-        ]
-
-    sales_docs = mongo_db.sales.find({})
-    return [
-        SaleResponse(
-            sale_id=sale["sale_id"],
-            client_id=sale["client_id"],
-            created_at=parse_sale_datetime(sale["created_at"]).isoformat(),
-            total_amount=str(Decimal(sale["total_amount"])),
-            currency=sale["currency"],
-            lines=[
-                SaleLineResponse(
-                    product_id=line["product_id"],
-                    quantity=line["quantity"],
-                    unit_price=str(Decimal(line["unit_price_amount"])),
-                    subtotal=str(Decimal(line["unit_price_amount"]) * line["quantity"]),
-                )
-                for line in sale["lines"]
-            ],
+async def list_sales(
+    limit: int = Query(default=default_page_size, ge=1, le=max_page_size),
+    after: str | None = Query(default=None, description="Cursor devuelto en X-Next-Cursor"),
+    client_id: str | None = Query(default=None, min_length=1),
+    product_id: str | None = Query(default=None, min_length=1),
+    created_from: datetime | None = Query(default=None, alias="from", description="Inicio inclusivo (ISO 8601, UTC por defecto)"),
+    created_to: datetime | None = Query(default=None, alias="to", description="Fin exclusivo (ISO 8601, UTC por defecto)"),
+) -> FastJSONResponse:
+    try:
+        filters = SaleFilter(
+            client_id=ClientId(client_id) if client_id else None,
+            product_id=ProductId(product_id) if product_id else None,
+            created_from=_as_utc(created_from),
+            created_to=_as_utc(created_to),
         )
-        for sale in sales_docs
-    ]
+    except DomainError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    page = await _load_page(sale_repo.list_page(limit, after, filters))
+    headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+    return fast_json([sale_row(sale) for sale in page.items], headers=headers)
 
 
-@app.get("/sales/{sale_id}", response_model=SaleResponse, tags=["Sales"])
-def get_sale(sale_id: str) -> SaleResponse:
-    if mongo_db is None:
-        sale = next((record for record in sale_repo.sales if record.sale_id == sale_id), None)
-        if not sale:
-            raise HTTPException(status_code=404, detail="Venta no encontrada")
-        return SaleResponse(
-            sale_id=sale.sale_id,
-            client_id=sale.client_id.value,
-            created_at=sale.created_at.isoformat(),
-            total_amount=str(sale.total.amount),
-            currency=sale.total.currency,
-            lines=[
-                SaleLineResponse(
-                    product_id=line.product_id.value,
-                    quantity=line.quantity,
-                    unit_price=str(line.unit_price.amount),
-                    subtotal=str(line.subtotal.amount),
-                )
-                for line in sale.lines
-            ],
+def _columnar_export(sales: AsyncIterator[SaleAggregate], format: Literal["arrow", "parquet"]) -> StreamingResponse:
+    try:
+        from maspatas.infrastructure.analytics import columnar
+    except ImportError as exc:
+        raise HTTPException(
+            status_code=501,
+            detail="La exportación columnar requiere instalar maspatas-inventario[analytics]",
+        ) from exc
+    if format == "arrow":
+        return StreamingResponse(
+            columnar.arrow_stream(sales, chunk_size=columnar_batch_size),
+            media_type=columnar.ARROW_STREAM_MEDIA_TYPE,
+            headers={"Content-Disposition": 'attachment; filename="ventas.arrows"'},
+        )
+    return StreamingResponse(
+        columnar.parquet_stream(sales, chunk_size=columnar_batch_size),
+        media_type=columnar.PARQUET_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="ventas.parquet"'},
+    )
+
+
+@app.get("/sales/export", tags=["Sales"])
+async def export_sales(
+    format: Literal["ndjson", "csv", "arrow", "parquet"] = Query(default="ndjson"),
+    created_from: datetime | None = Query(default=None, alias="from", description="Inicio inclusivo (ISO 8601, UTC por defecto)"),
+    created_to: datetime | None = Query(default=None, alias="to", description="Fin exclusivo (ISO 8601, UTC por defecto)"),
+) -> StreamingResponse:
+    sales = sale_repo.iter_sales(_as_utc(created_from), _as_utc(created_to), batch_size=export_batch_size)
+    if format in ("arrow", "parquet"):
+        return _columnar_export(sales, format)
+    if format == "csv":
+        return StreamingResponse(
+            csv_stream(sales, chunk_size=export_batch_size),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="ventas.csv"'},
+        )
+    return StreamingResponse(ndjson_stream(sales, chunk_size=export_batch_size), media_type="application/x-ndjson")
+
+
+@app.get("/reports/sales/{grouping}", response_model=list[SalesReportRowResponse], tags=["Reports"])
+async def sales_report(
+    grouping: SalesGrouping,
+    created_from: datetime | None = Query(default=None, alias="from", description="Inicio inclusivo (ISO 8601, UTC por defecto)"),
+    created_to: datetime | None = Query(default=None, alias="to", description="Fin exclusivo (ISO 8601, UTC por defecto)"),
+) -> FastJSONResponse:
+    try:
+        rows = await resilience.protected_call_async(
+            lambda: sales_reports.sales_report(grouping, _as_utc(created_from), _as_utc(created_to)),
+            timeout_seconds=request_timeout_seconds,
+            dependency="sales_reports",
         )
+    except DeadlineExceededError as exc:
+        logger.warning("deadline_exceeded", detail=str(exc), report=grouping)
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc)) from exc
+    except DependencyUnavailableError as exc:
+        logger.warning("dependency_unavailable", detail=str(exc), report=grouping)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+    return fast_json([report_row(row) for row in rows])
+
+
+@app.get("/reports/rollups/{kind}", response_model=list[SalesRollupResponse], tags=["Reports"])
+async def sales_rollup_report(
+    kind: RollupKind,
+    period_from: str | None = Query(default=None, alias="from", description="Periodo inicial inclusivo: AAAA-MM-DD o AAAA-MM"),
+    period_to: str | None = Query(default=None, alias="to", description="Periodo final exclusivo: AAAA-MM-DD o AAAA-MM"),
+    key: str | None = Query(default=None, description="Id de producto o cliente"),
+) -> FastJSONResponse:
+    rollups = await sales_rollups.read(kind, period_from, period_to, key)
+    return fast_json([rollup_row(rollup) for rollup in rollups])
+
 
-    sale = mongo_db.sales.find_one({"_id": sale_id})
+@app.get("/sales/{sale_id}", response_model=SaleResponse, tags=["Sales"])
+async def get_sale(sale_id: str) -> FastJSONResponse:
+    sale = await sale_repo.get_by_id(sale_id)
     if not sale:
         raise HTTPException(status_code=404, detail="Venta no encontrada")
-    return SaleResponse(
-        sale_id=sale["sale_id"],
-        client_id=sale["client_id"],
-        created_at=parse_sale_datetime(sale["created_at"]).isoformat(),
-        total_amount=str(Decimal(sale["total_amount"])),
-        currency=sale["currency"],
-        lines=[
-            SaleLineResponse(
-                product_id=line["product_id"],
-                quantity=line["quantity"],
-                unit_price=str(Decimal(line["unit_price_amount"])),
-                subtotal=str(Decimal(line["unit_price_amount"]) * line["quantity"]),
-            )
-            for line in sale["lines"]
-        ],
+    return fast_json(sale_row(sale))
+
+
+def _sale_input(request: RegisterSaleRequest) -> RegisterSaleInputDTO:
+    return RegisterSaleInputDTO(
+        sale_id=request.sale_id,
+        client_id=request.client_id,
+        lines=tuple(SaleLineInputDTO(product_id=line.product_id, quantity=line.quantity) for line in request.lines),
     )
 
 
+def _batch_payload(results: list[SaleBatchResultDTO]) -> dict:
+    registered = sum(1 for result in results if result.sale is not None)
+    return {
+        "registered": registered,
+        "rejected": len(results) - registered,
+        "results": [
+            {"sale_id": result.sale_id, "sale": result.sale.__dict__ if result.sale else None, "error": result.error}
+            for result in results
+        ],
+    }
+
+
 @app.post("/sales", response_model=RegisterSaleResponse)
-def register_sale(
+async def register_sale(
     request: RegisterSaleRequest,
     role: Role = Depends(get_current_role),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
 ) -> RegisterSaleResponse:
     try:
-        dto = RegisterSaleInputDTO(
-            sale_id=request.sale_id,
-            client_id=request.client_id,
-            lines=tuple(SaleLineInputDTO(product_id=line.product_id, quantity=line.quantity) for line in request.lines),
-        )
+        dto = _sale_input(request)
 
-        result = resilience.protected_call(lambda: register_sale_use_case.execute(dto, role), timeout_seconds=5)
-        logger.info("sale_registered", sale_id=result.sale_id, total=result.total_amount, currency=result.currency, role=role.value)
-        return RegisterSaleResponse(**result.__dict__)
+        async def execute() -> dict:
+            result = await resilience.protected_call_async(
+                lambda: register_sale_use_case.execute(dto, role),
+                timeout_seconds=request_timeout_seconds,
+                dependency="register_sale",
+            )
+            logger.info("sale_registered", sale_id=result.sale_id, total=result.total_amount, currency=result.currency, role=role.value)
+            return result.__dict__
+
+        key = idempotency_key or f"sale:{request.sale_id}"
+        return RegisterSaleResponse(**await idempotency.run(key, request_fingerprint(request.model_dump()), execute))
+    except IdempotencyConflictError as exc:
+        logger.warning("idempotency_conflict", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except DeadlineExceededError as exc:
+        logger.warning("deadline_exceeded", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc)) from exc
+    except DependencyUnavailableError as exc:
+        logger.warning("dependency_unavailable", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+    except DomainError as exc:
+        logger.warning("domain_error", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:  # noqa: BLE001
+        logger.error("unexpected_error", detail=str(exc))
+        raise HTTPException(status_code=500, detail="Error interno") from exc
+
+
+@app.post("/sales/batch", response_model=RegisterSalesBatchResponse)
+async def register_sales_batch(
+    request: RegisterSalesBatchRequest,
+    role: Role = Depends(get_current_role),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
+) -> RegisterSalesBatchResponse:
+    try:
+        dtos = tuple(_sale_input(sale) for sale in request.sales)
+
+        async def execute() -> dict:
+            results = await resilience.protected_call_async(
+                lambda: register_sales_batch_use_case.execute(dtos, role),
+                timeout_seconds=batch_timeout_seconds,
+                dependency="register_sales_batch",
+            )
+            payload = _batch_payload(results)
+            logger.info("sales_batch_registered", registered=payload["registered"], rejected=payload["rejected"], role=role.value)
+            return payload
+
+        if idempotency_key is None:
+            return RegisterSalesBatchResponse(**await execute())
+        return RegisterSalesBatchResponse(**await idempotency.run(idempotency_key, request_fingerprint(request.model_dump()), execute))
+    except IdempotencyConflictError as exc:
+        logger.warning("idempotency_conflict", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except DeadlineExceededError as exc:
+        logger.warning("deadline_exceeded", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc)) from exc
+    except DependencyUnavailableError as exc:
+        logger.warning("dependency_unavailable", detail=str(exc), role=role.value)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
     except DomainError as exc:
         logger.warning("domain_error", detail=str(exc), role=role.value)
         raise HTTPException(status_code=400, detail=str(exc)) from exc
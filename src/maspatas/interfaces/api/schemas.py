@@ -20,6 +20,22 @@ class RegisterSaleResponse(BaseModel):
     currency: str
 
 
+class RegisterSalesBatchRequest(BaseModel):
+    sales: list[RegisterSaleRequest] = Field(min_length=1, max_length=500)
+
+
+class SaleBatchResultResponse(BaseModel):
+    sale_id: str
+    sale: RegisterSaleResponse | None = None
+    error: str | None = None
+
+
+class RegisterSalesBatchResponse(BaseModel):
+    registered: int
+    rejected: int
+    results: list[SaleBatchResultResponse]
+
+
 class AuthTokenRequest(BaseModel):
     username: str = Field(min_length=1)
     password: str = Field(min_length=1)
@@ -93,3 +109,20 @@ class SaleResponse(BaseModel):
     total_amount: str
     currency: str
     lines: list[SaleLineResponse]
+
+
+class SalesReportRowResponse(BaseModel):
+    key: str
+    currency: str
+    revenue: str
+    units: int
+    sales: int
+
+
+class SalesRollupResponse(BaseModel):
+    key: str
+    period: str
+    currency: str
+    units: int
+    revenue: str
+    sales: int
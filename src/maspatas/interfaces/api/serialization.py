@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+from maspatas.domain.entities.client import Client
+from maspatas.domain.entities.inventory import InventoryItem
+from maspatas.domain.entities.product import Product
+from maspatas.domain.entities.sale import SaleAggregate
+from maspatas.domain.ports.reports import SalesReportRow
+from maspatas.domain.ports.rollups import SalesRollup
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def fast_json(content: Any, headers: Mapping[str, str] | None = None) -> FastJSONResponse:
+    return FastJSONResponse(content=content, headers=dict(headers) if headers else None)
+
+
+def product_row(product: Product) -> dict[str, str]:
+    return {
+        "id": product.id.value,
+        "name": product.name,
+        "sku": product.sku,
+        "price_amount": str(product.price.amount),
+        "currency": product.price.currency,
+    }
+
+
+def client_row(client: Client) -> dict[str, str]:
+    return {"id": client.id.value, "full_name": client.full_name, "email": client.email}
+
+
+def inventory_row(item: InventoryItem) -> dict[str, str | int]:
+    return {"product_id": item.product_id.value, "stock": item.stock}
+
+
+def sale_row(sale: SaleAggregate) -> dict[str, Any]:
+    lines = []
+    total = None
+    for line in sale.lines:
+        subtotal = line.subtotal
+        total = subtotal if total is None else total + subtotal
+        lines.append(
+            {
+                "product_id": line.product_id.value,
+                "quantity": line.quantity,
+                "unit_price": str(line.unit_price.amount),
+                "subtotal": str(subtotal.amount),
+            }
+        )
+    return {
+        "sale_id": sale.sale_id,
+        "client_id": sale.client_id.value,
+        "created_at": sale.created_at.isoformat(),
+        "total_amount": str(total.amount),
+        "currency": total.currency,
+        "lines": lines,
+    }
+
+
+def report_row(row: SalesReportRow) -> dict[str, str | int]:
+    return {"key": row.key, "currency": row.currency, "revenue": str(row.revenue), "units": row.units, "sales": row.sales}
+
+
+def rollup_row(rollup: SalesRollup) -> dict[str, str | int]:
+    return {
+        "key": rollup.key,
+        "period": rollup.period,
+        "currency": rollup.currency,
+        "units": rollup.units,
+        "revenue": str(rollup.revenue),
+        "sales": rollup.sales,
+    }
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import structlog
+
+from maspatas.application.services.authorization import AuthorizationService, Role
+from maspatas.application.services.catalog_import import CATALOG_PARSERS, chunked
+from maspatas.application.use_cases.register_product import ImportCatalogUseCase
+from maspatas.infrastructure.db.indexes import ensure_mongo_indexes
+from maspatas.infrastructure.db.mongo import get_mongo_database
+from maspatas.infrastructure.logging.config import configure_logging
+from maspatas.infrastructure.repositories.mongo_repositories import MongoInventoryRepository, MongoProductRepository
+
+logger = structlog.get_logger(__name__)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Importa un catálogo de productos con stock inicial desde CSV o NDJSON")
+    parser.add_argument("path", type=Path, help="Archivo .csv o .ndjson")
+    parser.add_argument("--format", choices=sorted(CATALOG_PARSERS), help="Por defecto se deduce de la extensión")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Filas validadas y escritas por bloque")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    catalog_format = args.format or ("ndjson" if args.path.suffix.lower() in (".ndjson", ".jsonl") else "csv")
+    db = get_mongo_database()
+    ensure_mongo_indexes(db)
+    use_case = ImportCatalogUseCase(MongoProductRepository(db), MongoInventoryRepository(db), AuthorizationService())
+
+    processed = imported = failed = 0
+    with args.path.open(encoding="utf-8-sig", newline="") as handle:
+        for chunk in chunked(CATALOG_PARSERS[catalog_format](handle), args.chunk_size):
+            result = use_case.execute(chunk, Role.ADMIN)
+            processed += result.processed
+            imported += result.imported
+            failed += len(result.errors)
+            for error in result.errors:
+                logger.warning("catalog_row_rejected", line=error.line, product_id=error.product_id, error=error.error)
+            logger.info("catalog_import_progress", processed=processed, imported=imported, failed=failed)
+    logger.info("catalog_imported", path=str(args.path), processed=processed, imported=imported, failed=failed)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import replace
+from datetime import timedelta
+
+import structlog
+from pymongo import DESCENDING
+
+from maspatas.application.services.rollup_rebuild import RollupRebuilder
+from maspatas.infrastructure.db.indexes import MONGO_INDEXES, ensure_mongo_indexes
+from maspatas.infrastructure.db.mongo import get_mongo_database
+from maspatas.infrastructure.logging.config import configure_logging
+from maspatas.infrastructure.reports.mongo_reports import ROLLUPS_COLLECTION, MongoSalesRollups
+from maspatas.infrastructure.repositories.mongo_repositories import SALE_ORDER, MongoSaleRepository, parse_sale_datetime
+
+logger = structlog.get_logger(__name__)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Recalcula los rollups de ventas a partir de la colección sales")
+    parser.add_argument("--chunk-days", type=int, default=7, help="Días de ventas por bloque")
+    parser.add_argument("--workers", type=int, default=4, help="Bloques procesados en paralelo")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documentos por lote del cursor")
+    parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        default=60,
+        help="Margen antes de la última venta para las que aún se están guardando; debe superar el timeout de las peticiones",
+    )
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    db = get_mongo_database()
+    first = db.sales.find_one({}, {"created_at": 1}, sort=SALE_ORDER)
+    last = db.sales.find_one({}, {"created_at": 1}, sort=[("created_at", DESCENDING), ("_id", DESCENDING)])
+    if first is None or last is None:
+        logger.info("rollups_rebuild_skipped", reason="sin ventas")
+        return 0
+
+    staging = f"{ROLLUPS_COLLECTION}_rebuild"
+    db.drop_collection(staging)
+    rollup_indexes = [index for index in MONGO_INDEXES if index.collection == ROLLUPS_COLLECTION]
+    ensure_mongo_indexes(db, [replace(index, collection=staging) for index in rollup_indexes])
+    rebuilder = RollupRebuilder(
+        MongoSaleRepository(db),
+        MongoSalesRollups(db, collection=staging),
+        chunk=timedelta(days=args.chunk_days),
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
+
+    def swap() -> MongoSalesRollups:
+        db[staging].rename(ROLLUPS_COLLECTION, dropTarget=True)
+        return MongoSalesRollups(db)
+
+    sales = rebuilder.rebuild_and_swap(
+        parse_sale_datetime(first["created_at"]),
+        parse_sale_datetime(last["created_at"]) - timedelta(seconds=args.settle_seconds),
+        swap,
+    )
+    logger.info("rollups_rebuilt", sales=sales, chunk_days=args.chunk_days, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import io
+import json
 import os
 
 os.environ.setdefault("MASPATAS_REPOSITORY_BACKEND", "memory")
 
+import pytest
 from fastapi.testclient import TestClient
 
+from maspatas.interfaces.api import main
 from maspatas.interfaces.api.main import app
 
 
@@ -154,6 +158,55 @@ def test_register_product_endpoint_unauthorized_for_seller() -> None:
     assert response.status_code == 400
 
 
+def test_catalog_import_streams_progress_and_row_errors() -> None:
+    body = (
+        "product_id,name,sku,price_amount,currency,initial_stock\n"
+        "P-300,Collar,SKU-300,99.90,MXN,7\n"
+        "P-301,Correa,SKU-300,49.90,MXN,0\n"
+        "P-302,Plato,SKU-302,no-es-precio,MXN,0\n"
+    )
+
+    response = client.post(
+        "/products/import",
+        params={"format": "csv"},
+        headers={"Authorization": "Bearer inventory-token", "Content-Type": "text/csv"},
+        content=body.encode(),
+    )
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    errors = {event["line"]: event["error"] for event in events if event["event"] == "error"}
+    assert errors == {3: "El SKU SKU-300 está repetido en el archivo", 4: "Precio inválido: no-es-precio"}
+    assert events[-1] == {"event": "done", "processed": 3, "imported": 1, "failed": 2}
+    assert client.get("/products/P-300").status_code == 200
+    stock = {item["product_id"]: item["stock"] for item in client.get("/inventory").json()}
+    assert stock["P-300"] == 7
+
+
+
+def test_catalog_import_reports_unexpected_storage_errors_as_aborted(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def failing(rows, role):
+        raise RuntimeError("write concern timeout")
+
+    monkeypatch.setattr(main.import_catalog_use_case, "execute", failing)
+
+    response = client.post(
+        "/products/import",
+        params={"format": "csv"},
+        headers={"Authorization": "Bearer inventory-token", "Content-Type": "text/csv"},
+        content=b"product_id,name,sku,price_amount\nP-310,Arena,SKU-310,20.00\n",
+    )
+
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[-1]) == {
+        "event": "aborted",
+        "processed": 0,
+        "imported": 0,
+        "failed": 0,
+        "error": "Error interno",
+    }
+
+
 def test_register_client_endpoint_ok() -> None:
     response = client.post(
         "/clients",
@@ -185,3 +238,182 @@ def test_register_client_endpoint_unauthorized_for_inventory() -> None:
     )
 
     assert response.status_code == 400
+
+
+def test_repeated_sale_is_not_registered_twice() -> None:
+    sale = {"sale_id": "S-103", "client_id": "C-001", "lines": [{"product_id": "P-002", "quantity": 1}]}
+    headers = {"Authorization": "Bearer seller-token"}
+    stock_before = next(item["stock"] for item in client.get("/inventory").json() if item["product_id"] == "P-002")
+
+    first = client.post("/sales", headers=headers, json=sale)
+    second = client.post("/sales", headers=headers, json=sale)
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    stock_after = next(item["stock"] for item in client.get("/inventory").json() if item["product_id"] == "P-002")
+    assert stock_after == stock_before - 1
+
+
+def test_idempotency_key_reused_with_other_payload_conflicts() -> None:
+    headers = {"Authorization": "Bearer seller-token", "Idempotency-Key": "pos-1-ticket-7"}
+    first = client.post(
+        "/sales",
+        headers=headers,
+        json={"sale_id": "S-104", "client_id": "C-001", "lines": [{"product_id": "P-001", "quantity": 1}]},
+    )
+    second = client.post(
+        "/sales",
+        headers=headers,
+        json={"sale_id": "S-105", "client_id": "C-001", "lines": [{"product_id": "P-001", "quantity": 1}]},
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+
+
+def test_admission_control_reports_route_groups() -> None:
+    client.get("/inventory")
+
+    response = client.get("/health/admission")
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["groups"]["reads"]["admitted"] >= 1
+    assert payload["groups"]["sales_write"]["priority"] == 0
+
+
+def test_products_multi_get_keeps_requested_order() -> None:
+    response = client.get("/products", params={"ids": "P-002,P-001,P-999"})
+
+    assert response.status_code == 200
+    assert [product["id"] for product in response.json()] == ["P-002", "P-001"]
+
+
+def test_blank_product_or_client_id_is_a_bad_request() -> None:
+    product = client.get("/products/%20")
+    customer = client.get("/clients/%20")
+
+    assert product.status_code == 400
+    assert customer.status_code == 400
+    assert product.json()["detail"] == "ProductId no puede estar vacío"
+
+
+def test_product_list_is_keyset_paginated() -> None:
+    first = client.get("/products", params={"limit": 1})
+    assert first.status_code == 200
+    assert len(first.json()) == 1
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/products", params={"limit": 1, "after": cursor})
+    assert second.status_code == 200
+    assert second.json()[0]["id"] > first.json()[0]["id"]
+
+    assert client.get("/products", params={"after": "no-es-un-cursor"}).status_code == 400
+
+
+def test_sales_export_streams_ndjson_and_csv() -> None:
+    client.post(
+        "/sales",
+        headers={"Authorization": "Bearer seller-token"},
+        json={"sale_id": "S-106", "client_id": "C-001", "lines": [{"product_id": "P-001", "quantity": 1}]},
+    )
+
+    ndjson = client.get("/sales/export")
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    sales = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert any(sale["sale_id"] == "S-106" for sale in sales)
+
+    csv_export = client.get("/sales/export", params={"format": "csv"})
+    assert csv_export.status_code == 200
+    assert csv_export.text.splitlines()[0].startswith("sale_id,client_id,created_at")
+
+    future = client.get("/sales/export", params={"from": "2999-01-01T00:00:00"})
+    assert future.text == ""
+
+
+def test_sales_export_streams_parquet() -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    client.post(
+        "/sales",
+        headers={"Authorization": "Bearer seller-token"},
+        json={"sale_id": "S-108", "client_id": "C-001", "lines": [{"product_id": "P-001", "quantity": 1}]},
+    )
+
+    response = client.get("/sales/export", params={"format": "parquet"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/vnd.apache.parquet")
+    table = pq.read_table(io.BytesIO(response.content))
+    assert "S-108" in table.column("sale_id").to_pylist()
+
+
+def test_sales_batch_reports_each_sale() -> None:
+    response = client.post(
+        "/sales/batch",
+        headers={"Authorization": "Bearer seller-token"},
+        json={
+            "sales": [
+                {"sale_id": "S-120", "client_id": "C-001", "lines": [{"product_id": "P-001", "quantity": 1}]},
+                {"sale_id": "S-121", "client_id": "C-404", "lines": [{"product_id": "P-001", "quantity": 1}]},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert (payload["registered"], payload["rejected"]) == (1, 1)
+    assert payload["results"][0]["sale"]["sale_id"] == "S-120"
+    assert payload["results"][1] == {"sale_id": "S-121", "sale": None, "error": "Cliente no encontrado"}
+    assert client.get("/sales/S-120").status_code == 200
+
+
+def test_inventory_conditional_get_until_a_sale_changes_stock() -> None:
+    first = client.get("/inventory")
+    etag = first.headers["ETag"]
+
+    cached = client.get("/inventory", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    client.post(
+        "/sales",
+        headers={"Authorization": "Bearer seller-token"},
+        json={"sale_id": "S-107", "client_id": "C-001", "lines": [{"product_id": "P-002", "quantity": 1}]},
+    )
+
+    refreshed = client.get("/inventory", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert client.get("/products", headers={"If-None-Match": client.get("/products").headers["ETag"]}).status_code == 304
+
+
+def test_sales_report_groups_revenue_by_product() -> None:
+    client.post(
+        "/sales",
+        headers={"Authorization": "Bearer seller-token"},
+        json={"sale_id": "S-108", "client_id": "C-001", "lines": [{"product_id": "P-001", "quantity": 1}]},
+    )
+
+    response = client.get("/reports/sales/product")
+    assert response.status_code == 200
+    rows = {row["key"]: row for row in response.json()}
+    assert rows["P-001"]["sales"] >= 1
+    assert rows["P-001"]["currency"] == "MXN"
+    assert client.get("/reports/sales/week").status_code == 422
+
+
+def test_rollup_report_reads_daily_product_counters() -> None:
+    client.post(
+        "/sales",
+        headers={"Authorization": "Bearer seller-token"},
+        json={"sale_id": "S-109", "client_id": "C-001", "lines": [{"product_id": "P-001", "quantity": 2}]},
+    )
+
+    response = client.get("/reports/rollups/product_day", params={"key": "P-001"})
+    assert response.status_code == 200
+    assert sum(row["units"] for row in response.json()) >= 2
+    monthly = client.get("/reports/rollups/client_month", params={"key": "C-001"}).json()
+    assert all(len(row["period"]) == 7 for row in monthly)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import datetime, timezone
+
+os.environ.setdefault("MASPATAS_REPOSITORY_BACKEND", "memory")
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import Select, create_engine, event, select, update  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, SaleLineInputDTO  # noqa: E402
+from maspatas.application.services.authorization import AuthorizationService, Role  # noqa: E402
+from maspatas.application.use_cases.register_sale import RegisterSaleUseCase  # noqa: E402
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation, InsufficientStockError  # noqa: E402
+from maspatas.domain.value_objects.common import ProductId  # noqa: E402
+from maspatas.infrastructure.cache.sqlalchemy_versions import SQLAlchemyVersionRefresher  # noqa: E402
+from maspatas.infrastructure.cache.versions import CollectionVersions  # noqa: E402
+from maspatas.infrastructure.db.bootstrap import seed_if_empty  # noqa: E402
+from maspatas.infrastructure.db.models import Base, CollectionVersionModel, InventoryModel  # noqa: E402
+from maspatas.infrastructure.repositories.async_adapters import AsyncSaleRepositoryAdapter  # noqa: E402
+from maspatas.infrastructure.repositories.sqlalchemy_repositories import (  # noqa: E402
+    SQLAlchemyClientRepository,
+    SQLAlchemyInventoryRepository,
+    SQLAlchemyProductRepository,
+    SQLAlchemySaleRepository,
+)
+from maspatas.infrastructure.resilience.concurrency import InMemoryLockAdapter  # noqa: E402
+from maspatas.interfaces.api import main  # noqa: E402
+
+client = TestClient(main.app)
+
+
+def _postgres_functions(connection, _) -> None:
+    # SQLite no trae set_config (statement_timeout) ni clock_timestamp (sello del inventario).
+    connection.create_function("set_config", 3, lambda *args: args[1])
+    connection.create_function("clock_timestamp", 0, lambda: datetime.now(timezone.utc).replace(tzinfo=None).isoformat(" "))
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", _postgres_functions)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def session(session_factory):
+    with session_factory() as session:
+        seed_if_empty(session)
+        yield session
+
+
+def test_get_sale_reads_through_the_sqlalchemy_repository(session, monkeypatch: pytest.MonkeyPatch) -> None:
+    sale_repo = AsyncSaleRepositoryAdapter(SQLAlchemySaleRepository(session), offload=True)
+    monkeypatch.setattr(main, "sale_repo", sale_repo)
+    monkeypatch.setattr(main.register_sale_use_case, "_sale_repo", sale_repo)
+
+    created = client.post(
+        "/sales",
+        headers={"Authorization": "Bearer seller-token"},
+        json={"sale_id": "S-SQL-1", "client_id": "C-001", "lines": [{"product_id": "P-001", "quantity": 2}]},
+    )
+    found = client.get("/sales/S-SQL-1")
+
+    assert created.status_code == 200
+    assert found.status_code == 200
+    assert found.json()["lines"] == [{"product_id": "P-001", "quantity": 2, "unit_price": "550.00", "subtotal": "1100.00"}]
+    assert client.get("/sales/S-SQL-404").status_code == 404
+
+
+def test_duplicated_sale_is_rejected_and_its_stock_restored(session) -> None:
+    inventory_repo = SQLAlchemyInventoryRepository(session)
+    use_case = RegisterSaleUseCase(
+        product_repo=SQLAlchemyProductRepository(session),
+        client_repo=SQLAlchemyClientRepository(session),
+        inventory_repo=inventory_repo,
+        sale_repo=SQLAlchemySaleRepository(session),
+        concurrency=InMemoryLockAdapter(),
+        authz=AuthorizationService(),
+    )
+    dto = RegisterSaleInputDTO(sale_id="S-DUP", client_id="C-001", lines=(SaleLineInputDTO(product_id="P-001", quantity=3),))
+    use_case.execute(dto, Role.VENDEDOR)
+
+    with pytest.raises(BusinessRuleViolation, match="Ya existe una venta con id S-DUP"):
+        use_case.execute(dto, Role.VENDEDOR)
+
+    assert inventory_repo.get_items([ProductId("P-001")]).get_item(ProductId("P-001")).stock == 12
+
+
+def test_stock_changes_move_the_inventory_etag_without_a_shared_version_row(session, session_factory) -> None:
+    versions = CollectionVersions(epoch="test")
+    refresher = SQLAlchemyVersionRefresher(session_factory, versions, refresh_seconds=3600)
+    inventory_repo = SQLAlchemyInventoryRepository(session, versions)
+    before = asyncio.run(refresher.entity_tag("inventory"))
+
+    inventory_repo.decrease_stock({ProductId("P-001"): 1})
+    after_sale = asyncio.run(refresher.entity_tag("inventory"))
+    inventory_repo.increase_stock({ProductId("P-002"): 1})
+
+    assert after_sale != before
+    assert asyncio.run(refresher.entity_tag("inventory")) != after_sale
+    assert session.scalars(select(CollectionVersionModel)).all() == []
+
+
+def test_missed_guarded_decrease_fails_even_if_stock_is_restored_before_the_second_read(
+    session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inventory_repo = SQLAlchemyInventoryRepository(session)
+    execute = session.execute
+
+    def restore_before_reading(statement, *args, **kwargs):
+        if isinstance(statement, Select):
+            execute(update(InventoryModel).where(InventoryModel.product_id == "P-001").values(stock=100))
+        return execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(session, "execute", restore_before_reading)
+
+    with pytest.raises(InsufficientStockError, match="P-001"):
+        inventory_repo.decrease_stock({ProductId("P-001"): 20})
+
+    monkeypatch.undo()
+    assert inventory_repo.get_items([ProductId("P-001")]).get_item(ProductId("P-001")).stock == 15
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from maspatas.interfaces.api.admission import AdmissionController, AIMDLimiter, RouteGroup
+
+SALES_WRITE = RouteGroup("sales_write", priority=0, methods=frozenset({"POST"}), prefixes=("/sales",))
+READS = RouteGroup("reads", priority=2, methods=frozenset({"GET"}), prefixes=("/sales",))
+SALES_BATCH = RouteGroup("sales_batch", priority=0, methods=frozenset({"POST"}), prefixes=("/sales/batch",))
+
+
+def test_limit_backs_off_on_slow_responses_and_grows_on_fast_ones() -> None:
+    now = [0.0]
+    limiter = AIMDLimiter(initial_limit=10, min_limit=2, target_latency_seconds=0.1, clock=lambda: now[0])
+
+    limiter.on_sample(0.5)
+    assert limiter.limit == 9
+    limiter.on_sample(0.5)
+    assert limiter.limit == 9
+
+    now[0] = 1.0
+    limiter.on_sample(0.5)
+    assert limiter.limit < 9
+
+    reduced = limiter.limit
+    limiter.on_sample(0.01)
+    assert limiter.limit > reduced
+
+
+def test_low_priority_requests_are_shed_before_sales() -> None:
+    controller = AdmissionController(groups=(SALES_WRITE, READS), limiter=AIMDLimiter(initial_limit=5, min_limit=1))
+
+    assert controller.classify("POST", "/sales") == SALES_WRITE
+    assert controller.classify("GET", "/sales/S-1") == READS
+    assert controller.classify("GET", "/health") is None
+
+    admitted_reads = 0
+    while controller.try_acquire(READS):
+        admitted_reads += 1
+
+    assert admitted_reads == 3
+    assert controller.try_acquire(SALES_WRITE)
+    assert controller.try_acquire(SALES_WRITE)
+    assert not controller.try_acquire(SALES_WRITE)
+    assert controller.snapshot()["groups"]["reads"]["shed"] == 1
+
+
+def test_slow_batches_use_their_own_limit_and_do_not_throttle_reads() -> None:
+    controller = AdmissionController(
+        groups=(SALES_WRITE, SALES_BATCH, READS),
+        limiter=AIMDLimiter(initial_limit=10, min_limit=2, target_latency_seconds=0.25, clock=lambda: 0.0),
+        isolated_limiters={"sales_batch": AIMDLimiter(initial_limit=2, min_limit=1, target_latency_seconds=30, backoff=0.5)},
+    )
+
+    assert controller.classify("POST", "/sales/batch") == SALES_BATCH
+    assert controller.classify("POST", "/sales") == SALES_WRITE
+    for _ in range(20):
+        assert controller.try_acquire(SALES_BATCH)
+        controller.release(SALES_BATCH, 45.0)
+
+    assert controller.limiter.limit == 10
+    assert controller.limiter_for(SALES_BATCH).limit == 1
+    assert sum(controller.try_acquire(READS) for _ in range(6)) == 6
+    assert controller.try_acquire(SALES_BATCH)
+    assert not controller.try_acquire(SALES_BATCH)
+    assert controller.in_flight == 6
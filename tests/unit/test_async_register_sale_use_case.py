@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+
+from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, SaleLineInputDTO
+from maspatas.application.services.authorization import AuthorizationService, Role
+from maspatas.application.use_cases.register_sale import AsyncRegisterSaleUseCase
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation
+from maspatas.domain.value_objects.common import ProductId
+from maspatas.infrastructure.repositories.async_adapters import (
+    AsyncClientRepositoryAdapter,
+    AsyncInventoryRepositoryAdapter,
+    AsyncProductRepositoryAdapter,
+    AsyncSaleRepositoryAdapter,
+)
+from maspatas.infrastructure.repositories.memory_repositories import (
+    InMemoryClientRepository,
+    InMemoryInventoryRepository,
+    InMemoryProductRepository,
+    InMemorySaleRepository,
+)
+from maspatas.infrastructure.resilience.concurrency import AsyncInMemoryLockAdapter
+
+
+def _build_use_case(inventory_repo: InMemoryInventoryRepository, offload: bool = False) -> AsyncRegisterSaleUseCase:
+    return AsyncRegisterSaleUseCase(
+        product_repo=AsyncProductRepositoryAdapter(InMemoryProductRepository.with_seed(), offload=offload),
+        client_repo=AsyncClientRepositoryAdapter(InMemoryClientRepository.with_seed(), offload=offload),
+        inventory_repo=AsyncInventoryRepositoryAdapter(inventory_repo, offload=offload),
+        sale_repo=AsyncSaleRepositoryAdapter(InMemorySaleRepository(), offload=offload),
+        concurrency=AsyncInMemoryLockAdapter(),
+        authz=AuthorizationService(),
+    )
+
+
+def _inventory(stock: int) -> InMemoryInventoryRepository:
+    return InMemoryInventoryRepository(
+        InventoryAggregate(items={ProductId("P-001"): InventoryItem(product_id=ProductId("P-001"), stock=stock)})
+    )
+
+
+def _dto(sale_id: str, quantity: int = 1) -> RegisterSaleInputDTO:
+    return RegisterSaleInputDTO(
+        sale_id=sale_id,
+        client_id="C-001",
+        lines=(SaleLineInputDTO(product_id="P-001", quantity=quantity),),
+    )
+
+
+def test_async_register_sale_successfully() -> None:
+    use_case = _build_use_case(_inventory(10))
+
+    output = asyncio.run(use_case.execute(_dto("S-A1", quantity=2), role=Role.VENDEDOR))
+
+    assert output.sale_id == "S-A1"
+    assert output.total_amount == "1100.00"
+
+
+def test_async_register_sale_fails_when_stock_is_insufficient() -> None:
+    use_case = _build_use_case(_inventory(1))
+
+    try:
+        asyncio.run(use_case.execute(_dto("S-A2", quantity=2), role=Role.VENDEDOR))
+    except BusinessRuleViolation as exc:
+        assert "Stock insuficiente" in str(exc)
+    else:
+        raise AssertionError("Se esperaba error por stock insuficiente")
+
+
+def test_async_register_sale_many_in_flight_never_oversell() -> None:
+    inventory_repo = _inventory(5)
+    use_case = _build_use_case(inventory_repo, offload=True)
+
+    async def _run() -> list[object]:
+        return await asyncio.gather(
+            *(use_case.execute(_dto(f"S-A{index}"), role=Role.VENDEDOR) for index in range(100, 120)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(_run())
+
+    assert sum(not isinstance(result, Exception) for result in results) == 5
+    assert inventory_repo.get_inventory().get_item(ProductId("P-001")).stock == 0
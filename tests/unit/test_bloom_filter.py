@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from maspatas.application.dto.client_dto import RegisterClientInputDTO
+from maspatas.application.services.authorization import AuthorizationService, Role
+from maspatas.application.use_cases.register_client import RegisterClientUseCase
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation
+from maspatas.infrastructure.cache.bloom import BloomFilter
+from maspatas.infrastructure.repositories.memory_repositories import InMemoryClientRepository
+from maspatas.infrastructure.resilience.concurrency import InMemoryLockAdapter
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives() -> None:
+    bloom = BloomFilter.from_keys((f"P-{index}" for index in range(5_000)), expected_items=5_000, false_positive_rate=0.01)
+
+    assert all(bloom.might_contain(f"P-{index}") for index in range(5_000))
+    false_positives = sum(bloom.might_contain(f"X-{index}") for index in range(10_000))
+    assert false_positives / 10_000 < 0.03
+
+    stats = bloom.stats()
+    assert stats["items"] == 5_000
+    assert stats["memory_bytes"] < 8_000
+    assert 0.005 < stats["estimated_false_positive_rate"] < 0.02
+
+
+def test_register_client_skips_lookup_when_filter_rules_out_the_id() -> None:
+    class CountingClientRepository(InMemoryClientRepository):
+        def __init__(self) -> None:
+            super().__init__(InMemoryClientRepository.with_seed()._clients)  # noqa: SLF001
+            self.reads = 0
+
+        def get_by_id(self, client_id):
+            self.reads += 1
+            return super().get_by_id(client_id)
+
+    client_repo = CountingClientRepository()
+    known_ids = BloomFilter.from_keys(["C-001"], expected_items=1_000)
+    use_case = RegisterClientUseCase(
+        client_repo=client_repo,
+        concurrency=InMemoryLockAdapter(),
+        authz=AuthorizationService(),
+        known_ids=known_ids,
+    )
+
+    use_case.execute(RegisterClientInputDTO(client_id="C-500", full_name="Luis Díaz", email="luis@cliente.com"), role=Role.VENDEDOR)
+    assert client_repo.reads == 0
+    assert known_ids.might_contain("C-500")
+
+    try:
+        use_case.execute(RegisterClientInputDTO(client_id="C-500", full_name="Luis Díaz", email="luis@cliente.com"), role=Role.VENDEDOR)
+    except BusinessRuleViolation as exc:
+        assert "Ya existe un cliente" in str(exc)
+    else:
+        raise AssertionError("Se esperaba cliente duplicado")
+    assert client_repo.reads == 1
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from maspatas.application.services.authorization import AuthorizationService, Role
+from maspatas.application.services.catalog_import import chunked, csv_catalog_rows, ndjson_catalog_rows
+from maspatas.application.use_cases.register_product import ImportCatalogUseCase
+from maspatas.domain.entities.product import Product
+from maspatas.domain.exceptions.domain_exceptions import UnauthorizedOperationError
+from maspatas.domain.value_objects.common import Money, ProductId
+from maspatas.infrastructure.repositories.memory_repositories import InMemoryInventoryRepository, InMemoryProductRepository
+from maspatas.infrastructure.repositories.mongo_repositories import rejected_products
+
+
+def test_parsers_report_line_numbers_and_malformed_rows() -> None:
+    csv_rows = list(
+        csv_catalog_rows(
+            [
+                "product_id,name,sku,price_amount\n",
+                "P-200,Arnés,SKU-200,150.00\n",
+                "P-201,,SKU-201,10\n",
+            ]
+        )
+    )
+    ndjson_rows = list(
+        ndjson_catalog_rows(
+            [
+                '{"product_id": "P-202", "name": "Cama", "sku": "SKU-202", "price_amount": "300", "initial_stock": 2}\n',
+                "\n",
+                "{no es json\n",
+            ]
+        )
+    )
+
+    assert csv_rows[0].product.currency == "MXN"
+    assert (csv_rows[1].line, csv_rows[1].error) == (3, "Faltan campos obligatorios: name")
+    assert ndjson_rows[0].product.initial_stock == 2
+    assert (ndjson_rows[1].line, ndjson_rows[1].error) == (3, "JSON inválido")
+
+
+def test_initial_stock_must_be_a_whole_number() -> None:
+    rows = list(
+        ndjson_catalog_rows(
+            [
+                '{"product_id": "P-203", "name": "Plato", "sku": "SKU-203", "price_amount": "50", "initial_stock": 2.9}\n',
+                '{"product_id": "P-204", "name": "Collar", "sku": "SKU-204", "price_amount": "90", "initial_stock": true}\n',
+                '{"product_id": "P-205", "name": "Correa", "sku": "SKU-205", "price_amount": "70", "initial_stock": 3.0}\n',
+            ]
+        )
+    )
+
+    assert [row.error for row in rows[:2]] == ["initial_stock debe ser entero: 2.9", "initial_stock debe ser entero: True"]
+    assert rows[2].product.initial_stock == 3
+
+
+def test_chunked_keeps_order_and_rejects_empty_chunks() -> None:
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        list(chunked([], 0))
+
+
+def test_import_saves_new_products_and_reports_conflicts_per_row() -> None:
+    product_repo = InMemoryProductRepository.with_seed()
+    inventory_repo = InMemoryInventoryRepository()
+    use_case = ImportCatalogUseCase(product_repo, inventory_repo, AuthorizationService())
+    rows = list(
+        csv_catalog_rows(
+            [
+                "product_id,name,sku,price_amount,currency,initial_stock\n",
+                "P-200,Arnés,SKU-200,150.00,MXN,4\n",
+                "P-001,Duplicado,SKU-999,1.00,MXN,0\n",
+                "P-201,Juguete,SKU-201,-5,MXN,0\n",
+                "P-202,Cepillo,SKU-202,80.00,MXN,-1\n",
+            ]
+        )
+    )
+
+    result = use_case.execute(rows, Role.INVENTARIO)
+
+    assert (result.processed, result.imported) == (4, 1)
+    assert [(error.line, error.product_id) for error in result.errors] == [(3, "P-001"), (4, "P-201"), (5, "P-202")]
+    assert result.errors[0].error == "Ya existe un producto con id P-001"
+    assert product_repo.get_by_id(ProductId("P-200")) is not None
+    assert inventory_repo.get_inventory().get_item(ProductId("P-200")).stock == 4
+
+    with pytest.raises(UnauthorizedOperationError):
+        use_case.execute(rows, Role.VENDEDOR)
+
+
+def test_mongo_write_errors_other_than_duplicates_are_reported_per_row() -> None:
+    products = [
+        Product(id=ProductId(f"P-30{index}"), name="Arena", sku=f"SKU-30{index}", price=Money(Decimal("1.00")))
+        for index in range(3)
+    ]
+    exc = BulkWriteError(
+        {
+            "writeErrors": [
+                {"index": 0, "code": 11000, "keyPattern": {"sku": 1}},
+                {"index": 2, "code": 121, "errmsg": "Document failed validation"},
+            ]
+        }
+    )
+
+    assert rejected_products(exc, products) == {
+        "P-300": "Ya existe un producto con SKU SKU-300",
+        "P-302": "No se pudo guardar el producto P-302: Document failed validation",
+    }
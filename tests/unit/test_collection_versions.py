@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from maspatas.infrastructure.cache.versions import CollectionVersions
+from maspatas.interfaces.api.conditional import etag_matches
+
+
+def test_versions_only_move_forward() -> None:
+    versions = CollectionVersions(epoch="e1")
+
+    assert versions.bump("products") == 1
+    assert versions.observe("products", 7) == 7
+    assert versions.observe("products", 3) == 7
+    assert versions.current("clients") == 0
+    assert versions.entity_tag("products") == '"products.e1.7"'
+
+
+def test_if_none_match_accepts_lists_weak_tags_and_wildcard() -> None:
+    etag = '"inventory.e1.2"'
+
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"inventory.e1.1"', etag)
+    assert not etag_matches(None, etag)
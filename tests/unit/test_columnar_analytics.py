@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+np = pytest.importorskip("numpy")
+
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine  # noqa: E402
+from maspatas.domain.value_objects.common import ClientId, Money, ProductId  # noqa: E402
+from maspatas.infrastructure.analytics.columnar import arrow_stream, parquet_stream, sales_table  # noqa: E402
+from maspatas.infrastructure.analytics.vectorized import (  # noqa: E402
+    abc_classification,
+    basket_size_distribution,
+    hourly_heatmap,
+    top_sellers,
+)
+from maspatas.infrastructure.reports.memory_reports import aggregate_sales  # noqa: E402
+
+
+def _line(product_id: str, quantity: int, amount: str) -> SaleLine:
+    return SaleLine(product_id=ProductId(product_id), quantity=quantity, unit_price=Money(Decimal(amount)))
+
+
+SALES = [
+    SaleAggregate(
+        sale_id="S-1",
+        client_id=ClientId("C-001"),
+        lines=(_line("P-001", 2, "40.00"), _line("P-002", 1, "10.00")),
+        created_at=datetime(2025, 3, 3, 9, 15, tzinfo=timezone.utc),
+    ),
+    SaleAggregate(
+        sale_id="S-2",
+        client_id=ClientId("C-002"),
+        lines=(_line("P-001", 1, "40.00"), _line("P-003", 1, "5.00")),
+        created_at=datetime(2025, 3, 3, 9, 45, tzinfo=timezone.utc),
+    ),
+    SaleAggregate(
+        sale_id="S-3",
+        client_id=ClientId("C-001"),
+        lines=(_line("P-004", 3, "2.00"),),
+        created_at=datetime(2025, 3, 8, 18, 0, tzinfo=timezone.utc),
+    ),
+]
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+async def _sales():
+    for sale in SALES:
+        yield sale
+
+
+def test_table_flattens_one_row_per_sale_line() -> None:
+    table = sales_table(SALES, chunk_size=2)
+
+    assert table.num_rows == 5
+    assert table.column("sale_id").to_pylist() == ["S-1", "S-1", "S-2", "S-2", "S-3"]
+    assert table.column("subtotal").to_pylist()[0] == Decimal("80.00")
+
+
+def test_arrow_and_parquet_streams_round_trip() -> None:
+    expected = sales_table(SALES)
+
+    from_arrow = pa.ipc.open_stream(asyncio.run(_collect(arrow_stream(_sales(), chunk_size=2)))).read_all()
+    parquet = pq.ParquetFile(io.BytesIO(asyncio.run(_collect(parquet_stream(_sales(), chunk_size=2)))))
+
+    assert from_arrow.equals(expected)
+    assert parquet.num_row_groups == 2
+    assert parquet.read().equals(expected)
+
+
+
+def test_amounts_beyond_the_column_scale_are_rounded_instead_of_breaking_the_stream() -> None:
+    sale = SaleAggregate(
+        sale_id="S-9",
+        client_id=ClientId("C-001"),
+        lines=(_line("P-001", 3, "0.123456"),),
+        created_at=datetime(2025, 3, 3, 9, 15, tzinfo=timezone.utc),
+    )
+
+    async def one_sale():
+        yield sale
+
+    table = pa.ipc.open_stream(asyncio.run(_collect(arrow_stream(one_sale())))).read_all()
+
+    assert table.column("unit_price").to_pylist() == [Decimal("0.1235")]
+    assert table.column("subtotal").to_pylist() == [Decimal("0.3704")]
+
+
+def test_top_sellers_match_the_per_document_report() -> None:
+    expected = sorted(aggregate_sales(SALES, "product"), key=lambda row: (-row.revenue, row.key))
+
+    rows = top_sellers(sales_table(SALES), limit=2)
+
+    assert [(row.key, row.revenue, row.units, row.sales) for row in rows] == [
+        (row.key, row.revenue, row.units, row.sales) for row in expected[:2]
+    ]
+    assert top_sellers(sales_table(SALES), limit=1, by="units")[0].key == "P-001"
+
+
+def test_abc_classification_uses_cumulative_revenue_share() -> None:
+    classes = abc_classification(sales_table(SALES))
+
+    assert classes == {"P-001": "A", "P-002": "B", "P-004": "B", "P-003": "C"}
+
+
+def test_basket_sizes_and_hourly_heatmap() -> None:
+    table = sales_table(SALES)
+
+    heatmap = hourly_heatmap(table)
+
+    assert basket_size_distribution(table) == {2: 1, 3: 2}
+    assert heatmap.shape == (7, 24)
+    assert heatmap[0, 9] == pytest.approx(135.0)
+    assert heatmap[5, 18] == pytest.approx(6.0)
+    assert heatmap.sum() == pytest.approx(141.0)
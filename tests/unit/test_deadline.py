@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, SaleLineInputDTO
+from maspatas.application.services.authorization import AuthorizationService, Role
+from maspatas.application.use_cases.register_sale import RegisterSaleUseCase
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
+from maspatas.domain.exceptions.domain_exceptions import DeadlineExceededError
+from maspatas.domain.services.deadline import current_deadline, deadline_scope, remaining_seconds
+from maspatas.domain.value_objects.common import ProductId
+from maspatas.infrastructure.repositories.memory_repositories import (
+    InMemoryClientRepository,
+    InMemoryInventoryRepository,
+    InMemoryProductRepository,
+    InMemorySaleRepository,
+)
+from maspatas.infrastructure.resilience.concurrency import InMemoryLockAdapter
+from maspatas.infrastructure.resilience.policy import ResiliencePolicy
+
+
+def test_nested_deadline_scope_keeps_the_tighter_deadline() -> None:
+    assert current_deadline() is None
+
+    with deadline_scope(0.5) as outer:
+        with deadline_scope(10) as inner:
+            assert inner is outer
+            assert remaining_seconds() <= 0.5
+
+    assert current_deadline() is None
+
+
+def test_protected_call_works_from_worker_threads() -> None:
+    policy = ResiliencePolicy()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda value: policy.protected_call(lambda: value * 2, timeout_seconds=0.5), range(4)))
+
+    assert results == [0, 2, 4, 6]
+
+
+def test_register_sale_stops_between_lines_when_deadline_expires() -> None:
+    inventory_repo = InMemoryInventoryRepository(
+        InventoryAggregate(items={ProductId("P-001"): InventoryItem(product_id=ProductId("P-001"), stock=10)})
+    )
+    use_case = RegisterSaleUseCase(
+        product_repo=InMemoryProductRepository.with_seed(),
+        client_repo=InMemoryClientRepository.with_seed(),
+        inventory_repo=inventory_repo,
+        sale_repo=InMemorySaleRepository(),
+        concurrency=InMemoryLockAdapter(),
+        authz=AuthorizationService(),
+    )
+
+    try:
+        with deadline_scope(0.01):
+            time.sleep(0.02)
+            use_case.execute(
+                RegisterSaleInputDTO(
+                    sale_id="S-D1",
+                    client_id="C-001",
+                    lines=(SaleLineInputDTO(product_id="P-001", quantity=1),),
+                ),
+                role=Role.VENDEDOR,
+            )
+    except DeadlineExceededError as exc:
+        assert "Tiempo máximo excedido" in str(exc)
+    else:
+        raise AssertionError("Se esperaba deadline excedido")
+
+    assert inventory_repo.get_inventory().get_item(ProductId("P-001")).stock == 10
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import multiprocessing
+from pathlib import Path
+
+from maspatas.domain.exceptions.domain_exceptions import LockTimeoutError
+from maspatas.infrastructure.resilience.lease_locks import FileLockAdapter
+
+
+def _hold_lock(directory: str, held, release) -> None:  # type: ignore[no-untyped-def]
+    adapter = FileLockAdapter(directory=directory)
+    with adapter.lock("sale:S-1"):
+        held.set()
+        release.wait(5)
+
+
+def test_file_lock_is_exclusive_across_processes(tmp_path: Path) -> None:
+    context = multiprocessing.get_context("fork")
+    held = context.Event()
+    release = context.Event()
+    process = context.Process(target=_hold_lock, args=(str(tmp_path), held, release))
+    process.start()
+    try:
+        assert held.wait(5)
+        adapter = FileLockAdapter(directory=tmp_path)
+        try:
+            with adapter.lock("sale:S-1", timeout=0.1):
+                raise AssertionError("No se esperaba adquirir el bloqueo")
+        except LockTimeoutError:
+            pass
+        assert adapter.metrics.timeouts == 1
+    finally:
+        release.set()
+        process.join(5)
+
+    with adapter.lock("sale:S-1", timeout=1):
+        pass
+    assert adapter.metrics.acquisitions == 1
+
+
+def test_file_lock_many_releases_every_stripe(tmp_path: Path) -> None:
+    adapter = FileLockAdapter(directory=tmp_path, stripes=8)
+
+    with adapter.lock_many(["product:P-001", "product:P-002", "product:P-003"]):
+        pass
+
+    with adapter.lock_many(["product:P-003", "product:P-001"], timeout=0.1):
+        pass
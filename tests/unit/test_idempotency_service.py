@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from maspatas.application.services.idempotency import IdempotencyService, request_fingerprint
+from maspatas.domain.exceptions.domain_exceptions import IdempotencyConflictError
+from maspatas.infrastructure.cache.ttl_lru import TTLCache
+from maspatas.infrastructure.resilience.idempotency import InMemoryIdempotencyStore
+
+
+def test_repeated_key_returns_stored_result_without_running_again() -> None:
+    service = IdempotencyService(InMemoryIdempotencyStore())
+    calls: list[int] = []
+
+    async def operation() -> dict:
+        calls.append(1)
+        return {"sale_id": "S-1"}
+
+    async def scenario() -> tuple[dict, dict]:
+        fingerprint = request_fingerprint({"sale_id": "S-1"})
+        return await service.run("sale:S-1", fingerprint, operation), await service.run("sale:S-1", fingerprint, operation)
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second == {"sale_id": "S-1"}
+    assert len(calls) == 1
+
+
+def test_in_flight_duplicate_is_rejected() -> None:
+    service = IdempotencyService(InMemoryIdempotencyStore())
+    release = asyncio.Event()
+
+    async def slow_operation() -> dict:
+        await release.wait()
+        return {"sale_id": "S-2"}
+
+    async def scenario() -> None:
+        first = asyncio.create_task(service.run("sale:S-2", "abc", slow_operation))
+        await asyncio.sleep(0)
+        with pytest.raises(IdempotencyConflictError):
+            await service.run("sale:S-2", "abc", slow_operation)
+        release.set()
+        await first
+
+    asyncio.run(scenario())
+
+
+def test_failed_operation_releases_the_key() -> None:
+    service = IdempotencyService(InMemoryIdempotencyStore())
+
+    async def failing() -> dict:
+        raise RuntimeError("boom")
+
+    async def succeeding() -> dict:
+        return {"sale_id": "S-3"}
+
+    async def scenario() -> dict:
+        with pytest.raises(RuntimeError):
+            await service.run("sale:S-3", "abc", failing)
+        return await service.run("sale:S-3", "abc", succeeding)
+
+    assert asyncio.run(scenario()) == {"sale_id": "S-3"}
+
+
+def test_stale_owner_cannot_release_a_claim_taken_over_after_expiry() -> None:
+    store = InMemoryIdempotencyStore()
+
+    async def scenario() -> None:
+        assert await store.begin("sale:S-4", "abc", "first") is None
+        store.cache.pop("sale:S-4")
+        assert await store.begin("sale:S-4", "abc", "second") is None
+
+        await store.release("sale:S-4", "first")
+
+        record = await store.begin("sale:S-4", "abc", "third")
+        assert record is not None and record.owner == "second"
+
+    asyncio.run(scenario())
+
+
+def test_stale_owner_cannot_overwrite_the_result_of_the_new_owner() -> None:
+    store = InMemoryIdempotencyStore()
+
+    async def scenario() -> None:
+        await store.begin("sale:S-5", "abc", "first")
+        store.cache.pop("sale:S-5")
+        await store.begin("sale:S-5", "abc", "second")
+        await store.complete("sale:S-5", "abc", {"sale_id": "S-5", "by": "second"}, "second")
+
+        await store.complete("sale:S-5", "abc", {"sale_id": "S-5", "by": "first"}, "first")
+
+        record = await store.begin("sale:S-5", "abc", "third")
+        assert record is not None and record.result == {"sale_id": "S-5", "by": "second"}
+
+    asyncio.run(scenario())
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired_entries() -> None:
+    now = [0.0]
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] = 11
+    assert cache.get("c") is None
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem, InventoryMovementType
+from maspatas.domain.value_objects.common import ProductId
+
+
+def _catalog(size: int) -> dict[ProductId, InventoryItem]:
+    return {ProductId(f"P-{index}"): InventoryItem(product_id=ProductId(f"P-{index}"), stock=10) for index in range(size)}
+
+
+def test_apply_movement_keeps_previous_aggregate_unchanged() -> None:
+    original = InventoryAggregate(items=_catalog(3))
+
+    updated = original.apply_movement(ProductId("P-1"), InventoryMovementType.SALIDA, 4)
+
+    assert original.get_item(ProductId("P-1")).stock == 10
+    assert updated.get_item(ProductId("P-1")).stock == 6
+    assert updated.get_item(ProductId("P-2")).stock == 10
+    assert len(updated.items) == 3
+
+
+def test_apply_movement_tracks_changed_items_only() -> None:
+    inventory = InventoryAggregate(items=_catalog(1000))
+    assert inventory.changed_product_ids == frozenset()
+
+    inventory = inventory.apply_movement(ProductId("P-7"), InventoryMovementType.SALIDA, 1)
+    inventory = inventory.apply_movement(ProductId("P-7"), InventoryMovementType.SALIDA, 1)
+    inventory = inventory.apply_movement(ProductId("P-NEW"), InventoryMovementType.ENTRADA, 5)
+
+    assert inventory.changed_product_ids == frozenset({ProductId("P-7"), ProductId("P-NEW")})
+    assert {item.product_id.value: item.stock for item in inventory.changed_items()} == {"P-7": 8, "P-NEW": 5}
+    assert len(inventory.items) == 1001
+    assert ProductId("P-NEW") in inventory.items
+
+
+def test_apply_movement_shares_the_loaded_catalog() -> None:
+    catalog = _catalog(10)
+    inventory = InventoryAggregate(items=catalog)
+
+    updated = inventory.apply_movement(ProductId("P-3"), InventoryMovementType.AJUSTE, 0)
+
+    assert catalog[ProductId("P-3")].stock == 10
+    assert updated.items._base is catalog  # noqa: SLF001
+
+
+def test_successive_movements_share_one_change_log_and_branches_stay_independent() -> None:
+    inventory = InventoryAggregate(items=_catalog(3))
+    first = inventory.apply_movement(ProductId("P-0"), InventoryMovementType.SALIDA, 1)
+    second = first.apply_movement(ProductId("P-1"), InventoryMovementType.SALIDA, 2)
+
+    branch = first.apply_movement(ProductId("P-2"), InventoryMovementType.SALIDA, 3)
+
+    assert second.items._log is first.items._log  # noqa: SLF001
+    assert second.changed_product_ids == frozenset({ProductId("P-0"), ProductId("P-1")})
+    assert branch.changed_product_ids == frozenset({ProductId("P-0"), ProductId("P-2")})
+    assert branch.get_item(ProductId("P-1")).stock == 10
+    assert first.changed_product_ids == frozenset({ProductId("P-0")})
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+from maspatas.domain.exceptions.domain_exceptions import LockTimeoutError
+from maspatas.infrastructure.resilience.concurrency import InMemoryLockAdapter
+
+
+def test_lock_memory_stays_flat_for_many_keys() -> None:
+    adapter = InMemoryLockAdapter(stripes=16)
+
+    for index in range(10_000):
+        with adapter.lock(f"sale:S-{index}"):
+            pass
+
+    assert adapter.stripe_count == 16
+
+
+def test_lock_many_in_opposite_orders_does_not_deadlock() -> None:
+    adapter = InMemoryLockAdapter(stripes=64, default_timeout=5)
+    keys = [f"product:P-{index}" for index in range(20)]
+
+    def _worker(index: int) -> int:
+        ordered = keys if index % 2 == 0 else list(reversed(keys))
+        for _ in range(200):
+            with adapter.lock_many(ordered):
+                pass
+        return index
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert sorted(executor.map(_worker, range(8))) == list(range(8))
+
+
+def test_lock_times_out_when_held_by_another_thread() -> None:
+    adapter = InMemoryLockAdapter(stripes=4)
+    held = Event()
+    release = Event()
+
+    def _holder() -> None:
+        with adapter.lock("client:C-001"):
+            held.set()
+            release.wait(5)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(_holder)
+        held.wait(5)
+        try:
+            with adapter.lock("client:C-001", timeout=0.05):
+                raise AssertionError("No se esperaba adquirir el bloqueo")
+        except LockTimeoutError as exc:
+            assert "client:C-001" in str(exc)
+        finally:
+            release.set()
+
+
+def test_lock_is_reentrant_for_keys_sharing_a_stripe() -> None:
+    adapter = InMemoryLockAdapter(stripes=1)
+
+    with adapter.lock("sale:S-1"):
+        with adapter.lock_many(["product:P-001", "product:P-002"], timeout=0.1):
+            pass
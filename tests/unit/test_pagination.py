@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.ports.sale_filter import SaleFilter
+from maspatas.domain.value_objects.common import ClientId, Money, ProductId
+from maspatas.infrastructure.repositories.memory_repositories import InMemorySaleRepository
+
+
+def _sale(sale_id: str, created_at: datetime) -> SaleAggregate:
+    return SaleAggregate(
+        sale_id=sale_id,
+        client_id=ClientId("C-001"),
+        lines=(SaleLine(product_id=ProductId("P-001"), quantity=1, unit_price=Money(Decimal("10.00"))),),
+        created_at=created_at,
+    )
+
+
+def test_sales_are_paged_by_creation_time_then_id() -> None:
+    repo = InMemorySaleRepository()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    repo.save_sale(_sale("S-3", start + timedelta(minutes=1)))
+    repo.save_sale(_sale("S-2", start))
+    repo.save_sale(_sale("S-1", start))
+    repo.save_sale(_sale("S-4", start + timedelta(minutes=2)))
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = repo.list_page(limit=3, after=cursor)
+        seen.extend(sale.sale_id for sale in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == ["S-1", "S-2", "S-3", "S-4"]
+
+
+def test_sales_page_applies_client_product_and_date_filters() -> None:
+    repo = InMemorySaleRepository()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for index in range(6):
+        repo.save_sale(
+            SaleAggregate(
+                sale_id=f"S-{index}",
+                client_id=ClientId("C-001" if index % 2 == 0 else "C-002"),
+                lines=(SaleLine(product_id=ProductId(f"P-00{index % 3}"), quantity=1, unit_price=Money(Decimal("10.00"))),),
+                created_at=start + timedelta(days=index),
+            )
+        )
+
+    by_client = repo.list_page(limit=2, filters=SaleFilter(client_id=ClientId("C-001")))
+    assert [sale.sale_id for sale in by_client.items] == ["S-0", "S-2"]
+    rest = repo.list_page(limit=2, after=by_client.next_cursor, filters=SaleFilter(client_id=ClientId("C-001")))
+    assert [sale.sale_id for sale in rest.items] == ["S-4"]
+    assert rest.next_cursor is None
+
+    by_product = repo.list_page(limit=10, filters=SaleFilter(product_id=ProductId("P-001")))
+    assert [sale.sale_id for sale in by_product.items] == ["S-1", "S-4"]
+
+    in_range = repo.list_page(
+        limit=10,
+        filters=SaleFilter(created_from=start + timedelta(days=2), created_to=start + timedelta(days=4)),
+    )
+    assert [sale.sale_id for sale in in_range.items] == ["S-2", "S-3"]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from maspatas.domain.entities.product import Product
+from maspatas.domain.value_objects.common import Money, ProductId
+from maspatas.infrastructure.cache.product_cache import CachedProductRepository
+from maspatas.infrastructure.repositories.memory_repositories import InMemoryProductRepository
+
+
+class CountingProductRepository(InMemoryProductRepository):
+    def __init__(self) -> None:
+        super().__init__(InMemoryProductRepository.with_seed()._products)  # noqa: SLF001
+        self.reads = 0
+
+    def get_by_id(self, product_id: ProductId) -> Product | None:
+        self.reads += 1
+        return super().get_by_id(product_id)
+
+
+def test_repeated_reads_hit_the_cache() -> None:
+    backing = CountingProductRepository()
+    repo = CachedProductRepository(backing)
+
+    assert repo.get_by_id(ProductId("P-001")).name == "Croquetas Premium"
+    assert repo.get_by_id(ProductId("P-001")).name == "Croquetas Premium"
+
+    assert backing.reads == 1
+    assert repo.stats()["hits"] == 1
+    assert repo.stats()["misses"] == 1
+
+
+def test_missing_ids_are_cached_until_the_product_is_saved() -> None:
+    backing = CountingProductRepository()
+    repo = CachedProductRepository(backing)
+
+    assert repo.get_by_id(ProductId("P-900")) is None
+    assert repo.get_by_id(ProductId("P-900")) is None
+    assert backing.reads == 1
+
+    repo.save_product(Product(id=ProductId("P-900"), name="Arena", sku="ARE-900", price=Money(Decimal("80.00"))))
+
+    assert repo.get_by_id(ProductId("P-900")).sku == "ARE-900"
+    assert backing.reads == 1
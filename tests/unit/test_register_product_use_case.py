@@ -3,7 +3,7 @@ from __future__ import annotations
 from maspatas.application.dto.product_dto import RegisterProductInputDTO
 from maspatas.application.services.authorization import AuthorizationService, Role
 from maspatas.application.use_cases.register_product import RegisterProductUseCase
-from maspatas.domain.entities.inventory import InventoryAggregate
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
 from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation, UnauthorizedOperationError
 from maspatas.domain.value_objects.common import ProductId
 from maspatas.infrastructure.repositories.memory_repositories import InMemoryInventoryRepository, InMemoryProductRepository
@@ -59,6 +59,27 @@ def test_register_product_fails_when_id_exists() -> None:
         raise AssertionError("Se esperaba producto duplicado")
 
 
+def test_register_product_fails_when_sku_exists() -> None:
+    use_case = _build_use_case()
+
+    try:
+        use_case.execute(
+            RegisterProductInputDTO(
+                product_id="P-901",
+                name="Croquetas otra vez",
+                sku="CROQ-01",
+                price_amount="10.00",
+                currency="MXN",
+                initial_stock=0,
+            ),
+            role=Role.ADMIN,
+        )
+    except BusinessRuleViolation as exc:
+        assert "SKU CROQ-01" in str(exc)
+    else:
+        raise AssertionError("Se esperaba SKU duplicado")
+
+
 def test_register_product_fails_for_seller_role() -> None:
     use_case = _build_use_case()
 
@@ -124,3 +145,33 @@ def test_register_product_updates_inventory() -> None:
 
     inventory = inventory_repo.get_inventory()
     assert inventory.get_item(ProductId("P-903")).stock == 7
+
+
+def test_register_product_persists_only_the_new_inventory_item() -> None:
+    inventory_repo = InMemoryInventoryRepository(
+        InventoryAggregate(
+            items={ProductId(f"P-{index}"): InventoryItem(product_id=ProductId(f"P-{index}"), stock=1) for index in range(500)}
+        )
+    )
+    use_case = RegisterProductUseCase(
+        product_repo=InMemoryProductRepository.with_seed(),
+        inventory_repo=inventory_repo,
+        concurrency=InMemoryLockAdapter(),
+        authz=AuthorizationService(),
+    )
+
+    use_case.execute(
+        RegisterProductInputDTO(
+            product_id="P-904",
+            name="Cepillo",
+            sku="CEP-904",
+            price_amount="35.00",
+            currency="MXN",
+            initial_stock=3,
+        ),
+        role=Role.ADMIN,
+    )
+
+    assert inventory_repo.write_counters.last_written == 1
+    assert inventory_repo.get_inventory().get_item(ProductId("P-904")).stock == 3
+    assert len(inventory_repo.get_inventory().items) == 501
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, SaleLineInputDTO
 from maspatas.application.services.authorization import AuthorizationService, Role
 from maspatas.application.use_cases.register_sale import RegisterSaleUseCase
@@ -79,3 +81,163 @@ def test_register_sale_fails_for_inventory_role() -> None:
         assert "no tiene permiso" in str(exc)
     else:
         raise AssertionError("Se esperaba error de autorización")
+
+
+def test_register_sale_only_touches_requested_inventory_items() -> None:
+    inventory_repo = InMemoryInventoryRepository(
+        InventoryAggregate(
+            items={
+                ProductId("P-001"): InventoryItem(product_id=ProductId("P-001"), stock=10),
+                ProductId("P-002"): InventoryItem(product_id=ProductId("P-002"), stock=4),
+            }
+        )
+    )
+    use_case = RegisterSaleUseCase(
+        product_repo=InMemoryProductRepository.with_seed(),
+        client_repo=InMemoryClientRepository.with_seed(),
+        inventory_repo=inventory_repo,
+        sale_repo=InMemorySaleRepository(),
+        concurrency=InMemoryLockAdapter(),
+        authz=AuthorizationService(),
+    )
+
+    partial = inventory_repo.get_items([ProductId("P-001")])
+    assert set(partial.items) == {ProductId("P-001")}
+
+    use_case.execute(
+        RegisterSaleInputDTO(
+            sale_id="S-004",
+            client_id="C-001",
+            lines=(SaleLineInputDTO(product_id="P-001", quantity=3),),
+        ),
+        role=Role.VENDEDOR,
+    )
+
+    inventory = inventory_repo.get_inventory()
+    assert inventory.get_item(ProductId("P-001")).stock == 7
+    assert inventory.get_item(ProductId("P-002")).stock == 4
+
+
+def test_concurrent_sales_never_oversell() -> None:
+    inventory_repo = InMemoryInventoryRepository(
+        InventoryAggregate(items={ProductId("P-001"): InventoryItem(product_id=ProductId("P-001"), stock=5)})
+    )
+    use_case = RegisterSaleUseCase(
+        product_repo=InMemoryProductRepository.with_seed(),
+        client_repo=InMemoryClientRepository.with_seed(),
+        inventory_repo=inventory_repo,
+        sale_repo=InMemorySaleRepository(),
+        concurrency=InMemoryLockAdapter(),
+        authz=AuthorizationService(),
+    )
+
+    def _sell(index: int) -> bool:
+        try:
+            use_case.execute(
+                RegisterSaleInputDTO(
+                    sale_id=f"S-C{index}",
+                    client_id="C-001",
+                    lines=(SaleLineInputDTO(product_id="P-001", quantity=1),),
+                ),
+                role=Role.VENDEDOR,
+            )
+        except BusinessRuleViolation:
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_sell, range(20)))
+
+    assert sum(results) == 5
+    assert inventory_repo.get_inventory().get_item(ProductId("P-001")).stock == 0
+
+
+def test_register_sale_is_all_or_nothing_across_lines() -> None:
+    inventory_repo = InMemoryInventoryRepository(
+        InventoryAggregate(
+            items={
+                ProductId("P-001"): InventoryItem(product_id=ProductId("P-001"), stock=10),
+                ProductId("P-002"): InventoryItem(product_id=ProductId("P-002"), stock=1),
+            }
+        )
+    )
+    use_case = RegisterSaleUseCase(
+        product_repo=InMemoryProductRepository.with_seed(),
+        client_repo=InMemoryClientRepository.with_seed(),
+        inventory_repo=inventory_repo,
+        sale_repo=InMemorySaleRepository(),
+        concurrency=InMemoryLockAdapter(),
+        authz=AuthorizationService(),
+    )
+
+    try:
+        use_case.execute(
+            RegisterSaleInputDTO(
+                sale_id="S-005",
+                client_id="C-001",
+                lines=(
+                    SaleLineInputDTO(product_id="P-001", quantity=2),
+                    SaleLineInputDTO(product_id="P-002", quantity=2),
+                ),
+            ),
+            role=Role.VENDEDOR,
+        )
+    except BusinessRuleViolation as exc:
+        assert "Stock insuficiente para P-002" in str(exc)
+    else:
+        raise AssertionError("Se esperaba error por stock insuficiente")
+
+    inventory = inventory_repo.get_inventory()
+    assert inventory.get_item(ProductId("P-001")).stock == 10
+    assert inventory.get_item(ProductId("P-002")).stock == 1
+
+
+def test_register_sale_resolves_all_products_in_one_lookup() -> None:
+    class CountingProductRepository(InMemoryProductRepository):
+        def __init__(self) -> None:
+            super().__init__(InMemoryProductRepository.with_seed()._products)  # noqa: SLF001
+            self.single_reads = 0
+            self.batch_reads = 0
+
+        def get_by_id(self, product_id):
+            self.single_reads += 1
+            return super().get_by_id(product_id)
+
+        def get_many(self, product_ids):
+            self.batch_reads += 1
+            return super().get_many(product_ids)
+
+    product_repo = CountingProductRepository()
+    inventory_repo = InMemoryInventoryRepository(
+        InventoryAggregate(
+            items={
+                ProductId("P-001"): InventoryItem(product_id=ProductId("P-001"), stock=10),
+                ProductId("P-002"): InventoryItem(product_id=ProductId("P-002"), stock=10),
+            }
+        )
+    )
+    use_case = RegisterSaleUseCase(
+        product_repo=product_repo,
+        client_repo=InMemoryClientRepository.with_seed(),
+        inventory_repo=inventory_repo,
+        sale_repo=InMemorySaleRepository(),
+        concurrency=InMemoryLockAdapter(),
+        authz=AuthorizationService(),
+    )
+
+    output = use_case.execute(
+        RegisterSaleInputDTO(
+            sale_id="S-006",
+            client_id="C-001",
+            lines=(
+                SaleLineInputDTO(product_id="P-001", quantity=1),
+                SaleLineInputDTO(product_id="P-002", quantity=2),
+                SaleLineInputDTO(product_id="P-001", quantity=1),
+            ),
+        ),
+        role=Role.VENDEDOR,
+    )
+
+    assert output.total_amount == "1540.00"
+    assert product_repo.batch_reads == 1
+    assert product_repo.single_reads == 0
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, SaleLineInputDTO
+from maspatas.application.services.authorization import AuthorizationService, Role
+from maspatas.application.use_cases.register_sale import RegisterSalesBatchUseCase
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.exceptions.domain_exceptions import PartialBatchWriteError
+from maspatas.domain.value_objects.common import ClientId, Money, ProductId
+from maspatas.infrastructure.reports.memory_reports import InMemorySalesRollups
+from maspatas.infrastructure.repositories.memory_repositories import (
+    InMemoryClientRepository,
+    InMemoryInventoryRepository,
+    InMemoryProductRepository,
+    InMemorySaleRepository,
+)
+from maspatas.infrastructure.repositories.mongo_repositories import duplicated_sale_ids
+
+
+def _sale(sale_id: str, quantity: int, client_id: str = "C-001", product_id: str = "P-001") -> RegisterSaleInputDTO:
+    return RegisterSaleInputDTO(
+        sale_id=sale_id,
+        client_id=client_id,
+        lines=(SaleLineInputDTO(product_id=product_id, quantity=quantity),),
+    )
+
+
+def _build(stock: int, sale_repo: InMemorySaleRepository | None = None):
+    inventory_repo = InMemoryInventoryRepository(
+        InventoryAggregate(items={ProductId("P-001"): InventoryItem(product_id=ProductId("P-001"), stock=stock)})
+    )
+    sale_repo = sale_repo or InMemorySaleRepository()
+    rollups = InMemorySalesRollups()
+    use_case = RegisterSalesBatchUseCase(
+        product_repo=InMemoryProductRepository.with_seed(),
+        client_repo=InMemoryClientRepository.with_seed(),
+        inventory_repo=inventory_repo,
+        sale_repo=sale_repo,
+        authz=AuthorizationService(),
+        rollups=rollups,
+    )
+    return use_case, inventory_repo, sale_repo, rollups
+
+
+def test_batch_registers_valid_sales_and_reports_failures_individually() -> None:
+    use_case, inventory_repo, sale_repo, rollups = _build(stock=5)
+
+    results = use_case.execute(
+        (
+            _sale("S-1", 2),
+            _sale("S-2", 1, client_id="C-404"),
+            _sale("S-3", 1, product_id="P-404"),
+            _sale("S-1", 1),
+            _sale("S-4", 4),
+            _sale("S-5", 3),
+        ),
+        role=Role.VENDEDOR,
+    )
+
+    assert [result.sale_id for result in results] == ["S-1", "S-2", "S-3", "S-1", "S-4", "S-5"]
+    assert [result.sale is not None for result in results] == [True, False, False, False, False, True]
+    assert results[1].error == "Cliente no encontrado"
+    assert results[2].error == "Producto no encontrado: P-404"
+    assert "repetida" in results[3].error
+    assert "Stock insuficiente" in results[4].error
+    assert inventory_repo.get_inventory().get_item(ProductId("P-001")).stock == 0
+    assert [sale.sale_id for sale in sale_repo.sales] == ["S-1", "S-5"]
+    assert sum(rollup.sales for rollup in rollups.read("client_month")) == 2
+
+
+def test_batch_returns_stock_and_rollups_of_already_registered_sales() -> None:
+    sale_repo = InMemorySaleRepository()
+    sale_repo.save_sale(
+        SaleAggregate(
+            sale_id="S-1",
+            client_id=ClientId("C-001"),
+            lines=(SaleLine(product_id=ProductId("P-001"), quantity=1, unit_price=Money(Decimal("10.00"))),),
+        )
+    )
+    use_case, inventory_repo, _, rollups = _build(stock=5, sale_repo=sale_repo)
+
+    results = use_case.execute((_sale("S-1", 2), _sale("S-2", 1)), role=Role.VENDEDOR)
+
+    assert results[0].error == "Ya existe una venta con id S-1"
+    assert results[1].sale is not None
+    assert inventory_repo.get_inventory().get_item(ProductId("P-001")).stock == 4
+    assert [rollup.units for rollup in rollups.read("client_month")] == [1]
+
+
+class _FailingAfterFirstSaleRepository(InMemorySaleRepository):
+    def save_sales(self, sales):
+        super().save_sales(sales[:1])
+        failures = [{"index": index, "code": 121, "errmsg": "Document failed validation"} for index in range(1, len(sales))]
+        error = BulkWriteError({"nInserted": 1, "writeErrors": failures})
+        return duplicated_sale_ids(error, sales)
+
+
+def test_non_duplicate_write_error_only_returns_stock_of_unsaved_sales() -> None:
+    use_case, inventory_repo, sale_repo, rollups = _build(stock=5, sale_repo=_FailingAfterFirstSaleRepository())
+
+    with pytest.raises(PartialBatchWriteError) as raised:
+        use_case.execute((_sale("S-1", 2), _sale("S-2", 1)), role=Role.VENDEDOR)
+
+    assert raised.value.written == {"S-1"}
+    assert [sale.sale_id for sale in sale_repo.sales] == ["S-1"]
+    assert inventory_repo.get_inventory().get_item(ProductId("P-001")).stock == 3
+    assert [rollup.units for rollup in rollups.read("client_month")] == [2]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from maspatas.domain.exceptions.domain_exceptions import DependencyUnavailableError, UnauthorizedOperationError
+from maspatas.infrastructure.resilience.policy import DependencyLimits, ResiliencePolicy
+
+
+def _fail() -> None:
+    raise ConnectionError("mongo caído")
+
+
+def test_open_breaker_only_affects_its_own_dependency() -> None:
+    policy = ResiliencePolicy(default_limits=DependencyLimits(fail_max=2))
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            policy.protected_call(_fail, dependency="register_client")
+
+    with pytest.raises(DependencyUnavailableError):
+        policy.protected_call(lambda: "ok", dependency="register_client")
+    assert policy.protected_call(lambda: "ok", dependency="register_sale") == "ok"
+    assert policy.snapshot()["register_client"]["breaker"] == "open"
+    assert policy.snapshot()["register_sale"]["breaker"] == "closed"
+
+
+def test_business_errors_do_not_open_the_breaker() -> None:
+    policy = ResiliencePolicy(default_limits=DependencyLimits(fail_max=1))
+
+    def unauthorized() -> None:
+        raise UnauthorizedOperationError("sin permiso")
+
+    for _ in range(3):
+        with pytest.raises(UnauthorizedOperationError):
+            policy.protected_call(unauthorized, dependency="register_product")
+
+    assert policy.snapshot()["register_product"]["breaker"] == "closed"
+
+
+def test_bulkhead_rejects_calls_beyond_its_queue() -> None:
+    policy = ResiliencePolicy(default_limits=DependencyLimits(max_concurrent=1, max_queue=1))
+    release = asyncio.Event()
+
+    async def slow() -> str:
+        await release.wait()
+        return "ok"
+
+    async def scenario() -> list[object]:
+        running = asyncio.create_task(policy.protected_call_async(slow, dependency="register_sale"))
+        queued = asyncio.create_task(policy.protected_call_async(slow, dependency="register_sale"))
+        await asyncio.sleep(0)
+        with pytest.raises(DependencyUnavailableError):
+            await policy.protected_call_async(slow, dependency="register_sale")
+        assert policy.snapshot()["register_sale"]["waiting"] == 1
+        release.set()
+        return list(await asyncio.gather(running, queued))
+
+    assert asyncio.run(scenario()) == ["ok", "ok"]
+    assert policy.snapshot()["register_sale"]["rejected"] == 1
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.value_objects.common import ClientId, Money, ProductId
+from maspatas.infrastructure.reports.memory_reports import InMemorySalesReport
+from maspatas.infrastructure.reports.mongo_reports import sales_report_pipeline
+from maspatas.infrastructure.repositories.memory_repositories import InMemorySaleRepository
+
+
+def _line(product_id: str, quantity: int, amount: str) -> SaleLine:
+    return SaleLine(product_id=ProductId(product_id), quantity=quantity, unit_price=Money(Decimal(amount)))
+
+
+def _report() -> InMemorySalesReport:
+    sales = InMemorySaleRepository()
+    sales.save_sale(
+        SaleAggregate(
+            sale_id="S-1",
+            client_id=ClientId("C-001"),
+            lines=(_line("P-001", 2, "10.50"), _line("P-002", 1, "5.00")),
+            created_at=datetime(2025, 3, 1, 23, 30, tzinfo=timezone.utc),
+        )
+    )
+    sales.save_sale(
+        SaleAggregate(
+            sale_id="S-2",
+            client_id=ClientId("C-002"),
+            lines=(_line("P-001", 1, "10.50"),),
+            created_at=datetime(2025, 3, 2, 8, 0, tzinfo=timezone.utc),
+        )
+    )
+    return InMemorySalesReport(sales)
+
+
+def test_revenue_per_product_counts_units_and_sales() -> None:
+    rows = _report().sales_report("product")
+
+    assert [(row.key, row.revenue, row.units, row.sales) for row in rows] == [
+        ("P-001", Decimal("31.50"), 3, 2),
+        ("P-002", Decimal("5.00"), 1, 1),
+    ]
+
+
+def test_revenue_per_day_respects_the_range() -> None:
+    report = _report()
+
+    assert [(row.key, row.revenue, row.sales) for row in report.sales_report("day")] == [
+        ("2025-03-01", Decimal("26.00"), 1),
+        ("2025-03-02", Decimal("10.50"), 1),
+    ]
+    only_second = report.sales_report("client", created_from=datetime(2025, 3, 2, tzinfo=timezone.utc))
+    assert [row.key for row in only_second] == ["C-002"]
+
+
+def test_mongo_pipeline_filters_before_unwinding() -> None:
+    pipeline = sales_report_pipeline("client", datetime(2025, 3, 1, tzinfo=timezone.utc), None)
+
+    assert list(pipeline[0]) == ["$match"]
+    assert pipeline[1] == {"$unwind": "$lines"}
+    assert pipeline[2]["$group"]["_id"]["key"] == "$client_id"
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from maspatas.application.dto.sale_dto import RegisterSaleInputDTO, SaleLineInputDTO
+from maspatas.application.services.authorization import AuthorizationService, Role
+from maspatas.application.services.rollup_rebuild import RollupRebuilder, rollup_windows
+from maspatas.application.use_cases.register_sale import RegisterSaleUseCase
+from maspatas.domain.entities.inventory import InventoryAggregate, InventoryItem
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation
+from maspatas.domain.services.rollups import sale_rollups
+from maspatas.domain.value_objects.common import ClientId, Money, ProductId
+from maspatas.infrastructure.reports.memory_reports import InMemorySalesRollups
+from maspatas.infrastructure.repositories.memory_repositories import (
+    InMemoryClientRepository,
+    InMemoryInventoryRepository,
+    InMemoryProductRepository,
+    InMemorySaleRepository,
+)
+from maspatas.infrastructure.resilience.concurrency import InMemoryLockAdapter
+
+
+def _sale(sale_id: str, created_at: datetime, *lines: tuple[str, int]) -> SaleAggregate:
+    return SaleAggregate(
+        sale_id=sale_id,
+        client_id=ClientId("C-001"),
+        lines=tuple(
+            SaleLine(product_id=ProductId(product), quantity=quantity, unit_price=Money(Decimal("10.00")))
+            for product, quantity in lines
+        ),
+        created_at=created_at,
+    )
+
+
+def test_sale_rollups_count_each_sale_once_per_group() -> None:
+    sale = _sale("S-1", datetime(2025, 3, 31, 23, 0, tzinfo=timezone.utc), ("P-001", 1), ("P-001", 2), ("P-002", 1))
+
+    rollups = {(rollup.kind, rollup.key, rollup.period): rollup for rollup in sale_rollups(sale)}
+
+    assert rollups[("product_day", "P-001", "2025-03-31")].units == 3
+    assert rollups[("product_day", "P-001", "2025-03-31")].sales == 1
+    assert rollups[("client_month", "C-001", "2025-03")].revenue == Decimal("40.00")
+    assert rollups[("client_month", "C-001", "2025-03")].sales == 1
+
+
+class _FailingSaleRepository(InMemorySaleRepository):
+    def save_sale(self, sale: SaleAggregate) -> None:
+        raise BusinessRuleViolation("falla simulada")
+
+
+def _use_case(sale_repo: InMemorySaleRepository, rollups: InMemorySalesRollups) -> RegisterSaleUseCase:
+    return RegisterSaleUseCase(
+        product_repo=InMemoryProductRepository.with_seed(),
+        client_repo=InMemoryClientRepository.with_seed(),
+        inventory_repo=InMemoryInventoryRepository(
+            InventoryAggregate(items={ProductId("P-001"): InventoryItem(product_id=ProductId("P-001"), stock=10)})
+        ),
+        sale_repo=sale_repo,
+        concurrency=InMemoryLockAdapter(),
+        authz=AuthorizationService(),
+        rollups=rollups,
+    )
+
+
+def test_register_sale_increments_rollups_and_reverts_them_on_failure() -> None:
+    dto = RegisterSaleInputDTO(sale_id="S-1", client_id="C-001", lines=(SaleLineInputDTO(product_id="P-001", quantity=2),))
+    rollups = InMemorySalesRollups()
+    _use_case(InMemorySaleRepository(), rollups).execute(dto, role=Role.VENDEDOR)
+
+    [daily] = rollups.read("product_day", key="P-001")
+    assert (daily.units, daily.revenue, daily.sales) == (2, Decimal("1100.00"), 1)
+
+    failing = InMemorySalesRollups()
+    try:
+        _use_case(_FailingSaleRepository(), failing).execute(dto, role=Role.VENDEDOR)
+    except BusinessRuleViolation:
+        pass
+    [reverted] = failing.read("product_day", key="P-001")
+    assert (reverted.units, reverted.revenue, reverted.sales) == (0, Decimal("0.00"), 0)
+
+
+def test_rebuild_in_parallel_chunks_matches_incremental_rollups() -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    sales = InMemorySaleRepository()
+    incremental = InMemorySalesRollups()
+    for index in range(40):
+        sale = _sale(f"S-{index}", start + timedelta(hours=17 * index), (f"P-00{index % 3}", 1 + index % 4))
+        sales.save_sale(sale)
+        incremental.apply(sale_rollups(sale))
+
+    rebuilt = InMemorySalesRollups()
+    processed = RollupRebuilder(sales, rebuilt, chunk=timedelta(days=3), workers=4).rebuild(start, start + timedelta(days=60))
+
+    assert processed == 40
+    for kind in ("product_day", "client_month"):
+        assert rebuilt.read(kind) == incremental.read(kind)
+
+
+def test_rollup_windows_cover_the_range_without_gaps() -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    windows = rollup_windows(start, start + timedelta(days=10), timedelta(days=4))
+
+    assert windows[0][0] == start
+    assert windows[-1][1] == start + timedelta(days=10)
+    assert all(previous[1] == current[0] for previous, current in zip(windows, windows[1:]))
+
+
+class _RecordingRollups(InMemorySalesRollups):
+    def __init__(self) -> None:
+        super().__init__()
+        self.applied: list[int] = []
+
+    def apply(self, increments) -> None:
+        self.applied.append(len(increments))
+        super().apply(increments)
+
+
+def test_rebuild_flushes_increments_every_batch() -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    sales = InMemorySaleRepository()
+    for index in range(5):
+        sales.save_sale(_sale(f"S-{index}", start + timedelta(hours=index), ("P-001", 1)))
+    target = _RecordingRollups()
+
+    RollupRebuilder(sales, target, chunk=timedelta(days=1), workers=1, batch_size=2).rebuild(start, start + timedelta(days=1))
+
+    assert len(target.applied) == 3
+    assert target.read("product_day")[0].units == 5
+
+
+def test_rebuild_and_swap_replays_sales_saved_before_the_swap_only_once() -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    high_water = start + timedelta(days=2)
+    sales = InMemorySaleRepository()
+    replaced = InMemorySalesRollups()
+    staging = InMemorySalesRollups()
+    for sale in (_sale("S-1", start, ("P-001", 1)), _sale("S-2", high_water + timedelta(hours=1), ("P-001", 2))):
+        sales.save_sale(sale)
+        replaced.apply(sale_rollups(sale))
+    after_swap = _sale("S-3", high_water + timedelta(hours=2), ("P-001", 4))
+
+    def swap() -> InMemorySalesRollups:
+        staging.apply(sale_rollups(after_swap))
+        sales.save_sale(after_swap)
+        return staging
+
+    processed = RollupRebuilder(sales, staging, workers=2).rebuild_and_swap(start, high_water, swap)
+
+    assert processed == 2
+    assert sum(rollup.units for rollup in staging.read("product_day")) == 7
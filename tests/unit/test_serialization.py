@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+import orjson
+
+from maspatas.domain.entities.product import Product
+from maspatas.domain.entities.sale import SaleAggregate, SaleLine
+from maspatas.domain.value_objects.common import ClientId, Money, ProductId
+from maspatas.interfaces.api.schemas import ProductResponse, SaleResponse
+from maspatas.interfaces.api.serialization import fast_json, product_row, sale_row
+
+
+def test_sale_row_matches_response_schema() -> None:
+    sale = SaleAggregate(
+        sale_id="S-001",
+        client_id=ClientId("C-001"),
+        lines=(
+            SaleLine(product_id=ProductId("P-001"), quantity=2, unit_price=Money(Decimal("10.50"))),
+            SaleLine(product_id=ProductId("P-002"), quantity=1, unit_price=Money(Decimal("4.00"))),
+        ),
+    )
+
+    row = sale_row(sale)
+
+    assert SaleResponse.model_validate(row).model_dump() == row
+    assert row["total_amount"] == str(sale.total.amount)
+    assert [line["subtotal"] for line in row["lines"]] == ["21.00", "4.00"]
+
+
+def test_fast_json_encodes_product_rows() -> None:
+    product = Product(id=ProductId("P-001"), name="Croquetas", price=Money(Decimal("99.90")), sku="CRO-001")
+
+    response = fast_json([product_row(product)], headers={"X-Next-Cursor": "abc"})
+
+    assert response.media_type == "application/json"
+    assert response.headers["X-Next-Cursor"] == "abc"
+    assert [ProductResponse.model_validate(row) for row in orjson.loads(response.body)][0].sku == "CRO-001"
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("psycopg2")
+
+from maspatas.domain.entities.product import Product  # noqa: E402
+from maspatas.domain.exceptions.domain_exceptions import BusinessRuleViolation  # noqa: E402
+from maspatas.domain.value_objects.common import Money, ProductId  # noqa: E402
+from maspatas.infrastructure.db.session import get_request_session, request_session_scope  # noqa: E402
+from maspatas.infrastructure.repositories.sqlalchemy_repositories import SQLAlchemyProductRepository  # noqa: E402
+
+
+def test_request_scope_shares_one_session_across_threads_and_releases_it() -> None:
+    registry = get_request_session().registry
+
+    async def request() -> tuple[object, object]:
+        with request_session_scope():
+            return registry(), await asyncio.to_thread(registry)
+
+    first, offloaded = asyncio.run(request())
+    second, _ = asyncio.run(request())
+
+    assert first is offloaded
+    assert first is not second
+    assert not registry.has()
+
+
+def test_save_product_raises_the_rejection_reported_by_the_bulk_insert(monkeypatch: pytest.MonkeyPatch) -> None:
+    repo = SQLAlchemyProductRepository(session=None)
+    product = Product(id=ProductId("P-001"), name="Croquetas", sku="SKU-001", price=Money(Decimal("10.00")))
+    monkeypatch.setattr(repo, "save_products", lambda products: {"P-001": "Ya existe un producto con SKU SKU-001"})
+
+    with pytest.raises(BusinessRuleViolation, match="SKU SKU-001"):
+        repo.save_product(product)